@@ -4,8 +4,6 @@ Bootcamp F2025
 Main process to setup and manage all the other working processes
 """
 
-import multiprocessing as mp
-import queue
 import time
 
 from pymavlink import mavutil
@@ -15,8 +13,14 @@ from modules.common.modules.logger import logger_main_setup
 from modules.common.modules.read_yaml import read_yaml
 from modules.command import command
 from modules.command import command_worker
-from modules.heartbeat import heartbeat_receiver_worker
-from modules.heartbeat import heartbeat_sender_worker
+from modules.heartbeat import link_health_worker
+from modules.heartbeat import link_quality
+from modules.heartbeat import link_status
+from modules.link import link_reader
+from modules.link import link_reader_worker
+from modules.link import link_writer_worker
+from modules.link import queue_connection
+from modules.telemetry import telemetry_ring_buffer
 from modules.telemetry import telemetry_worker
 from utilities.workers import queue_proxy_wrapper
 from utilities.workers import worker_controller
@@ -33,14 +37,20 @@ CONNECTION_STRING = "tcp:localhost:12345"
 HEARTBEAT_QUEUE_SIZE = 5
 TELEMETRY_QUEUE_SIZE = 5
 COMMAND_QUEUE_SIZE = 5
+HEARTBEAT_LINK_QUEUE_SIZE = 5
+TELEMETRY_LINK_QUEUE_SIZE = 20
+COMMAND_ACK_QUEUE_SIZE = 5
+OUTBOUND_QUEUE_SIZE = 20
+TELEMETRY_BUFFER_CAPACITY = 64
 # Set worker counts
 
-HEARTBEAT_RECEIVER_COUNT = 1
-HEARTBEAT_SENDER_COUNT = 1
+LINK_HEALTH_COUNT = 1
 TELEMETRY_COUNT = 1
 COMMAND_COUNT = 1
 
 # Any other constants
+# File received MAVLink frames are recorded to, None to not record
+RECORDING_PATH = None
 
 # =================================================================================================
 #                            ↑ BOOTCAMPERS MODIFY ABOVE THIS COMMENT ↑
@@ -86,83 +96,201 @@ def main() -> int:
 
     # Create a multiprocess manager for synchronized queues
 
-    mp_manager = mp.Manager()
+    # Hosts the batch queues, so a get_many() is one round trip
+    mp_manager = queue_proxy_wrapper.QueueManager()
+    mp_manager.start()  # pylint: disable=consider-using-with
 
     # Create queues
-    heartbeat_output_queue = queue_proxy_wrapper.QueueProxyWrapper(mp_manager)
-    telemetry_output_queue = queue_proxy_wrapper.QueueProxyWrapper(mp_manager)
-    command_output_queue = queue_proxy_wrapper.QueueProxyWrapper(mp_manager)
+    # Link status changes only, a lagging main drops the oldest
+    heartbeat_output_queue = queue_proxy_wrapper.QueueProxyWrapper(
+        mp_manager, HEARTBEAT_QUEUE_SIZE, queue_proxy_wrapper.OverflowPolicy.DROP_OLDEST
+    )
+    # Only the freshest data matters to main, so a lagging main drops stale items
+    telemetry_output_queue = queue_proxy_wrapper.QueueProxyWrapper(
+        mp_manager, TELEMETRY_QUEUE_SIZE, queue_proxy_wrapper.OverflowPolicy.DROP_OLDEST
+    )
+    command_output_queue = queue_proxy_wrapper.QueueProxyWrapper(
+        mp_manager, COMMAND_QUEUE_SIZE, queue_proxy_wrapper.OverflowPolicy.DROP_OLDEST
+    )
 
-    # Create worker properties for each worker type (what inputs it takes, how many workers)
-    # Heartbeat sender
+    # Messages routed from the link reader, which is the only process reading the connection
+    heartbeat_link_queue = queue_proxy_wrapper.QueueProxyWrapper(
+        mp_manager, HEARTBEAT_LINK_QUEUE_SIZE, queue_proxy_wrapper.OverflowPolicy.DROP_OLDEST
+    )
+    # Highest rate queue, so in shared memory rather than behind the manager process
+    telemetry_link_queue = queue_proxy_wrapper.QueueProxyWrapper(
+        None,
+        TELEMETRY_LINK_QUEUE_SIZE,
+        queue_proxy_wrapper.OverflowPolicy.DROP_OLDEST,
+        queue_proxy_wrapper.QueueBackend.SHARED_MEMORY,
+    )
+    command_ack_queue = queue_proxy_wrapper.QueueProxyWrapper(
+        mp_manager, COMMAND_ACK_QUEUE_SIZE, queue_proxy_wrapper.OverflowPolicy.DROP_OLDEST
+    )
 
-    heartbeat_sender_properties = worker_manager.WorkerProperties.create(
-        count=HEARTBEAT_SENDER_COUNT,
-        target=heartbeat_sender_worker,
-        work_arguments=(connection,),
+    # Messages to the link writer, which is the only process writing the connection
+    # Producers wait for space instead of evicting, as this queue is blind to priority
+    outbound_queue = queue_proxy_wrapper.QueueProxyWrapper(
+        mp_manager, OUTBOUND_QUEUE_SIZE, queue_proxy_wrapper.OverflowPolicy.BLOCK
+    )
+
+    # Shared between telemetry (writer) and command (reader) without a queue hop
+    result, telemetry_buffer = telemetry_ring_buffer.TelemetryRingBuffer.create(
+        TELEMETRY_BUFFER_CAPACITY, main_logger
+    )
+    if not result:
+        main_logger.error("Failed to create telemetry buffer")
+        return -1
+
+    # Get Pylance to stop complaining
+    assert telemetry_buffer is not None
+
+    # Written by link health, read by command before sending
+    result, link = link_status.LinkStatus.create(main_logger)
+    if not result:
+        main_logger.error("Failed to create link status")
+        return -1
+
+    # Get Pylance to stop complaining
+    assert link is not None
+
+    # Loss written by the link reader, jitter and round trip by link health
+    result, quality = link_quality.SharedLinkQuality.create(main_logger)
+    if not result:
+        main_logger.error("Failed to create link quality")
+        return -1
+
+    # Get Pylance to stop complaining
+    assert quality is not None
+
+    # Create worker properties for each worker type (what inputs it takes, how many workers)
+    # Link reader
+
+    subscriptions = [
+        link_reader.Subscription(["HEARTBEAT", "TIMESYNC"], heartbeat_link_queue),
+        link_reader.Subscription(["ATTITUDE", "LOCAL_POSITION_NED"], telemetry_link_queue),
+        link_reader.Subscription(["COMMAND_ACK"], command_ack_queue),
+    ]
+
+    result, link_reader_properties = worker_manager.WorkerProperties.create(
+        count=1,
+        target=link_reader_worker.link_reader_worker,
+        work_arguments=(connection, subscriptions, RECORDING_PATH, quality),
         input_queues=[],
         output_queues=[],
         controller=controller,
         local_logger=main_logger,
     )
+    if not result:
+        main_logger.error("Failed to create arguments for link reader")
+        return -1
+
+    # Get Pylance to stop complaining
+    assert link_reader_properties is not None
 
-    # Heartbeat receiver
+    # Link writer
 
-    heartbeat_receiver_properties = worker_manager.WorkerProperties.create(
-        count=HEARTBEAT_RECEIVER_COUNT,
-        target=heartbeat_receiver_worker,
+    result, link_writer_properties = worker_manager.WorkerProperties.create(
+        count=1,
+        target=link_writer_worker.link_writer_worker,
         work_arguments=(connection,),
+        input_queues=[outbound_queue],
+        output_queues=[],
+        controller=controller,
+        local_logger=main_logger,
+    )
+    if not result:
+        main_logger.error("Failed to create arguments for link writer")
+        return -1
+
+    # Get Pylance to stop complaining
+    assert link_writer_properties is not None
+
+    # Link health: heartbeat sender and receiver in one process
+
+    result, link_health_properties = worker_manager.WorkerProperties.create(
+        count=LINK_HEALTH_COUNT,
+        target=link_health_worker.link_health_worker,
+        work_arguments=(
+            connection,
+            queue_connection.QueueConnection(heartbeat_link_queue),
+            True,
+            link,
+            quality,
+        ),
         input_queues=[],
-        output_queues=[heartbeat_output_queue],
+        output_queues=[outbound_queue, heartbeat_output_queue],
         controller=controller,
         local_logger=main_logger,
     )
+    if not result:
+        main_logger.error("Failed to create arguments for link health")
+        return -1
+
+    # Get Pylance to stop complaining
+    assert link_health_properties is not None
 
     # Telemetry
 
-    telemetry_properties = worker_manager.WorkerProperties.create(
+    result, telemetry_properties = worker_manager.WorkerProperties.create(
         count=TELEMETRY_COUNT,
-        target=telemetry_worker,
-        work_arguments=(connection,),
+        target=telemetry_worker.telemetry_worker,
+        work_arguments=(
+            queue_connection.QueueConnection(telemetry_link_queue),
+            telemetry_buffer,
+            connection,
+        ),
         input_queues=[],
-        output_queues=[telemetry_output_queue],
+        output_queues=[outbound_queue, telemetry_output_queue],
         controller=controller,
         local_logger=main_logger,
     )
+    if not result:
+        main_logger.error("Failed to create arguments for telemetry")
+        return -1
+
+    # Get Pylance to stop complaining
+    assert telemetry_properties is not None
 
     # Command
     target_pos = command.Position(x=1, y=1, z=1)
 
-    command_properties = worker_manager.WorkerProperties.create(
+    result, command_properties = worker_manager.WorkerProperties.create(
         count=COMMAND_COUNT,
-        target=command_worker,
-        work_arguments=(connection, target_pos),
-        input_queues=[telemetry_output_queue],
-        output_queues=[command_output_queue],
+        target=command_worker.command_worker,
+        work_arguments=(connection, target_pos, telemetry_buffer, link),
+        input_queues=[command_ack_queue],
+        output_queues=[outbound_queue, command_output_queue],
         controller=controller,
         local_logger=main_logger,
     )
+    if not result:
+        main_logger.error("Failed to create arguments for command")
+        return -1
 
-    # Create the workers (processes) and obtain their managers
-
-    managers = []
+    # Get Pylance to stop complaining
+    assert command_properties is not None
 
-    heartbeat_receiver_manager = worker_manager.WorkerManager.create(
-        heartbeat_receiver_properties, main_logger
-    )
+    # Create the workers (processes) and obtain their managers
 
-    heartbeat_sender_manager = worker_manager.WorkerManager.create(
-        heartbeat_sender_properties, main_logger
-    )
+    managers: "list[worker_manager.WorkerManager]" = []
 
-    telemetry_manager = worker_manager.WorkerManager.create(telemetry_properties, main_logger)
+    for properties in [
+        link_reader_properties,
+        link_writer_properties,
+        link_health_properties,
+        telemetry_properties,
+        command_properties,
+    ]:
+        result, manager = worker_manager.WorkerManager.create(properties, main_logger)
+        if not result:
+            main_logger.error(f"Failed to create manager for {properties.get_target_name()}")
+            return -1
 
-    command_manager = worker_manager.WorkerManager.create(command_properties, main_logger)
+        # Get Pylance to stop complaining
+        assert manager is not None
 
-    managers.append(heartbeat_sender_manager)
-    managers.append(heartbeat_receiver_manager)
-    managers.append(telemetry_manager)
-    managers.append(command_manager)
+        managers.append(manager)
 
     # Start worker processes
 
@@ -181,24 +309,18 @@ def main() -> int:
         if not connection.target_system:
             break
 
-        try:
-            hb = heartbeat_output_queue.queue.get_nowait()
-            main_logger.info(f"heartbeat received {hb}")
-        except queue.Empty:
-            pass
+        for change in heartbeat_output_queue.get_many(HEARTBEAT_QUEUE_SIZE):
+            main_logger.info(f"link status changed: {change}")
 
-        try:
-            tele_data = telemetry_output_queue.queue.get_nowait()
+        for tele_data in telemetry_output_queue.get_many(TELEMETRY_QUEUE_SIZE):
             main_logger.info(f"telemetry data received {tele_data}")
-        except queue.Empty:
-            pass
 
-        try:
-            cmd_data = command_output_queue.queue.get(timeout=0.1)
+        cmd_batch = command_output_queue.get_many(COMMAND_QUEUE_SIZE, 0.1)
+        if len(cmd_batch) > 0:
             time.sleep(0.2)
+
+        for cmd_data in cmd_batch:
             main_logger.info(f"command data received {cmd_data}")
-        except queue.Empty:
-            pass
 
     # Stop the processes
 
@@ -206,6 +328,14 @@ def main() -> int:
 
     controller.request_exit()
 
+    main_logger.info(
+        f"Dropped items: heartbeat {heartbeat_output_queue.dropped}, "
+        f"telemetry {telemetry_output_queue.dropped}, command {command_output_queue.dropped}, "
+        f"outbound {outbound_queue.dropped}"
+    )
+
+    main_logger.info(f"Link quality: {quality.read()}")
+
     # Fill and drain queues from END TO START
 
     main_logger.info("Queues cleared")
@@ -213,12 +343,20 @@ def main() -> int:
     command_output_queue.fill_and_drain_queue()
     telemetry_output_queue.fill_and_drain_queue()
     heartbeat_output_queue.fill_and_drain_queue()
+    telemetry_link_queue.fill_and_drain_queue()
+    heartbeat_link_queue.fill_and_drain_queue()
+    command_ack_queue.fill_and_drain_queue()
+    outbound_queue.fill_and_drain_queue()
 
     # Clean up worker processes
 
     for manager in managers:
         manager.join_workers()
 
+    telemetry_buffer.close()
+    telemetry_buffer.unlink()
+    telemetry_link_queue.close()
+
     main_logger.info("Stopped")
 
     # We can reset controller in case we want to reuse it
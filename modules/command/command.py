@@ -2,11 +2,19 @@
 Decision-making logic.
 """
 
-import math
+import enum
+import time
 
 from pymavlink import mavutil
 
+from utilities.statistics import histogram
+from utilities.statistics import streaming_statistics
+from . import command_tracker
+from . import decision_kernel
 from ..common.modules.logger import logger
+from ..heartbeat import link_status
+from ..link import command_long_encoder
+from ..link import outbound_sender
 from ..telemetry import telemetry
 
 
@@ -24,6 +32,23 @@ class Position:
 # =================================================================================================
 #                            ↓ BOOTCAMPERS MODIFY BELOW THIS COMMENT ↓
 # =================================================================================================
+DEFAULT_MAX_DATA_AGE = 0.5  # seconds
+
+# Bucket upper bounds of the telemetry age histogram
+DATA_AGE_BUCKETS = [0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0]  # seconds
+
+
+class StalePolicy(enum.Enum):
+    """
+    What run() does with telemetry older than the age budget.
+    """
+
+    # Make no decision
+    REJECT = 0
+    # Log a warning and decide anyway
+    FLAG = 1
+
+
 class Command:  # pylint: disable=too-many-instance-attributes
     """
     Command class to make a decision based on recieved telemetry,
@@ -39,12 +64,40 @@ class Command:  # pylint: disable=too-many-instance-attributes
         target: Position,
         # Put your own arguments here
         local_logger: logger.Logger,
+        max_data_age: float = DEFAULT_MAX_DATA_AGE,
+        stale_policy: StalePolicy = StalePolicy.REJECT,
+        tracker: command_tracker.CommandTracker | None = None,
+        sender: outbound_sender.OutboundSender | outbound_sender.QueueSender | None = None,
+        link: link_status.LinkStatus | None = None,
     ) -> tuple[bool, "Command"] | tuple[bool, None]:
         """
         Falliable create (instantiation) method to create a Command object.
+
+        max_data_age: Age budget in seconds from receiving telemetry to deciding on it.
+        stale_policy: What to do with telemetry over the age budget.
+        tracker: Sends the commands and suppresses repeats until acknowledged,
+            None to send every decision.
+        sender: Outbound stage to submit the commands to, None to write them directly.
+            Ignored with a tracker, which has its own.
+        link: Status of the link, commands are not sent while it is disconnected.
+            None to always send.
         """
+        if max_data_age <= 0.0:
+            local_logger.error(f"Maximum data age must be positive, got {max_data_age}")
+            return False, None
+
         try:
-            return True, Command(cls.__private_key, connection, target, local_logger)
+            return True, Command(
+                cls.__private_key,
+                connection,
+                target,
+                local_logger,
+                max_data_age,
+                stale_policy,
+                tracker,
+                sender,
+                link,
+            )
 
         except (TypeError, ValueError) as e:
             local_logger.error(f"Failed to create a Command object: {e}")
@@ -58,6 +111,11 @@ class Command:  # pylint: disable=too-many-instance-attributes
         target: Position,
         # Put your own arguments here
         local_logger: logger.Logger,
+        max_data_age: float,
+        stale_policy: StalePolicy,
+        tracker: command_tracker.CommandTracker | None,
+        sender: outbound_sender.OutboundSender | outbound_sender.QueueSender | None,
+        link: link_status.LinkStatus | None,
     ) -> None:
         assert key is Command.__private_key, "Use create() method"
 
@@ -65,10 +123,24 @@ class Command:  # pylint: disable=too-many-instance-attributes
         self.connection = connection
         self.target = target
         self.local_logger = local_logger
-        self.velo_log = [[] for i in range(3)]
+        # x, y, z
+        self.velocity_statistics = [
+            streaming_statistics.StreamingStatistics.create()[1] for _ in range(3)
+        ]
         self.altitude_error = 0.5
         self.yaw_error = 5
 
+        self.max_data_age = max_data_age
+        self.stale_policy = stale_policy
+        self.stale_count = 0
+        _, self.data_age = histogram.Histogram.create(DATA_AGE_BUCKETS)
+
+        self.tracker = tracker
+        self.sender = sender
+        self.link = link
+        self.link_down_count = 0
+        self.__encoder = command_long_encoder.CommandLongEncoder(connection.mav)
+
     def run(
         self,
         telemetry_data: telemetry.TelemetryData,
@@ -76,82 +148,96 @@ class Command:  # pylint: disable=too-many-instance-attributes
     ) -> str:
         """
         Make a decision based on received telemetry data.
+        Telemetry without a receive time is treated as fresh.
         """
+        if telemetry_data is not None and telemetry_data.receive_time is not None:
+            age = time.monotonic() - telemetry_data.receive_time
+            self.data_age.add(age)
+
+            if age > self.max_data_age:
+                self.stale_count += 1
+                self.local_logger.warning(f"Telemetry is {age * 1000:.0f} ms old")
+
+                if self.stale_policy == StalePolicy.REJECT:
+                    return None
+
         # Log average velocity for this trip so far
 
         if telemetry_data is not None:
-            self.velo_log[0].append(telemetry_data.x_velocity)
-            self.velo_log[1].append(telemetry_data.y_velocity)
-            self.velo_log[2].append(telemetry_data.z_velocity)
+            now = time.monotonic()
+            velocity = (
+                telemetry_data.x_velocity,
+                telemetry_data.y_velocity,
+                telemetry_data.z_velocity,
+            )
+            for statistics, value in zip(self.velocity_statistics, velocity):
+                if value is not None:
+                    statistics.add(value, now)
 
-        if self.velo_log[0]:
+        if self.velocity_statistics[0].count > 0:
             self.local_logger.info(
-                f"average velocity is {[sum(self.velo_log[0]) / len(self.velo_log[0]), sum(self.velo_log[1]) / len(self.velo_log[1]), sum(self.velo_log[2]) / len(self.velo_log[2]) ]}"
+                f"average velocity is {[statistics.mean for statistics in self.velocity_statistics]}"
             )
 
         # Use COMMAND_LONG (76) message, assume the target_system=1 and target_componenet=0
         # The appropriate commands to use are instructed below
 
+        decision, amount = decision_kernel.decide_one(
+            telemetry_data.x,
+            telemetry_data.y,
+            telemetry_data.z,
+            telemetry_data.yaw,
+            (self.target.x, self.target.y, self.target.z),
+            self.altitude_error,
+            self.yaw_error,
+        )
+
         # Adjust height using the comand MAV_CMD_CONDITION_CHANGE_ALT (113)
         # String to return to main: "CHANGE_ALTITUDE: {amount you changed it by, delta height in meters}"
-        if abs(self.target.z - telemetry_data.z) > self.altitude_error:
-            self.connection.mav.command_long_send(
-                target_system=1,
-                target_component=0,
-                command=mavutil.mavlink.MAV_CMD_CONDITION_CHANGE_ALT,
-                confirmation=0,
-                param1=1,
-                param2=0,
-                param3=0,
-                param4=0,
-                param5=0,
-                param6=0,
-                param7=self.target.z,
-            )
+        if decision == decision_kernel.CHANGE_ALTITUDE:
+            if not self.__send(
+                mavutil.mavlink.MAV_CMD_CONDITION_CHANGE_ALT, (1, 0, 0, 0, 0, 0, self.target.z)
+            ):
+                return None
 
-            return f"CHANGE_ALTITUDE: {self.target.z - telemetry_data.z}"
+            return f"CHANGE_ALTITUDE: {amount}"
 
         # Adjust direction (yaw) using MAV_CMD_CONDITION_YAW (115). Must use relative angle to current state
         # String to return to main: "CHANGING_YAW: {degree you changed it by in range [-180, 180]}"
         # Positive angle is counter-clockwise as in a right handed system
+        if decision == decision_kernel.CHANGE_YAW:
+            optimal_dir = -1 if amount > 0 else 1
 
-        target_yaw = math.atan2(self.target.y - telemetry_data.y, self.target.x - telemetry_data.x)
-        current_yaw = telemetry_data.yaw
-
-        yaw_diff = target_yaw - current_yaw
-
-        if yaw_diff > math.pi:
-            yaw_diff = -1 * ((2 * math.pi) - yaw_diff)
-        elif yaw_diff < -1 * math.pi:
-            yaw_diff = -1 * ((-2 * math.pi) - yaw_diff)
-        yaw_diff_deg = math.degrees(yaw_diff)
-
-        if yaw_diff_deg > 180:
-            yaw_diff_deg -= 360
-        elif yaw_diff_deg < -180:
-            yaw_diff_deg += 360
-
-        optimal_dir = -1 if yaw_diff_deg > 0 else 1
-
-        if abs(yaw_diff_deg) > self.yaw_error:
-            self.connection.mav.command_long_send(
-                target_system=1,
-                target_component=0,
-                command=mavutil.mavlink.MAV_CMD_CONDITION_YAW,
-                confirmation=0,
-                param1=yaw_diff_deg,
-                param2=5,
-                param3=optimal_dir,
-                param4=1,
-                param5=0,
-                param6=0,
-                param7=0,
-            )
+            if not self.__send(
+                mavutil.mavlink.MAV_CMD_CONDITION_YAW, (amount, 5, optimal_dir, 1, 0, 0, 0)
+            ):
+                return None
 
-            return f"CHANGE YAW: {yaw_diff_deg}"
+            return f"CHANGE YAW: {amount}"
 
         return None
 
+    def __send(self, command: int, params: "tuple[float, ...]") -> bool:
+        """
+        COMMAND_LONG to target_system=1 and target_component=0.
+
+        Returns False if the link is down, the tracker suppressed it or the sender is full.
+        """
+        if self.link is not None and not self.link.is_connected():
+            self.link_down_count += 1
+            return False
+
+        if self.tracker is not None:
+            return self.tracker.send(command, params)
+
+        if self.sender is None:
+            self.__encoder.send(1, 0, command, 0, *params)
+            return True
+
+        msg = self.connection.mav.command_long_encode(1, 0, command, 0, *params)
+        result, _ = self.sender.submit(msg)
+        return result
+
 
 # =================================================================================================
 #                            ↑ BOOTCAMPERS MODIFY ABOVE THIS COMMENT ↑
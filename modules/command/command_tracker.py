@@ -0,0 +1,256 @@
+"""
+Tracking of COMMAND_LONG messages until they are acknowledged.
+"""
+
+import math
+import time
+
+from pymavlink import mavutil
+
+from ..common.modules.logger import logger
+from ..link import command_long_encoder
+from ..link import outbound_sender
+
+
+DEFAULT_ACK_TIMEOUT = 1.0  # seconds
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BACKOFF = 2.0
+DEFAULT_ACCEPTED_HOLD = 5.0  # seconds
+DEFAULT_REJECTED_HOLD = 5.0  # seconds
+DEFAULT_PARAM_TOLERANCE = 1e-3
+
+
+class PendingCommand:
+    """
+    A command that has been sent and not acknowledged yet.
+    """
+
+    def __init__(
+        self,
+        command: int,
+        params: "tuple[float, ...]",
+        target_system: int,
+        target_component: int,
+        deadline: float,
+    ) -> None:
+        self.command = command
+        self.params = params
+        self.target_system = target_system
+        self.target_component = target_component
+        self.attempts = 1
+        self.deadline = deadline
+
+
+class CommandTracker:  # pylint: disable=too-many-instance-attributes
+    """
+    Sends COMMAND_LONG messages and keeps at most one in flight per command id.
+
+    Equivalent commands (same id and parameters within a tolerance) are suppressed
+    while one is in flight, and for a hold time after it is accepted or rejected.
+    Unacknowledged commands are retransmitted with exponential backoff, with the
+    confirmation field counting the retransmissions.
+    """
+
+    __private_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        connection: mavutil.mavfile,
+        local_logger: logger.Logger,
+        ack_timeout: float = DEFAULT_ACK_TIMEOUT,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        backoff: float = DEFAULT_BACKOFF,
+        accepted_hold: float = DEFAULT_ACCEPTED_HOLD,
+        sender: outbound_sender.OutboundSender | outbound_sender.QueueSender | None = None,
+        rejected_hold: float = DEFAULT_REJECTED_HOLD,
+    ) -> "tuple[True, CommandTracker] | tuple[False, None]":
+        """
+        Falliable create (instantiation) method to create a CommandTracker object.
+
+        ack_timeout: Wait in seconds for the COMMAND_ACK of the first transmission.
+        max_attempts: Transmissions before giving up on a command.
+        backoff: Factor the wait grows by after each retransmission.
+        accepted_hold: Time in seconds equivalent commands are suppressed after acceptance.
+        sender: Outbound stage to submit the commands to, None to write them directly.
+        rejected_hold: Time in seconds equivalent commands are suppressed after rejection.
+        """
+        if ack_timeout <= 0.0 or backoff < 1.0 or accepted_hold < 0.0 or rejected_hold < 0.0:
+            local_logger.error("Invalid command tracker timing")
+            return False, None
+
+        if max_attempts <= 0:
+            local_logger.error(f"Maximum attempts must be positive, got {max_attempts}")
+            return False, None
+
+        return True, CommandTracker(
+            cls.__private_key,
+            connection,
+            local_logger,
+            ack_timeout,
+            max_attempts,
+            backoff,
+            accepted_hold,
+            sender,
+            rejected_hold,
+        )
+
+    def __init__(
+        self,
+        key: object,
+        connection: mavutil.mavfile,
+        local_logger: logger.Logger,
+        ack_timeout: float,
+        max_attempts: int,
+        backoff: float,
+        accepted_hold: float,
+        sender: outbound_sender.OutboundSender | outbound_sender.QueueSender | None,
+        rejected_hold: float,
+    ) -> None:
+        assert key is CommandTracker.__private_key, "Use create() method"
+
+        self.connection = connection
+        self.local_logger = local_logger
+        self.ack_timeout = ack_timeout
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.accepted_hold = accepted_hold
+        self.sender = sender
+        self.rejected_hold = rejected_hold
+        self.__encoder = command_long_encoder.CommandLongEncoder(connection.mav)
+
+        self.__pending: "dict[int, PendingCommand]" = {}
+        # Command id to parameters and end of the hold, after acceptance or rejection
+        self.__held: "dict[int, tuple[tuple[float, ...], float]]" = {}
+
+        self.sent = 0
+        self.retransmitted = 0
+        self.suppressed = 0
+        self.timed_out = 0
+        self.rejected = 0
+
+    def send(
+        self,
+        command: int,
+        params: "tuple[float, ...]",
+        target_system: int = 1,
+        target_component: int = 0,
+    ) -> bool:
+        """
+        Send the command unless an equivalent one is in flight or was just accepted
+        or rejected.
+        A different command with the same id supersedes the one in flight.
+
+        params: The 7 COMMAND_LONG parameters.
+
+        Returns whether the command was sent.
+        """
+        now = time.monotonic()
+
+        pending = self.__pending.get(command)
+        if pending is not None and is_equivalent(pending.params, params):
+            self.suppressed += 1
+            return False
+
+        held = self.__held.get(command)
+        if held is not None and now < held[1] and is_equivalent(held[0], params):
+            self.suppressed += 1
+            return False
+
+        pending = PendingCommand(
+            command, params, target_system, target_component, now + self.ack_timeout
+        )
+        self.__pending[command] = pending
+        self.__transmit(pending, 0)
+        self.sent += 1
+
+        return True
+
+    def handle_ack(self, msg: mavutil.mavlink.MAVLink_command_ack_message) -> bool:
+        """
+        Resolve the command in flight that the COMMAND_ACK answers.
+
+        Returns whether a command was waiting for it.
+        """
+        pending = self.__pending.get(msg.command)
+        if pending is None:
+            return False
+
+        now = time.monotonic()
+
+        if msg.result == mavutil.mavlink.MAV_RESULT_IN_PROGRESS:
+            # Still being executed, so not lost
+            pending.deadline = now + self.ack_timeout
+            return True
+
+        del self.__pending[msg.command]
+
+        if msg.result == mavutil.mavlink.MAV_RESULT_ACCEPTED:
+            self.__held[msg.command] = (pending.params, now + self.accepted_hold)
+        else:
+            # Repeating a refused command at the telemetry rate would flood the link
+            self.__held[msg.command] = (pending.params, now + self.rejected_hold)
+            self.rejected += 1
+            self.local_logger.warning(f"Command {msg.command} rejected with result {msg.result}")
+
+        return True
+
+    def run(self) -> None:
+        """
+        Retransmit or give up on commands whose acknowledgement is overdue.
+        """
+        now = time.monotonic()
+
+        for pending in list(self.__pending.values()):
+            if now < pending.deadline:
+                continue
+
+            if pending.attempts >= self.max_attempts:
+                del self.__pending[pending.command]
+                self.timed_out += 1
+                self.local_logger.warning(
+                    f"Command {pending.command} not acknowledged after {pending.attempts} attempts"
+                )
+                continue
+
+            self.__transmit(pending, pending.attempts)
+            pending.deadline = now + self.ack_timeout * self.backoff**pending.attempts
+            pending.attempts += 1
+            self.retransmitted += 1
+
+    def in_flight(self) -> int:
+        """
+        Number of commands waiting for an acknowledgement.
+        """
+        return len(self.__pending)
+
+    def __transmit(self, pending: PendingCommand, confirmation: int) -> None:
+        if self.sender is None:
+            self.__encoder.send(
+                pending.target_system,
+                pending.target_component,
+                pending.command,
+                confirmation,
+                *pending.params,
+            )
+            return
+
+        msg = self.connection.mav.command_long_encode(
+            pending.target_system,
+            pending.target_component,
+            pending.command,
+            confirmation,
+            *pending.params,
+        )
+        self.sender.submit(msg)
+
+
+def is_equivalent(
+    params: "tuple[float, ...]",
+    other: "tuple[float, ...]",
+    tolerance: float = DEFAULT_PARAM_TOLERANCE,
+) -> bool:
+    """
+    Whether two parameter tuples are equal within the absolute tolerance.
+    """
+    return all(math.isclose(a, b, rel_tol=0.0, abs_tol=tolerance) for a, b in zip(params, other))
@@ -8,27 +8,54 @@ import pathlib
 from pymavlink import mavutil
 
 from utilities.workers import queue_proxy_wrapper
+from utilities.workers import rate_loop
 from utilities.workers import worker_controller
 from . import command
+from . import command_tracker
+from ..heartbeat import link_status
+from ..link import outbound_sender
+from ..telemetry import telemetry_ring_buffer
 from ..common.modules.logger import logger
 
 
 # =================================================================================================
 #                            ↓ BOOTCAMPERS MODIFY BELOW THIS COMMENT ↓
 # =================================================================================================
+RING_BUFFER_WAIT = 0.1  # seconds
+# Loop period when polling a telemetry queue, well above the telemetry rate
+QUEUE_POLL_PERIOD = 0.01  # seconds
+# Fewest items taken per poll, more if the queue holds more
+TELEMETRY_BATCH_SIZE = 16
+ACK_BATCH_SIZE = 16
+
+
 def command_worker(
     connection: mavutil.mavfile,
     target: command.Position,
     # Place your own arguments here
     # Add other necessary worker arguments here
-    tele_queue: queue_proxy_wrapper.QueueProxyWrapper,
+    tele_queue: queue_proxy_wrapper.QueueProxyWrapper | telemetry_ring_buffer.TelemetryRingBuffer,
+    link: link_status.LinkStatus | None,
+    ack_queue: queue_proxy_wrapper.QueueProxyWrapper | None,
+    outbound_queue: queue_proxy_wrapper.QueueProxyWrapper | None,
     output_queue: queue_proxy_wrapper.QueueProxyWrapper,
     controller: worker_controller.WorkerController,
 ) -> None:
     """
     Worker process.
 
-    args... describe what the arguments are
+    connection: MAVLink connection commands are sent on.
+    target: Position to point at and reach the altitude of.
+    tele_queue: Telemetry input, either a queue of every sample or a shared ring buffer
+        of which only the newest record is used.
+    link: Status published by the heartbeat receiver, no commands are sent while the
+        link is down. None to always send.
+    ack_queue: COMMAND_ACK messages for the commands sent. Commands are tracked until
+        acknowledged and repeats suppressed in the meantime. None to send every decision.
+    outbound_queue: Input of the link writer worker to send commands through,
+        None to write them to the connection directly.
+    output_queue: Where the command decisions are placed.
+    controller: How the main process communicates to this worker process.
     """
     # =============================================================================================
     #                          ↑ BOOTCAMPERS MODIFY ABOVE THIS COMMENT ↑
@@ -52,28 +79,94 @@ def command_worker(
     # =============================================================================================
     # Instantiate class object (command.Command)
 
-    res, cmd = command.Command.create(connection, target, local_logger)
+    sender = None
+    if outbound_queue is not None:
+        sender = outbound_sender.QueueSender(outbound_queue)
+
+    tracker = None
+    if ack_queue is not None:
+        res, tracker = command_tracker.CommandTracker.create(
+            connection, local_logger, sender=sender
+        )
+        if not res:
+            local_logger.warning("failed to create command tracker, sending every decision")
+
+    res, cmd = command.Command.create(
+        connection, target, local_logger, tracker=tracker, sender=sender, link=link
+    )
 
     if not res:
         local_logger.error("failed to create command")
     elif res:
         local_logger.info("command created successfully")
 
+    generation = 0
+
+    # The ring buffer blocks until the next sample, a queue has to be polled
+    pacer = None
+    if not isinstance(tele_queue, telemetry_ring_buffer.TelemetryRingBuffer):
+        _, pacer = rate_loop.RateLoop.create(QUEUE_POLL_PERIOD)
+
     # Main loop: do work.
     while not controller.is_exit_requested() and not controller.check_pause():
-        if not tele_queue.queue.empty():
-            tele_data = tele_queue.queue.get()
-
-            if tele_data is not None:
-                res = cmd.run(tele_data)
-            else:
+        if pacer is not None:
+            pacer.wait()
+
+        if tracker is not None:
+            for ack in ack_queue.get_many(max(ack_queue.maxsize, ACK_BATCH_SIZE)):
+                if ack is not None:
+                    tracker.handle_ack(ack)
+
+            tracker.run()
+
+        if isinstance(tele_queue, telemetry_ring_buffer.TelemetryRingBuffer):
+            # Samples superseded before this worker got to them are skipped
+            if not tele_queue.wait(generation, RING_BUFFER_WAIT):
+                continue
+
+            # Read before taking the generation so a racing write is skipped, not acted on twice
+            _, tele_data = tele_queue.read_latest()
+            generation = tele_queue.generation
+            tele_batch = [tele_data]
+        else:
+            # Every sample since the last poll, in one round trip
+            tele_batch = tele_queue.get_many(max(tele_queue.maxsize, TELEMETRY_BATCH_SIZE))
+
+        for tele_data in tele_batch:
+            if tele_data is None:
                 local_logger.error("tele data returned none")
+                continue
+
+            res = cmd.run(tele_data)
 
             if res is not None:
-                output_queue.queue.put(res)
+                output_queue.put(res)
             else:
                 local_logger.info("command returned None")
 
+    for axis, statistics in zip("xyz", cmd.velocity_statistics):
+        local_logger.info(
+            f"{axis} velocity: mean {statistics.mean}, variance {statistics.variance}, "
+            f"min {statistics.minimum}, max {statistics.maximum}"
+        )
+
+    local_logger.info(f"Stale telemetry: {cmd.stale_count} of {cmd.data_age.count}")
+    local_logger.info(f"Commands held while the link was down: {cmd.link_down_count}")
+
+    if tracker is not None:
+        local_logger.info(
+            f"Commands sent {tracker.sent}, retransmitted {tracker.retransmitted}, "
+            f"suppressed {tracker.suppressed}, timed out {tracker.timed_out}, "
+            f"rejected {tracker.rejected}"
+        )
+    local_logger.info(f"Telemetry age histogram (s): {cmd.data_age}")
+
+    if pacer is not None:
+        local_logger.info(f"Command loop: {pacer}")
+
+    if isinstance(tele_queue, telemetry_ring_buffer.TelemetryRingBuffer):
+        tele_queue.close()
+
 
 # =================================================================================================
 #                            ↑ BOOTCAMPERS MODIFY ABOVE THIS COMMENT ↑
@@ -0,0 +1,105 @@
+"""
+Altitude and yaw decision of Command as a pure function, vectorized over NumPy arrays
+so that recorded telemetry can be replayed against different tolerances in bulk.
+decide_one() is the same decision for a single live sample without NumPy's overhead.
+"""
+
+import math
+
+import numpy as np
+
+
+# Decisions
+NO_OP = 0
+CHANGE_ALTITUDE = 1
+CHANGE_YAW = 2
+
+
+def decide(
+    x: "float | np.ndarray",
+    y: "float | np.ndarray",
+    z: "float | np.ndarray",
+    yaw: "float | np.ndarray",
+    target: "tuple[float, float, float]",
+    altitude_error: float,
+    yaw_error: float,
+) -> "tuple[np.ndarray, np.ndarray]":
+    """
+    Decide for each sample whether to change altitude, change yaw or do nothing.
+    Altitude is corrected first, yaw only once the altitude is within tolerance.
+
+    x, y, z: Position in m, scalars or arrays of the same shape.
+    yaw: Heading in rad.
+    target: Position (x, y, z) in m to reach the altitude of and point at.
+    altitude_error: Tolerance in m.
+    yaw_error: Tolerance in degrees.
+
+    Returns the decisions (NO_OP, CHANGE_ALTITUDE or CHANGE_YAW) and the amounts:
+    the altitude change in m, the relative yaw in degrees in [-180, 180], or 0 for NO_OP.
+    """
+    x, y, z, yaw = np.broadcast_arrays(
+        np.asarray(x, np.float64),
+        np.asarray(y, np.float64),
+        np.asarray(z, np.float64),
+        np.asarray(yaw, np.float64),
+    )
+    target_x, target_y, target_z = target
+
+    altitude_delta = target_z - z
+
+    # Relative yaw to point at the target, positive counter-clockwise
+    yaw_delta = np.arctan2(target_y - y, target_x - x) - yaw
+    yaw_delta = np.where(yaw_delta > np.pi, yaw_delta - 2 * np.pi, yaw_delta)
+    yaw_delta = np.where(yaw_delta < -np.pi, yaw_delta + 2 * np.pi, yaw_delta)
+    yaw_delta = np.degrees(yaw_delta)
+    yaw_delta = np.where(yaw_delta > 180, yaw_delta - 360, yaw_delta)
+    yaw_delta = np.where(yaw_delta < -180, yaw_delta + 360, yaw_delta)
+
+    change_altitude = np.abs(altitude_delta) > altitude_error
+    change_yaw = ~change_altitude & (np.abs(yaw_delta) > yaw_error)
+
+    decisions = np.full(z.shape, NO_OP, np.int8)
+    decisions[change_altitude] = CHANGE_ALTITUDE
+    decisions[change_yaw] = CHANGE_YAW
+
+    amounts = np.where(change_altitude, altitude_delta, np.where(change_yaw, yaw_delta, 0.0))
+
+    return decisions, amounts
+
+
+def decide_one(
+    x: float,
+    y: float,
+    z: float,
+    yaw: float,
+    target: "tuple[float, float, float]",
+    altitude_error: float,
+    yaw_error: float,
+) -> "tuple[int, float]":
+    """
+    Same as decide() for one sample, with scalar math.
+
+    Returns the decision and the amount.
+    """
+    target_x, target_y, target_z = target
+
+    altitude_delta = target_z - z
+    if abs(altitude_delta) > altitude_error:
+        return CHANGE_ALTITUDE, float(altitude_delta)
+
+    # Relative yaw to point at the target, positive counter-clockwise
+    yaw_delta = math.atan2(target_y - y, target_x - x) - yaw
+    if yaw_delta > math.pi:
+        yaw_delta -= 2 * math.pi
+    if yaw_delta < -math.pi:
+        yaw_delta += 2 * math.pi
+    yaw_delta = math.degrees(yaw_delta)
+    if yaw_delta > 180:
+        yaw_delta -= 360
+    if yaw_delta < -180:
+        yaw_delta += 360
+
+    if abs(yaw_delta) > yaw_error:
+        return CHANGE_YAW, yaw_delta
+
+    return NO_OP, 0.0
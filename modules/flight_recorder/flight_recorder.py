@@ -0,0 +1,149 @@
+"""
+Binary flight recorder of raw MAVLink frames.
+
+File layout: MAGIC, then one record per frame of
+(monotonic receive time as float64, frame length as uint16, frame bytes), little endian.
+A zero length marks the end of a recording that was not closed cleanly.
+"""
+
+import io
+import mmap
+import pathlib
+import struct
+import time
+
+from pymavlink import mavutil
+
+from ..common.modules.logger import logger
+
+
+MAGIC = b"MAVREC1\n"
+RECORD_HEADER = struct.Struct("<dH")
+DEFAULT_INITIAL_SIZE = 1 << 20  # bytes
+
+
+class FlightRecorder:
+    """
+    Appends frames to a memory mapped file, growing it as needed.
+    """
+
+    __private_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        path: "str | pathlib.Path",
+        local_logger: logger.Logger,
+        initial_size: int = DEFAULT_INITIAL_SIZE,
+    ) -> "tuple[True, FlightRecorder] | tuple[False, None]":
+        """
+        Falliable create (instantiation) method to create a FlightRecorder object.
+        Overwrites any existing file at path.
+
+        initial_size: Bytes preallocated for the recording, doubled whenever it is full.
+        """
+        if initial_size < len(MAGIC) + RECORD_HEADER.size:
+            local_logger.error(f"Initial recording size too small: {initial_size}")
+            return False, None
+
+        try:
+            file = open(path, "w+b")  # pylint: disable=consider-using-with
+            file.truncate(initial_size)
+            memory_map = mmap.mmap(file.fileno(), initial_size)
+        except OSError as e:
+            local_logger.error(f"Failed to open recording {path}: {e}")
+            return False, None
+
+        return True, FlightRecorder(cls.__private_key, file, memory_map, local_logger)
+
+    def __init__(
+        self,
+        key: object,
+        file: io.BufferedRandom,
+        memory_map: mmap.mmap,
+        local_logger: logger.Logger,
+    ) -> None:
+        assert key is FlightRecorder.__private_key, "Use create() method"
+
+        self.__file = file
+        self.__map = memory_map
+        self.local_logger = local_logger
+
+        self.__map[: len(MAGIC)] = MAGIC
+        self.__offset = len(MAGIC)
+        self.frame_count = 0
+
+    def record(self, frame: bytes, receive_time: float) -> None:
+        """
+        Append a frame received at the monotonic time.
+        """
+        end = self.__offset + RECORD_HEADER.size + len(frame)
+        if end > len(self.__map):
+            self.__grow(end)
+
+        RECORD_HEADER.pack_into(self.__map, self.__offset, receive_time, len(frame))
+        self.__map[self.__offset + RECORD_HEADER.size : end] = frame
+        self.__offset = end
+        self.frame_count += 1
+
+    def message_hook(
+        self, connection: mavutil.mavfile, msg: mavutil.mavlink.MAVLink_message
+    ) -> None:
+        """
+        For mavfile.message_hooks, called for every message as it is received.
+        """
+        _ = connection
+        if msg.get_type() == "BAD_DATA":
+            return
+
+        self.record(bytes(msg.get_msgbuf()), time.monotonic())
+
+    def close(self) -> None:
+        """
+        Flush and trim the file to the recorded length.
+        """
+        self.__map.flush()
+        self.__map.close()
+        self.__file.truncate(self.__offset)
+        self.__file.close()
+        self.local_logger.info(f"Recorded {self.frame_count} frames")
+
+    def __grow(self, minimum_size: int) -> None:
+        size = len(self.__map)
+        while size < minimum_size:
+            size *= 2
+
+        self.__map.flush()
+        self.__map.close()
+        self.__file.truncate(size)
+        self.__map = mmap.mmap(self.__file.fileno(), size)
+
+
+def read_recording(
+    path: "str | pathlib.Path", local_logger: logger.Logger
+) -> "tuple[True, list[tuple[float, bytes]]] | tuple[False, None]":
+    """
+    Reads every (receive time, frame) of a recording.
+    """
+    try:
+        data = pathlib.Path(path).read_bytes()
+    except OSError as e:
+        local_logger.error(f"Failed to read recording {path}: {e}")
+        return False, None
+
+    if not data.startswith(MAGIC):
+        local_logger.error(f"{path} is not a flight recording")
+        return False, None
+
+    frames = []
+    offset = len(MAGIC)
+    while offset + RECORD_HEADER.size <= len(data):
+        receive_time, length = RECORD_HEADER.unpack_from(data, offset)
+        offset += RECORD_HEADER.size
+        if length == 0 or offset + length > len(data):
+            break
+
+        frames.append((receive_time, data[offset : offset + length]))
+        offset += length
+
+    return True, frames
@@ -0,0 +1,123 @@
+"""
+Replay of a flight recording as a MAVLink connection.
+"""
+
+import pathlib
+import time
+
+from pymavlink import mavutil
+
+from . import flight_recorder
+from ..common.modules.logger import logger
+
+
+AS_FAST_AS_POSSIBLE = 0.0
+
+
+class ReplayConnection(mavutil.mavfile):
+    """
+    Stand-in for mavutil.mavfile that receives the frames of a recording with their
+    original spacing scaled by speed. Written bytes are kept in `sent` instead of
+    going anywhere, so that outgoing commands can be checked.
+    """
+
+    __private_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        path: "str | pathlib.Path",
+        speed: float,
+        local_logger: logger.Logger,
+    ) -> "tuple[True, ReplayConnection] | tuple[False, None]":
+        """
+        Falliable create (instantiation) method to create a ReplayConnection object.
+
+        speed: 1.0 for real time, N for N times faster, AS_FAST_AS_POSSIBLE for no delay.
+        """
+        if speed < 0.0:
+            local_logger.error(f"Replay speed must not be negative, got {speed}")
+            return False, None
+
+        result, frames = flight_recorder.read_recording(path, local_logger)
+        if not result:
+            return False, None
+
+        return True, ReplayConnection(cls.__private_key, frames, speed, pathlib.Path(path).name)
+
+    def __init__(
+        self,
+        key: object,
+        frames: "list[tuple[float, bytes]]",
+        speed: float,
+        address: str,
+    ) -> None:
+        assert key is ReplayConnection.__private_key, "Use create() method"
+
+        super().__init__(None, address, input=False)
+
+        self.__frames = frames
+        self.__speed = speed
+        self.__index = 0
+        self.__start = None
+
+        self.sent: "list[bytes]" = []
+
+    @property
+    def finished(self) -> bool:
+        """
+        Whether every frame has been received.
+        """
+        return self.__index >= len(self.__frames)
+
+    def recv(self, n: "int | None" = None) -> bytes:
+        """
+        Next frame if it is due, otherwise nothing.
+        """
+        _ = n
+        if self.finished or self.__time_until_due() > 0.0:
+            return b""
+
+        frame = self.__frames[self.__index][1]
+        self.__index += 1
+        return frame
+
+    def select(self, timeout: float) -> bool:
+        """
+        Wait for up to timeout seconds for the next frame to be due.
+        """
+        if self.finished:
+            time.sleep(timeout)
+            return False
+
+        wait = self.__time_until_due()
+        if wait > timeout:
+            time.sleep(timeout)
+            return False
+
+        if wait > 0.0:
+            time.sleep(wait)
+
+        return True
+
+    def write(self, buf: bytes) -> None:
+        """
+        Keep outgoing bytes for inspection.
+        """
+        self.sent.append(bytes(buf))
+
+    def close(self) -> None:
+        """
+        Nothing to release.
+        """
+
+    def __time_until_due(self) -> float:
+        if self.__speed == AS_FAST_AS_POSSIBLE:
+            return 0.0
+
+        now = time.monotonic()
+        if self.__start is None:
+            self.__start = now
+
+        offset = self.__frames[self.__index][0] - self.__frames[0][0]
+        return self.__start + offset / self.__speed - now
@@ -0,0 +1,173 @@
+"""
+Liveness of every MAVLink system and component heard on a connection.
+"""
+
+import heapq
+import time
+
+from pymavlink import mavutil
+
+from . import link_status
+from . import liveness_detector
+from ..common.modules.logger import logger
+
+
+class HeartbeatMonitor:
+    """
+    One LivenessDetector per (system id, component id), created on its first heartbeat.
+
+    Disconnect deadlines are kept on a min-heap with one entry per connected source.
+    A heartbeat only moves the detector's deadline, the heap entry is refreshed lazily
+    when it comes due, so a heartbeat costs O(1) and a deadline O(log N).
+    """
+
+    __private_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        connection: mavutil.mavfile,
+        local_logger: logger.Logger,
+        expected_period: float = liveness_detector.DEFAULT_EXPECTED_PERIOD,
+        timeout: float = liveness_detector.DEFAULT_TIMEOUT,
+    ) -> "tuple[True, HeartbeatMonitor] | tuple[False, None]":
+        """
+        Falliable create (instantiation) method to create a HeartbeatMonitor object.
+
+        expected_period: Time in seconds between heartbeats of a healthy source.
+        timeout: Time in seconds without a heartbeat before a source is disconnected.
+        """
+        # Validate once rather than on the first heartbeat
+        result, _ = liveness_detector.LivenessDetector.create(
+            local_logger, expected_period, timeout
+        )
+        if not result:
+            return False, None
+
+        return True, HeartbeatMonitor(
+            cls.__private_key, connection, local_logger, expected_period, timeout
+        )
+
+    def __init__(
+        self,
+        key: object,
+        connection: mavutil.mavfile,
+        local_logger: logger.Logger,
+        expected_period: float,
+        timeout: float,
+    ) -> None:
+        assert key is HeartbeatMonitor.__private_key, "Use create() method"
+
+        self.connection = connection
+        self.local_logger = local_logger
+        self.expected_period = expected_period
+        self.timeout = timeout
+
+        self.detectors: "dict[tuple[int, int], liveness_detector.LivenessDetector]" = {}
+        # (deadline, system id, component id), at most one per connected source
+        self.__deadlines: "list[tuple[float, int, int]]" = []
+
+    def heartbeat(
+        self, source: "tuple[int, int]", arrival_time: float
+    ) -> "link_status.StatusChange | None":
+        """
+        Record a heartbeat from source (system id, component id).
+
+        Returns the change if the source became connected.
+        """
+        detector = self.detectors.get(source)
+        if detector is None:
+            _, detector = liveness_detector.LivenessDetector.create(
+                self.local_logger, self.expected_period, self.timeout
+            )
+            self.detectors[source] = detector
+
+        if not detector.heartbeat(arrival_time):
+            return None
+
+        heapq.heappush(self.__deadlines, (detector.deadline(), *source))
+        return link_status.StatusChange(link_status.CONNECTED, detector.changed_at)
+
+    def poll(self, now: float) -> "list[tuple[tuple[int, int], link_status.StatusChange]]":
+        """
+        Disconnect the sources whose deadline has passed at time now.
+
+        Returns the sources that became disconnected, in deadline order.
+        """
+        changes = []
+
+        while len(self.__deadlines) > 0 and self.__deadlines[0][0] <= now:
+            _, system, component = self.__deadlines[0]
+            detector = self.detectors[(system, component)]
+
+            deadline = detector.deadline()
+            if deadline is not None and deadline > now:
+                # Heard from since the entry was pushed
+                heapq.heapreplace(self.__deadlines, (deadline, system, component))
+                continue
+
+            heapq.heappop(self.__deadlines)
+            if detector.poll(now):
+                changes.append(
+                    (
+                        (system, component),
+                        link_status.StatusChange(link_status.DISCONNECTED, detector.changed_at),
+                    )
+                )
+
+        return changes
+
+    def next_deadline(self) -> "float | None":
+        """
+        Earliest time a source can be disconnected at, None if none is connected.
+        May be early, as heap entries are only refreshed when they come due.
+        """
+        if len(self.__deadlines) == 0:
+            return None
+
+        return self.__deadlines[0][0]
+
+    def connected(self) -> "list[tuple[int, int]]":
+        """
+        Sources currently connected.
+        """
+        return [source for source, detector in self.detectors.items() if detector.connected]
+
+    def run(self) -> "list[tuple[tuple[int, int], link_status.StatusChange]]":
+        """
+        Wait for a heartbeat until the next deadline, or for up to one expected period.
+
+        Returns the status changes of the sources.
+        """
+        now = time.monotonic()
+        wait = self.expected_period
+        deadline = self.next_deadline()
+        if deadline is not None:
+            wait = min(max(deadline - now, 0.0), wait)
+
+        try:
+            msg = self.connection.recv_match(type="HEARTBEAT", blocking=True, timeout=wait)
+        except ConnectionError as e:
+            self.local_logger.error(f"There was a problem recieving the hearbeat: {e}")
+            msg = None
+
+        now = time.monotonic()
+        changes = []
+
+        if msg is not None:
+            # Stamped by the link reader, otherwise it has just arrived
+            arrival_time = getattr(msg, "receive_time", None)
+            if arrival_time is None:
+                arrival_time = now
+
+            source = (msg.get_srcSystem(), msg.get_srcComponent())
+            change = self.heartbeat(source, arrival_time)
+            if change is not None:
+                self.local_logger.info(f"System {source[0]} component {source[1]} connected")
+                changes.append((source, change))
+
+        for source, change in self.poll(now):
+            self.local_logger.warning(f"System {source[0]} component {source[1]} disconnected")
+            changes.append((source, change))
+
+        return changes
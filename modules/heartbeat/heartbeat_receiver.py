@@ -2,8 +2,13 @@
 Heartbeat receiving logic.
 """
 
+import time
+
 from pymavlink import mavutil
 
+from . import link_quality
+from . import link_status
+from . import liveness_detector
 from ..common.modules.logger import logger
 
 
@@ -23,13 +28,26 @@ class HeartbeatReceiver:
         connection: mavutil.mavfile,
         # Put your own arguments here
         local_logger: logger.Logger,
+        expected_period: float = liveness_detector.DEFAULT_EXPECTED_PERIOD,
+        timeout: float = liveness_detector.DEFAULT_TIMEOUT,
+        quality: link_quality.LinkQuality | None = None,
     ) -> tuple[bool, "HeartbeatReceiver"] | tuple[bool, None]:
         """
         Falliable create (instantiation) method to create a HeartbeatReceiver object.
+
+        expected_period: Time in seconds between heartbeats of a healthy link.
+        timeout: Time in seconds without a heartbeat before the drone is disconnected.
+        quality: Measures heartbeat jitter and the round trip of TIMESYNC responses,
+            which are then also received. None to not measure.
         """
+        result, detector = liveness_detector.LivenessDetector.create(
+            local_logger, expected_period, timeout
+        )
+        if not result:
+            return False, None
 
         try:
-            return True, cls(cls.__private_key, connection, local_logger)
+            return True, cls(cls.__private_key, connection, local_logger, detector, quality)
         except (TypeError, ValueError) as e:
             local_logger.error(f"Failed to create heartbeat reciever: {e}")
             return False, None
@@ -42,45 +60,68 @@ class HeartbeatReceiver:
         connection: mavutil.mavfile,
         # Put your own arguments here
         local_logger: logger.Logger,
+        detector: liveness_detector.LivenessDetector,
+        quality: link_quality.LinkQuality | None,
     ) -> None:
         assert key is HeartbeatReceiver.__private_key, "Use create() method"
 
         # Do any intializiation here
         self.connection = connection
-        self.status = "Disconnected"
+        self.status = link_status.DISCONNECTED
         self.missed = 0
         self.local_logger = local_logger
+        self.detector = detector
+        self.quality = quality
+        self.__message_types = "HEARTBEAT" if quality is None else ["HEARTBEAT", "TIMESYNC"]
 
     def run(
         self,
         # Put your own arguments here
     ) -> str:
         """
-        Attempt to recieve a heartbeat message.
-        If disconnected for over a threshold number of periods,
-        the connection is considered disconnected.
+        Wait for a heartbeat until the disconnect deadline, or for up to one expected period.
+        The drone is disconnected once no heartbeat has arrived for the timeout.
         """
-
-        msg = self.connection.recv_match(type="HEARTBEAT", blocking=False)
+        now = time.monotonic()
+        wait = self.detector.expected_period
+        deadline = self.detector.deadline()
+        if deadline is not None:
+            wait = min(max(deadline - now, 0.0), wait)
 
         try:
-            if msg is None:
-                self.missed += 1
-                if self.missed >= 5:
-                    self.status = "Disconnected"
-                    self.local_logger.warning("The drone has been disconnected.")
-                else:
-                    self.local_logger.warning(f"{self.missed} heartbeats missed.")
+            msg = self.connection.recv_match(type=self.__message_types, blocking=True, timeout=wait)
+        except ConnectionError as e:
+            self.local_logger.error(f"There was a problem recieving the hearbeat: {e}")
+            msg = None
 
+        now = time.monotonic()
+
+        if msg is not None:
+            # Stamped by the link reader, otherwise it has just arrived
+            arrival_time = getattr(msg, "receive_time", None)
+            if arrival_time is None:
+                arrival_time = now
+
+            if msg.get_type() == "TIMESYNC":
+                self.quality.timesync(msg, arrival_time)
             else:
-                self.missed = 0
-                if self.status == "Disconnected":
-                    self.status = "Connected"
+                if self.quality is not None:
+                    self.quality.heartbeat(arrival_time)
+
+                if self.detector.heartbeat(arrival_time):
                     self.local_logger.info("The drone is connected.")
 
-        except ConnectionError as e:
-            self.local_logger.error(f"There was a problem recieving the hearbeat: {e}")
+        if self.detector.poll(now):
+            self.local_logger.warning("The drone has been disconnected.")
+            if self.quality is not None:
+                self.quality.reset()
+
+        missed = self.detector.missed(now) if self.detector.connected else 0
+        if missed > self.missed:
+            self.local_logger.warning(f"{missed} heartbeats missed.")
+        self.missed = missed
 
+        self.status = link_status.CONNECTED if self.detector.connected else link_status.DISCONNECTED
         return self.status
 
 
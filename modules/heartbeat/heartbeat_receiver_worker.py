@@ -4,13 +4,14 @@ Heartbeat worker that sends heartbeats periodically.
 
 import os
 import pathlib
-import time
 
 from pymavlink import mavutil
 
 from utilities.workers import queue_proxy_wrapper
 from utilities.workers import worker_controller
 from . import heartbeat_receiver
+from . import link_quality
+from . import link_status
 from ..common.modules.logger import logger
 
 
@@ -21,14 +22,19 @@ def heartbeat_receiver_worker(
     connection: mavutil.mavfile,
     # Place your own arguments here
     # Add other necessary worker arguments here
+    status: link_status.LinkStatus | None,
+    quality: link_quality.SharedLinkQuality | None,
     output_queue: queue_proxy_wrapper.QueueProxyWrapper,
     controller: worker_controller.WorkerController,
 ) -> None:
     """
     Worker process.
 
-    args... describe what the arguments are
-    output_queue is where the recieved messages are placed
+    connection is where the heartbeats are received from
+    status is the shared status word the link status is published to, None for none
+    quality is where heartbeat jitter and TIMESYNC round trip percentiles are published,
+        None to not measure them
+    output_queue is where the link status changes (link_status.StatusChange) are placed
     controller provides the worker with instructions (pause, end, etc)
     """
     # =============================================================================================
@@ -53,8 +59,14 @@ def heartbeat_receiver_worker(
     # =============================================================================================
     # Instantiate class object (heartbeat_receiver.HeartbeatReceiver)
 
+    measurements = None
+    if quality is not None:
+        res, measurements = link_quality.LinkQuality.create(local_logger)
+        if not res:
+            local_logger.warning("failed to create link quality, not measuring")
+
     res, heartbeat_rcvr = heartbeat_receiver.HeartbeatReceiver.create(
-        connection=connection, local_logger=local_logger
+        connection=connection, local_logger=local_logger, quality=measurements
     )
 
     if not res:
@@ -62,12 +74,19 @@ def heartbeat_receiver_worker(
     elif res:
         local_logger.info("heartbeat receiver successfully created")
 
+    # Only changes are published
+    publisher = link_status.StatusPublisher(output_queue, status)
+
     # Main loop: do work.
 
     while not controller.is_exit_requested() and not controller.check_pause():
+        # Blocks until a heartbeat or the disconnect deadline, no sleep needed
         res = heartbeat_rcvr.run()
-        output_queue.queue.put(res)
-        time.sleep(1)
+
+        if measurements is not None:
+            measurements.publish(quality)
+
+        publisher.publish(res, heartbeat_rcvr.detector.changed_at)
 
 
 # ==============================================    ===================================================
@@ -3,7 +3,9 @@ Heartbeat sending logic.
 """
 
 from pymavlink import mavutil
+from . import link_quality
 from ..common.modules.logger import logger
+from ..link import outbound_sender
 
 
 # =================================================================================================
@@ -21,12 +23,22 @@ class HeartbeatSender:
         cls,
         connection: mavutil.mavfile,
         # Put your own arguments here
+        local_logger: logger.Logger,
+        sender: outbound_sender.OutboundSender | outbound_sender.QueueSender | None = None,
+        timesync: bool = False,
     ) -> "tuple[True, HeartbeatSender] | tuple[False, None]":
         """
         Falliable create (instantiation) method to create a HeartbeatSender object.
+
+        sender: Outbound stage to submit the heartbeats to, None to write them directly.
+        timesync: Also send a TIMESYNC request with each heartbeat to measure the round trip.
         """
         return True, HeartbeatSender(
-            key=cls.__private_key, connection=connection, local_logger=logger
+            key=cls.__private_key,
+            connection=connection,
+            local_logger=local_logger,
+            sender=sender,
+            timesync=timesync,
         )
         # Create a HeartbeatSender object
 
@@ -36,28 +48,45 @@ class HeartbeatSender:
         connection: mavutil.mavfile,
         # Put your own arguments here
         local_logger: logger.Logger,
+        sender: outbound_sender.OutboundSender | outbound_sender.QueueSender | None,
+        timesync: bool,
     ) -> None:
         assert key is HeartbeatSender.__private_key, "Use create() method"
 
         # Do any intializiation here
         self.connection = connection
         self.local_logger = local_logger
+        self.sender = sender
+        self.timesync = timesync
 
     def run(
         self,
         # Put your own arguments here
     ) -> None:
         """
-        Attempt to send a heartbeat message.
+        Attempt to send a heartbeat message, followed by a TIMESYNC request if enabled.
         """
 
-        try:
-            self.connection.mav.heartbeat_send(
+        messages = [
+            self.connection.mav.heartbeat_encode(
                 mavutil.mavlink.MAV_TYPE_GCS, mavutil.mavlink.MAV_AUTOPILOT_INVALID, 0, 0, 0
             )
+        ]
+        if self.timesync:
+            messages.append(link_quality.timesync_request(self.connection.mav))
+
+        for msg in messages:
+            if self.sender is not None:
+                result, _ = self.sender.submit(msg)
+                if not result:
+                    self.local_logger.warning(f"Outbound queue full, {msg.get_type()} dropped")
+                continue
+
+            try:
+                self.connection.mav.send(msg)
 
-        except ConnectionError as e:
-            self.local_logger.error(f"Failed to send heartbeat: {e}")
+            except ConnectionError as e:
+                self.local_logger.error(f"Failed to send {msg.get_type()}: {e}")
         # Send a heartbeat message
 
 
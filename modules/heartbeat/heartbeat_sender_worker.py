@@ -4,28 +4,39 @@ Heartbeat worker that sends heartbeats periodically.
 
 import os
 import pathlib
-import time
 
 from pymavlink import mavutil
 
+from utilities.workers import queue_proxy_wrapper
+from utilities.workers import rate_loop
 from utilities.workers import worker_controller
 from . import heartbeat_sender
 from ..common.modules.logger import logger
+from ..link import outbound_sender
 
 
 # =================================================================================================
 #                            ↓ BOOTCAMPERS MODIFY BELOW THIS COMMENT ↓
 # =================================================================================================
+HEARTBEAT_PERIOD = 1.0  # seconds
+
+
 def heartbeat_sender_worker(
     connection: mavutil.mavfile,
     # Place your own arguments here
     # Add other necessary worker arguments here
+    timesync: bool,
+    outbound_queue: queue_proxy_wrapper.QueueProxyWrapper | None,
     controller: worker_controller.WorkerController(),
 ) -> None:
     """
     Worker process.
 
-    args... describe what the arguments are
+    connection: MAVLink connection heartbeats are sent on.
+    timesync: Also send TIMESYNC requests for the heartbeat receiver to time the round trip.
+    outbound_queue: Input of the link writer worker to send heartbeats through,
+        None to write them to the connection directly.
+    controller: How the main process communicates to this worker process.
     """
     # =============================================================================================
     #                          ↑ BOOTCAMPERS MODIFY ABOVE THIS COMMENT ↑
@@ -48,17 +59,26 @@ def heartbeat_sender_worker(
     #                          ↓ BOOTCAMPERS MODIFY BELOW THIS COMMENT ↓
     # =============================================================================================
     # Instantiate class object (heartbeat_sender.HeartbeatSender)
-    res, sndr = heartbeat_sender.HeartbeatSender.create(connection)
+    sender = None
+    if outbound_queue is not None:
+        sender = outbound_sender.QueueSender(outbound_queue)
+
+    res, sndr = heartbeat_sender.HeartbeatSender.create(connection, local_logger, sender, timesync)
 
     if not res:
         local_logger.error("failed to create heartbeat sender")
     else:
         local_logger.info("heartbeat sender created successfully")
 
+    # Paced on deadlines so the period does not drift by the send time
+    _, pacer = rate_loop.RateLoop.create(HEARTBEAT_PERIOD)
+
     # Main loop: do work.
     while not controller.is_exit_requested() and not controller.check_pause():
         sndr.run()
-        time.sleep(1.0)
+        pacer.wait()
+
+    local_logger.info(f"Heartbeat loop: {pacer}")
 
 
 # =================================================================================================
@@ -0,0 +1,116 @@
+"""
+Heartbeat sending and receiving in one asyncio event loop.
+"""
+
+import asyncio
+
+from utilities.workers import rate_loop
+from utilities.workers import worker_controller
+from . import heartbeat_receiver
+from . import heartbeat_sender
+from . import link_quality
+from . import link_status
+from ..common.modules.logger import logger
+
+
+DEFAULT_SEND_PERIOD = 1.0  # seconds
+EXIT_POLL_PERIOD = 0.1  # seconds
+
+
+class LinkHealthService:
+    """
+    Runs a HeartbeatSender and a HeartbeatReceiver as two coroutines of one event loop,
+    so the link health needs one process instead of one each.
+
+    Sending is paced on deadlines. The sends, which can wait for space in the link writer's
+    queue, and the receiver's blocking wait for the next heartbeat or deadline run in the
+    loop's executor so neither stalls the other.
+    """
+
+    __private_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        sender: heartbeat_sender.HeartbeatSender,
+        receiver: heartbeat_receiver.HeartbeatReceiver,
+        publisher: link_status.StatusPublisher,
+        local_logger: logger.Logger,
+        quality: link_quality.SharedLinkQuality | None = None,
+        send_period: float = DEFAULT_SEND_PERIOD,
+    ) -> "tuple[True, LinkHealthService] | tuple[False, None]":
+        """
+        Falliable create (instantiation) method to create a LinkHealthService object.
+
+        publisher: Where the receiver's status changes are published.
+        quality: Where the receiver's link quality measurements are published, None for none.
+        send_period: Time in seconds between heartbeats sent.
+        """
+        result, pacer = rate_loop.RateLoop.create(send_period)
+        if not result:
+            local_logger.error(f"Send period must be positive, got {send_period}")
+            return False, None
+
+        return True, LinkHealthService(
+            cls.__private_key, sender, receiver, publisher, local_logger, quality, pacer
+        )
+
+    def __init__(
+        self,
+        key: object,
+        sender: heartbeat_sender.HeartbeatSender,
+        receiver: heartbeat_receiver.HeartbeatReceiver,
+        publisher: link_status.StatusPublisher,
+        local_logger: logger.Logger,
+        quality: link_quality.SharedLinkQuality | None,
+        pacer: rate_loop.RateLoop,
+    ) -> None:
+        assert key is LinkHealthService.__private_key, "Use create() method"
+
+        self.sender = sender
+        self.receiver = receiver
+        self.publisher = publisher
+        self.local_logger = local_logger
+        self.quality = quality
+        self.pacer = pacer
+
+    async def run(self, controller: worker_controller.WorkerController) -> None:
+        """
+        Send and receive until the controller requests an exit.
+        """
+        stop = asyncio.Event()
+
+        await asyncio.gather(
+            self.__send_loop(stop),
+            self.__receive_loop(stop),
+            self.__watch(controller, stop),
+        )
+
+    async def __send_loop(self, stop: asyncio.Event) -> None:
+        loop = asyncio.get_running_loop()
+
+        while not stop.is_set():
+            await loop.run_in_executor(None, self.sender.run)
+            await self.pacer.async_wait()
+
+    async def __receive_loop(self, stop: asyncio.Event) -> None:
+        loop = asyncio.get_running_loop()
+
+        while not stop.is_set():
+            # Returns within one expected period
+            status = await loop.run_in_executor(None, self.receiver.run)
+
+            if self.quality is not None and self.receiver.quality is not None:
+                self.receiver.quality.publish(self.quality)
+
+            self.publisher.publish(status, self.receiver.detector.changed_at)
+
+    async def __watch(
+        self, controller: worker_controller.WorkerController, stop: asyncio.Event
+    ) -> None:
+        while not controller.is_exit_requested():
+            # Pausing blocks the whole loop, as it did each worker
+            controller.check_pause()
+            await asyncio.sleep(EXIT_POLL_PERIOD)
+
+        stop.set()
@@ -0,0 +1,97 @@
+"""
+Link health worker that sends and receives heartbeats in one process.
+"""
+
+import asyncio
+import os
+import pathlib
+
+from pymavlink import mavutil
+
+from utilities.workers import queue_proxy_wrapper
+from utilities.workers import worker_controller
+from . import heartbeat_receiver
+from . import heartbeat_sender
+from . import link_health_service
+from . import link_quality
+from . import link_status
+from ..common.modules.logger import logger
+from ..link import outbound_sender
+
+
+def link_health_worker(
+    connection: mavutil.mavfile,
+    receive_connection: mavutil.mavfile,
+    timesync: bool,
+    status: link_status.LinkStatus | None,
+    quality: link_quality.SharedLinkQuality | None,
+    outbound_queue: queue_proxy_wrapper.QueueProxyWrapper | None,
+    output_queue: queue_proxy_wrapper.QueueProxyWrapper,
+    controller: worker_controller.WorkerController,
+) -> None:
+    """
+    Worker process, replacing the heartbeat sender and receiver workers.
+
+    connection: MAVLink connection heartbeats are sent on.
+    receive_connection: Where heartbeats (and TIMESYNC responses) are received from,
+        e.g. a link reader subscription.
+    timesync: Also send TIMESYNC requests and time the responses.
+    status: Shared status word the link status is published to, None for none.
+    quality: Where heartbeat jitter and TIMESYNC round trip percentiles are published,
+        None to not measure them.
+    outbound_queue: Input of the link writer worker to send heartbeats through,
+        None to write them to the connection directly.
+    output_queue: Where the link status changes (link_status.StatusChange) are placed.
+    controller: How the main process communicates to this worker process.
+    """
+    # Instantiate logger
+    worker_name = pathlib.Path(__file__).stem
+    process_id = os.getpid()
+    result, local_logger = logger.Logger.create(f"{worker_name}_{process_id}", True)
+    if not result:
+        print("ERROR: Worker failed to create logger")
+        return
+
+    # Get Pylance to stop complaining
+    assert local_logger is not None
+
+    local_logger.info("Logger initialized", True)
+
+    sender = None
+    if outbound_queue is not None:
+        sender = outbound_sender.QueueSender(outbound_queue)
+
+    _, heartbeat_sndr = heartbeat_sender.HeartbeatSender.create(
+        connection, local_logger, sender, timesync
+    )
+
+    measurements = None
+    if quality is not None:
+        result, measurements = link_quality.LinkQuality.create(local_logger)
+        if not result:
+            local_logger.warning("Failed to create link quality, not measuring", True)
+
+    result, heartbeat_rcvr = heartbeat_receiver.HeartbeatReceiver.create(
+        receive_connection, local_logger, quality=measurements
+    )
+    if not result:
+        local_logger.error("Failed to create heartbeat receiver", True)
+        return
+
+    result, service = link_health_service.LinkHealthService.create(
+        heartbeat_sndr,
+        heartbeat_rcvr,
+        link_status.StatusPublisher(output_queue, status),
+        local_logger,
+        quality,
+    )
+    if not result:
+        local_logger.error("Failed to create link health service", True)
+        return
+
+    # Get Pylance to stop complaining
+    assert service is not None
+
+    asyncio.run(service.run(controller))
+
+    local_logger.info(f"Heartbeat loop: {service.pacer}", True)
@@ -0,0 +1,202 @@
+"""
+Link quality measurements: heartbeat jitter, message loss and TIMESYNC round trip time.
+"""
+
+import math
+import multiprocessing as mp
+import time
+
+from pymavlink import mavutil
+
+from utilities.statistics import rolling_percentiles
+from . import liveness_detector
+from ..common.modules.logger import logger
+
+
+PERCENTILES = (0.5, 0.95, 0.99)
+
+# Shared array layout, times in seconds
+FIELDS = (
+    "jitter_p50",
+    "jitter_p95",
+    "jitter_p99",
+    "rtt_p50",
+    "rtt_p95",
+    "rtt_p99",
+    "received",
+    "lost",
+    # Over the interval since the previous loss update
+    "loss_rate",
+)
+
+# Responses slower than this are from requests the link has lost track of
+MAX_ROUND_TRIP = 10.0  # seconds
+
+
+class SharedLinkQuality:
+    """
+    Latest link quality figures in shared memory, readable by any process.
+    NaN until measured.
+
+    Jitter and round trip time are written by the heartbeat receiver,
+    loss by the link reader, which is the only process that sees every message.
+    """
+
+    __private_key = object()
+
+    @classmethod
+    def create(
+        cls, local_logger: logger.Logger
+    ) -> "tuple[True, SharedLinkQuality] | tuple[False, None]":
+        """
+        Falliable create (instantiation) method to create a SharedLinkQuality object.
+        Pass it to the worker processes when they are created.
+        """
+        try:
+            values = mp.Array("d", [math.nan] * len(FIELDS))
+        except OSError as e:
+            local_logger.error(f"Failed to allocate link quality: {e}")
+            return False, None
+
+        return True, SharedLinkQuality(cls.__private_key, values)
+
+    def __init__(self, key: object, values: "mp.Array") -> None:
+        assert key is SharedLinkQuality.__private_key, "Use create() method"
+
+        self.__values = values
+        # Totals at the previous loss update, only used by the writing process
+        self.__previous = (0, 0)
+
+    def update(self, **fields: float) -> None:
+        """
+        Write the given fields together.
+        """
+        with self.__values.get_lock():
+            for name, value in fields.items():
+                self.__values[FIELDS.index(name)] = value
+
+    def update_loss(self, received: int, lost: int) -> None:
+        """
+        Write the running message totals and the loss rate since the previous call.
+        """
+        delta_received = received - self.__previous[0]
+        delta_lost = lost - self.__previous[1]
+        self.__previous = (received, lost)
+
+        loss_rate = math.nan
+        if delta_received + delta_lost > 0:
+            loss_rate = delta_lost / (delta_received + delta_lost)
+
+        self.update(received=received, lost=lost, loss_rate=loss_rate)
+
+    def read(self) -> "dict[str, float]":
+        """
+        Consistent copy of every field.
+        """
+        with self.__values.get_lock():
+            return dict(zip(FIELDS, self.__values[:]))
+
+
+class LinkQuality:
+    """
+    Rolling percentiles of heartbeat jitter, the deviation of the time between heartbeats
+    from the expected period, and of the TIMESYNC round trip time.
+
+    TIMESYNC requests carry time.monotonic_ns() in ts1, which the other end echoes back,
+    so any process on this machine can send the requests and time the responses.
+    """
+
+    __private_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        local_logger: logger.Logger,
+        expected_period: float = liveness_detector.DEFAULT_EXPECTED_PERIOD,
+        size: int = rolling_percentiles.DEFAULT_SIZE,
+    ) -> "tuple[True, LinkQuality] | tuple[False, None]":
+        """
+        Falliable create (instantiation) method to create a LinkQuality object.
+
+        expected_period: Time in seconds between heartbeats of a healthy link.
+        size: Number of recent samples the percentiles are over.
+        """
+        if expected_period <= 0.0:
+            local_logger.error(f"Expected period must be positive, got {expected_period}")
+            return False, None
+
+        result, jitter = rolling_percentiles.RollingPercentiles.create(size)
+        if not result:
+            local_logger.error(f"Sample count must be positive, got {size}")
+            return False, None
+
+        _, round_trip = rolling_percentiles.RollingPercentiles.create(size)
+
+        return True, LinkQuality(cls.__private_key, expected_period, jitter, round_trip)
+
+    def __init__(
+        self,
+        key: object,
+        expected_period: float,
+        jitter: rolling_percentiles.RollingPercentiles,
+        round_trip: rolling_percentiles.RollingPercentiles,
+    ) -> None:
+        assert key is LinkQuality.__private_key, "Use create() method"
+
+        self.expected_period = expected_period
+        self.jitter = jitter
+        self.round_trip = round_trip
+        self.__last_arrival: "float | None" = None
+
+    def heartbeat(self, arrival_time: float) -> None:
+        """
+        Record a heartbeat received at arrival_time (time.monotonic() clock).
+        """
+        if self.__last_arrival is not None and arrival_time > self.__last_arrival:
+            interval = arrival_time - self.__last_arrival
+            self.jitter.add(abs(interval - self.expected_period))
+
+        if self.__last_arrival is None or arrival_time > self.__last_arrival:
+            self.__last_arrival = arrival_time
+
+    def reset(self) -> None:
+        """
+        Forget the last heartbeat, so the gap over a disconnect is not counted as jitter.
+        """
+        self.__last_arrival = None
+
+    def timesync(self, msg: mavutil.mavlink.MAVLink_timesync_message, arrival_time: float) -> bool:
+        """
+        Record the round trip of a TIMESYNC response received at arrival_time
+        (time.monotonic() clock). Requests from the other end are ignored.
+
+        Returns whether it was a response to one of the requests.
+        """
+        if msg.tc1 == 0:
+            return False
+
+        round_trip = arrival_time - msg.ts1 / 1e9
+        if not 0.0 <= round_trip <= MAX_ROUND_TRIP:
+            return False
+
+        self.round_trip.add(round_trip)
+        return True
+
+    def publish(self, shared: SharedLinkQuality) -> None:
+        """
+        Write the current percentiles.
+        """
+        fields = {}
+        for fraction in PERCENTILES:
+            suffix = f"p{round(fraction * 100)}"
+            fields[f"jitter_{suffix}"] = self.jitter.percentile(fraction)
+            fields[f"rtt_{suffix}"] = self.round_trip.percentile(fraction)
+
+        shared.update(**fields)
+
+
+def timesync_request(mav: mavutil.mavlink.MAVLink) -> mavutil.mavlink.MAVLink_timesync_message:
+    """
+    TIMESYNC request stamped with the current time.monotonic_ns().
+    """
+    return mav.timesync_encode(0, time.monotonic_ns())
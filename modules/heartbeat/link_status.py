@@ -0,0 +1,117 @@
+"""
+Link status shared between processes.
+"""
+
+import ctypes
+import multiprocessing as mp
+import time
+
+from utilities.workers import queue_proxy_wrapper
+from ..common.modules.logger import logger
+
+
+CONNECTED = "Connected"
+DISCONNECTED = "Disconnected"
+
+
+class StatusChange:
+    """
+    Transition of the link status, published by the heartbeat receiver.
+    """
+
+    def __init__(self, status: str, timestamp: float) -> None:
+        self.status = status
+        # time.monotonic() of the heartbeat that connected or the deadline that disconnected
+        self.timestamp = timestamp
+
+    def __str__(self) -> str:
+        return f"{self.status} at {self.timestamp:.3f}"
+
+
+class LinkStatus:
+    """
+    Status word in shared memory that any process can read without a queue.
+
+    The word holds the number of transitions shifted left by one with the connected flag
+    in the lowest bit, so a single aligned 64 bit read gives a consistent pair.
+    Written only by the heartbeat receiver.
+    """
+
+    __private_key = object()
+
+    @classmethod
+    def create(cls, local_logger: logger.Logger) -> "tuple[True, LinkStatus] | tuple[False, None]":
+        """
+        Falliable create (instantiation) method to create a LinkStatus object.
+        Starts disconnected. Pass it to the worker processes when they are created.
+        """
+        try:
+            word = mp.RawValue(ctypes.c_int64, 0)
+        except OSError as e:
+            local_logger.error(f"Failed to allocate link status: {e}")
+            return False, None
+
+        return True, LinkStatus(cls.__private_key, word)
+
+    def __init__(self, key: object, word: "ctypes.c_int64") -> None:
+        assert key is LinkStatus.__private_key, "Use create() method"
+
+        self.__word = word
+
+    def publish(self, connected: bool) -> None:
+        """
+        Set the status, counting a transition if it changed.
+        """
+        word = self.__word.value
+        if bool(word & 1) == connected:
+            return
+
+        self.__word.value = ((word >> 1) + 1) << 1 | int(connected)
+
+    def is_connected(self) -> bool:
+        """
+        Whether the link is connected.
+        """
+        return bool(self.__word.value & 1)
+
+    def transitions(self) -> int:
+        """
+        Number of status changes so far.
+        """
+        return self.__word.value >> 1
+
+
+class StatusPublisher:
+    """
+    Publishes the status given to it only when it changes: a StatusChange on the queue
+    and the connected flag to the optional status word.
+    """
+
+    def __init__(
+        self, output_queue: queue_proxy_wrapper.QueueProxyWrapper, status: LinkStatus | None
+    ) -> None:
+        self.output_queue = output_queue
+        self.status = status
+        self.__previous = None
+
+    def publish(self, status: str, changed_at: "float | None") -> bool:
+        """
+        Publish the status, starting with the initial one.
+
+        changed_at: time.monotonic() of the change, None for now.
+
+        Returns whether it changed.
+        """
+        if status == self.__previous:
+            return False
+
+        self.__previous = status
+
+        if self.status is not None:
+            self.status.publish(status == CONNECTED)
+
+        if changed_at is None:
+            changed_at = time.monotonic()
+
+        self.output_queue.put(StatusChange(status, changed_at))
+        return True
@@ -0,0 +1,120 @@
+"""
+Link liveness from heartbeat arrival times.
+"""
+
+from ..common.modules.logger import logger
+
+
+DEFAULT_EXPECTED_PERIOD = 1.0  # seconds
+DEFAULT_TIMEOUT = 5.0  # seconds
+
+# A heartbeat arriving later than this many periods after the previous one is reported late
+LATE_FACTOR = 1.5
+
+
+class LivenessDetector:  # pylint: disable=too-many-instance-attributes
+    """
+    Connected while the last heartbeat arrived less than timeout seconds ago.
+
+    Driven by arrival timestamps rather than by how often it is polled, so the disconnect
+    fires at the deadline of the last heartbeat no matter when the caller wakes up.
+    """
+
+    __private_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        local_logger: logger.Logger,
+        expected_period: float = DEFAULT_EXPECTED_PERIOD,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> "tuple[True, LivenessDetector] | tuple[False, None]":
+        """
+        Falliable create (instantiation) method to create a LivenessDetector object.
+
+        expected_period: Time in seconds between heartbeats of a healthy link.
+        timeout: Time in seconds without a heartbeat before the link is disconnected,
+            at least the expected period.
+        """
+        if expected_period <= 0.0:
+            local_logger.error(f"Expected period must be positive, got {expected_period}")
+            return False, None
+
+        if timeout < expected_period:
+            local_logger.error(f"Timeout {timeout} is shorter than the period {expected_period}")
+            return False, None
+
+        return True, LivenessDetector(cls.__private_key, expected_period, timeout)
+
+    def __init__(self, key: object, expected_period: float, timeout: float) -> None:
+        assert key is LivenessDetector.__private_key, "Use create() method"
+
+        self.expected_period = expected_period
+        self.timeout = timeout
+
+        self.connected = False
+        self.last_arrival: "float | None" = None
+        # Arrival that connected or deadline that disconnected, None before any transition
+        self.changed_at: "float | None" = None
+        self.connects = 0
+        self.disconnects = 0
+        self.late = 0
+
+    def heartbeat(self, arrival_time: float) -> bool:
+        """
+        Record a heartbeat received at arrival_time (time.monotonic() clock).
+        Arrivals older than the newest one are ignored.
+
+        Returns whether the link became connected.
+        """
+        if self.last_arrival is not None:
+            if arrival_time <= self.last_arrival:
+                return False
+
+            if self.connected and arrival_time - self.last_arrival > (
+                self.expected_period * LATE_FACTOR
+            ):
+                self.late += 1
+
+        self.last_arrival = arrival_time
+
+        if self.connected:
+            return False
+
+        self.connected = True
+        self.changed_at = arrival_time
+        self.connects += 1
+        return True
+
+    def poll(self, now: float) -> bool:
+        """
+        Check the deadline at time now.
+
+        Returns whether the link became disconnected.
+        """
+        deadline = self.deadline()
+        if deadline is None or now < deadline:
+            return False
+
+        self.connected = False
+        self.changed_at = deadline
+        self.disconnects += 1
+        return True
+
+    def deadline(self) -> "float | None":
+        """
+        Time the link is disconnected at without another heartbeat, None if not connected.
+        """
+        if not self.connected:
+            return None
+
+        return self.last_arrival + self.timeout
+
+    def missed(self, now: float) -> int:
+        """
+        Whole expected periods since the last heartbeat.
+        """
+        if self.last_arrival is None:
+            return 0
+
+        return max(int((now - self.last_arrival) / self.expected_period), 0)
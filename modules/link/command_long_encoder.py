@@ -0,0 +1,129 @@
+"""
+COMMAND_LONG encoding from cached frames.
+"""
+
+import struct
+
+from pymavlink import mavutil
+
+
+# param1 to param7 lead the COMMAND_LONG payload
+PARAMS = struct.Struct("<7f")
+CRC = struct.Struct("<H")
+
+HEADER_SIZE_V1 = 6  # bytes
+HEADER_SIZE_V2 = 10  # bytes
+SEQ_INDEX_V1 = 2
+SEQ_INDEX_V2 = 4
+
+
+# Sequence number byte, avoids creating it for every frame
+SEQ_BYTES = [bytes([seq]) for seq in range(256)]
+
+
+class CommandLongTemplate:
+    """
+    Fixed parts of a packed COMMAND_LONG frame, around the sequence number and parameters.
+    """
+
+    def __init__(self, frame: bytes, seq_index: int, params_offset: int, crc_extra: int) -> None:
+        # Without the magic, which is not part of the CRC
+        self.magic = frame[:1]
+        self.before_seq = frame[1:seq_index]
+        self.after_seq = frame[seq_index + 1 : params_offset]
+        self.after_params = frame[params_offset + PARAMS.size : len(frame) - CRC.size]
+        self.crc_extra = bytes([crc_extra])
+
+
+class CommandLongEncoder:
+    """
+    Encodes COMMAND_LONG like mav.command_long_send() without building a message object.
+    A frame is packed once per (target_system, target_component, command, confirmation)
+    and only the parameters, sequence number and CRC are patched for each send.
+    Signed links are encoded the regular way.
+    """
+
+    def __init__(self, mav: mavutil.mavlink.MAVLink) -> None:
+        self.mav = mav
+        self.__templates: "dict[tuple[int, int, int, int], CommandLongTemplate | None]" = {}
+
+    def encode(
+        self,
+        target_system: int,
+        target_component: int,
+        command: int,
+        confirmation: int,
+        *params: float,
+    ) -> bytes:
+        """
+        Frame with the next sequence number of mav, which is advanced as by mav.send().
+
+        params: param1 to param7.
+        """
+        key = (target_system, target_component, command, confirmation)
+
+        template = self.__templates.get(key, False)
+        if template is False:
+            template = self.__build(*key)
+            self.__templates[key] = template
+
+        if template is None or self.mav.signing.sign_outgoing:
+            msg = self.mav.command_long_encode(
+                target_system, target_component, command, confirmation, *params
+            )
+            frame = msg.pack(self.mav)
+        else:
+            checked = (
+                template.before_seq
+                + SEQ_BYTES[self.mav.seq]
+                + template.after_seq
+                + PARAMS.pack(*params)
+                + template.after_params
+            )
+            crc = mavutil.mavlink.x25crc(checked + template.crc_extra).crc
+            frame = template.magic + checked + CRC.pack(crc)
+
+        self.mav.seq = (self.mav.seq + 1) % 256
+        self.mav.total_packets_sent += 1
+        self.mav.total_bytes_sent += len(frame)
+
+        return frame
+
+    def send(
+        self,
+        target_system: int,
+        target_component: int,
+        command: int,
+        confirmation: int,
+        *params: float,
+    ) -> None:
+        """
+        Encode and write to the file of mav.
+        """
+        self.mav.file.write(
+            self.encode(target_system, target_component, command, confirmation, *params)
+        )
+
+    def __build(
+        self, target_system: int, target_component: int, command: int, confirmation: int
+    ) -> "CommandLongTemplate | None":
+        """
+        Template for the key, None if the frame length would depend on the parameters.
+        """
+        if self.mav.signing.sign_outgoing:
+            return None
+
+        # Nonzero parameters so that MAVLink 2 payload truncation cannot reach them
+        msg = self.mav.command_long_encode(
+            target_system, target_component, command, confirmation, 1, 1, 1, 1, 1, 1, 1
+        )
+        frame = msg.pack(self.mav)
+
+        if frame[0] == mavutil.mavlink.PROTOCOL_MARKER_V1:
+            return CommandLongTemplate(frame, SEQ_INDEX_V1, HEADER_SIZE_V1, msg.crc_extra)
+
+        # Truncated back to the parameters when the trailing fields are all zero
+        if frame[1] <= PARAMS.size:
+            return None
+
+        return CommandLongTemplate(frame, SEQ_INDEX_V2, HEADER_SIZE_V2, msg.crc_extra)
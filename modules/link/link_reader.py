@@ -0,0 +1,124 @@
+"""
+Link reading logic. Owns the receive side of the MAVLink connection and routes
+every decoded message to the subscribers interested in its type.
+"""
+
+import time
+
+from pymavlink import mavutil
+
+from utilities.workers import queue_proxy_wrapper
+from ..common.modules.logger import logger
+
+
+DEFAULT_TIMEOUT = 0.5  # seconds
+
+
+class Subscription:
+    """
+    Routing entry: messages of these types (and passing the optional condition)
+    are placed in the output queue.
+
+    message_types: MAVLink message type names, e.g. ["ATTITUDE", "LOCAL_POSITION_NED"].
+    output_queue: Queue of the subscribing worker.
+    condition: Optional filter taking the message and returning whether to deliver it.
+        Must be a module level function so that it can be sent to the worker process.
+    """
+
+    def __init__(
+        self,
+        message_types: "list[str]",
+        output_queue: queue_proxy_wrapper.QueueProxyWrapper,
+        condition: "(...) -> bool | None" = None,  # type: ignore
+    ) -> None:
+        self.message_types = frozenset(message_types)
+        self.output_queue = output_queue
+        self.condition = condition
+
+    def matches(self, msg: mavutil.mavlink.MAVLink_message) -> bool:
+        """
+        Whether the message should be delivered to this subscriber.
+        """
+        if msg.get_type() not in self.message_types:
+            return False
+
+        return self.condition is None or self.condition(msg)
+
+
+class LinkReader:
+    """
+    Single reader of the connection. Each frame is decoded once and fanned out
+    to every matching subscription, stamped with its time.monotonic() receive time
+    in a receive_time attribute.
+    """
+
+    __private_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        connection: mavutil.mavfile,
+        subscriptions: "list[Subscription]",
+        local_logger: logger.Logger,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> "tuple[True, LinkReader] | tuple[False, None]":
+        """
+        Falliable create (instantiation) method to create a LinkReader object.
+
+        timeout: Longest time in seconds a single run() waits for a message.
+        """
+        if len(subscriptions) == 0:
+            local_logger.error("Link reader requires at least one subscription")
+            return False, None
+
+        if timeout <= 0.0:
+            local_logger.error(f"Link reader timeout must be positive, got {timeout}")
+            return False, None
+
+        return True, LinkReader(cls.__private_key, connection, subscriptions, local_logger, timeout)
+
+    def __init__(
+        self,
+        key: object,
+        connection: mavutil.mavfile,
+        subscriptions: "list[Subscription]",
+        local_logger: logger.Logger,
+        timeout: float,
+    ) -> None:
+        assert key is LinkReader.__private_key, "Use create() method"
+
+        self.connection = connection
+        self.subscriptions = subscriptions
+        self.local_logger = local_logger
+        self.timeout = timeout
+
+        self.routed = 0
+        self.dropped = 0
+
+    def run(self) -> bool:
+        """
+        Receive one message and route it to its subscribers.
+
+        Returns whether a message was received.
+        """
+        msg = self.connection.recv_match(blocking=True, timeout=self.timeout)
+        if msg is None:
+            return False
+
+        if msg.get_type() == "BAD_DATA":
+            return True
+
+        msg.receive_time = time.monotonic()
+
+        for subscription in self.subscriptions:
+            if not subscription.matches(msg):
+                continue
+
+            # Never let one slow subscriber stall the link for everyone else
+            if subscription.output_queue.put(msg, timeout=0.0):
+                self.routed += 1
+            else:
+                self.dropped += 1
+                self.local_logger.warning(f"Subscriber queue full, dropped {msg.get_type()}")
+
+        return True
@@ -0,0 +1,85 @@
+"""
+Link reader worker that owns the receive side of the connection.
+"""
+
+import os
+import pathlib
+import time
+
+from pymavlink import mavutil
+
+from utilities.workers import worker_controller
+from . import link_reader
+from ..flight_recorder import flight_recorder
+from ..heartbeat import link_quality
+from ..common.modules.logger import logger
+
+
+LOSS_PERIOD = 1.0  # seconds
+
+
+def link_reader_worker(
+    connection: mavutil.mavfile,
+    subscriptions: "list[link_reader.Subscription]",
+    recording_path: "str | None",
+    quality: link_quality.SharedLinkQuality | None,
+    controller: worker_controller.WorkerController,
+) -> None:
+    """
+    Worker process.
+
+    connection: MAVLink connection, this worker is its only reader.
+    subscriptions: Message types routed to each subscriber queue.
+    recording_path: File every received frame is recorded to, None to not record.
+    quality: Where the message loss from sequence number gaps is published every
+        LOSS_PERIOD, None to not publish it.
+    controller: How the main process communicates to this worker process.
+    """
+    # Instantiate logger
+    worker_name = pathlib.Path(__file__).stem
+    process_id = os.getpid()
+    result, local_logger = logger.Logger.create(f"{worker_name}_{process_id}", True)
+    if not result:
+        print("ERROR: Worker failed to create logger")
+        return
+
+    # Get Pylance to stop complaining
+    assert local_logger is not None
+
+    local_logger.info("Logger initialized", True)
+
+    result, reader = link_reader.LinkReader.create(connection, subscriptions, local_logger)
+    if not result:
+        local_logger.error("Failed to create link reader", True)
+        return
+
+    # Get Pylance to stop complaining
+    assert reader is not None
+
+    recorder = None
+    if recording_path is not None:
+        result, recorder = flight_recorder.FlightRecorder.create(recording_path, local_logger)
+        if not result:
+            local_logger.warning("Failed to create flight recorder, not recording", True)
+        else:
+            connection.message_hooks.append(recorder.message_hook)
+
+    next_loss_update = time.monotonic() + LOSS_PERIOD
+
+    # Main loop: do work.
+    while not controller.is_exit_requested():
+        controller.check_pause()
+
+        reader.run()
+
+        now = time.monotonic()
+        if quality is not None and now >= next_loss_update:
+            # Counted by pymavlink per source from the sequence numbers
+            quality.update_loss(connection.mav_count, connection.mav_loss)
+            next_loss_update = now + LOSS_PERIOD
+
+    local_logger.info(f"Routed {reader.routed} messages, dropped {reader.dropped}", True)
+
+    if recorder is not None:
+        connection.message_hooks.remove(recorder.message_hook)
+        recorder.close()
@@ -0,0 +1,77 @@
+"""
+Link writer worker that owns the send side of the connection.
+"""
+
+import os
+import pathlib
+
+from pymavlink import mavutil
+
+from utilities.workers import queue_proxy_wrapper
+from utilities.workers import worker_controller
+from . import outbound_sender
+from ..common.modules.logger import logger
+
+
+QUEUE_TIMEOUT = 0.5  # seconds
+# Most messages taken from the input queue per round trip
+BATCH_SIZE = 32
+FLUSH_WINDOW = 0.001  # seconds
+
+
+def link_writer_worker(
+    connection: mavutil.mavfile,
+    input_queue: queue_proxy_wrapper.QueueProxyWrapper,
+    controller: worker_controller.WorkerController,
+) -> None:
+    """
+    Worker process.
+
+    connection: MAVLink connection, this worker is its only writer.
+    input_queue: (message, priority) to send, from QueueSender handles in other workers.
+    controller: How the main process communicates to this worker process.
+    """
+    # Instantiate logger
+    worker_name = pathlib.Path(__file__).stem
+    process_id = os.getpid()
+    result, local_logger = logger.Logger.create(f"{worker_name}_{process_id}", True)
+    if not result:
+        print("ERROR: Worker failed to create logger")
+        return
+
+    # Get Pylance to stop complaining
+    assert local_logger is not None
+
+    local_logger.info("Logger initialized", True)
+
+    result, sender = outbound_sender.OutboundSender.create(
+        connection, local_logger, flush_window=FLUSH_WINDOW
+    )
+    if not result:
+        local_logger.error("Failed to create outbound sender", True)
+        return
+
+    # Get Pylance to stop complaining
+    assert sender is not None
+
+    # Main loop: do work.
+    while not controller.is_exit_requested():
+        controller.check_pause()
+
+        # Emptied quickly so producers blocked on the queue wait as little as possible
+        for item in input_queue.get_many(BATCH_SIZE, QUEUE_TIMEOUT):
+            # Sentinel from the main process clearing the queue
+            if item is None:
+                continue
+
+            msg, priority = item
+            sender.submit(msg, priority=priority)
+
+    sender.close()
+
+    local_logger.info(
+        f"Sent {sender.sent} messages in {sender.writes} writes, "
+        f"dropped {sender.dropped}, failed {sender.failed}",
+        True,
+    )
+    local_logger.info(f"Frames per write: {sender.frames_per_write}", True)
@@ -0,0 +1,371 @@
+"""
+Outbound stage of the MAVLink connection. A single writer owns the send side,
+so callers never block on the socket and frames from different callers never interleave.
+"""
+
+import collections
+import concurrent.futures
+import enum
+import struct
+import threading
+import time
+
+from pymavlink import mavutil
+
+from utilities.statistics import histogram
+from utilities.workers import queue_proxy_wrapper
+from . import command_long_encoder
+from ..common.modules.logger import logger
+
+
+DEFAULT_MAX_QUEUE = 64  # per priority
+DEFAULT_CLOSE_TIMEOUT = 1.0  # seconds
+# Longest wait of a QueueSender for space in the link writer's queue
+DEFAULT_SUBMIT_TIMEOUT = 0.05  # seconds
+
+# Frames already queued are always written together, the window waits for more
+DEFAULT_FLUSH_WINDOW = 0.0  # seconds
+DEFAULT_FLUSH_BYTES = 1024
+
+# Bucket upper bounds of the frames per write histogram
+FRAMES_PER_WRITE_BUCKETS = [1, 2, 4, 8, 16, 32]
+
+
+class Priority(enum.IntEnum):
+    """
+    Outbound traffic classes, most urgent first.
+    """
+
+    # Heartbeats and safety commands
+    CRITICAL = 0
+    # Commands and setpoints
+    CONTROL = 1
+    # Everything else, e.g. parameter, mission and log transfers
+    BULK = 2
+
+
+# Messages written per scheduling round, the remaining classes wait their turn
+DEFAULT_WEIGHTS = (8, 4, 1)  # CRITICAL, CONTROL, BULK
+
+SAFETY_COMMANDS = frozenset(
+    [
+        mavutil.mavlink.MAV_CMD_COMPONENT_ARM_DISARM,
+        mavutil.mavlink.MAV_CMD_DO_FLIGHTTERMINATION,
+        mavutil.mavlink.MAV_CMD_NAV_LAND,
+        mavutil.mavlink.MAV_CMD_NAV_RETURN_TO_LAUNCH,
+    ]
+)
+
+CONTROL_MESSAGES = frozenset(
+    [
+        "COMMAND_INT",
+        "COMMAND_LONG",
+        "MANUAL_CONTROL",
+        "SET_ATTITUDE_TARGET",
+        "SET_MODE",
+        "SET_POSITION_TARGET_GLOBAL_INT",
+        "SET_POSITION_TARGET_LOCAL_NED",
+    ]
+)
+
+
+class OutboundSender:  # pylint: disable=too-many-instance-attributes
+    """
+    Bounded queue per priority drained by one writer thread that packs and writes the
+    messages to the connection. Packing in the writer keeps the sequence numbers in send order.
+
+    The writer takes up to weights[priority] messages of each class per round, most urgent
+    class first, so a backlog of bulk traffic delays a heartbeat by at most one round
+    while bulk traffic is never starved.
+
+    Frames are coalesced into a single write of up to flush_bytes, collecting those
+    arriving within flush_window of the first one.
+    """
+
+    __private_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        connection: mavutil.mavfile,
+        local_logger: logger.Logger,
+        maxsize: int = DEFAULT_MAX_QUEUE,
+        weights: "tuple[int, int, int]" = DEFAULT_WEIGHTS,
+        flush_window: float = DEFAULT_FLUSH_WINDOW,
+        flush_bytes: int = DEFAULT_FLUSH_BYTES,
+    ) -> "tuple[True, OutboundSender] | tuple[False, None]":
+        """
+        Falliable create (instantiation) method to create an OutboundSender object.
+        Starts the writer thread.
+
+        maxsize: Messages of a priority waiting to be written before submit() rejects more.
+        weights: Messages of each priority written per round, in Priority order.
+        flush_window: Longest time in seconds a frame waits for others to share its write.
+        flush_bytes: Size at which a write is made without waiting, 0 for a write per frame.
+        """
+        if maxsize <= 0:
+            local_logger.error(f"Outbound queue size must be positive, got {maxsize}")
+            return False, None
+
+        if len(weights) != len(Priority) or min(weights) <= 0:
+            local_logger.error(f"Need a positive weight per priority, got {weights}")
+            return False, None
+
+        if flush_window < 0.0 or flush_bytes < 0:
+            local_logger.error(f"Invalid flush window {flush_window} or size {flush_bytes}")
+            return False, None
+
+        return True, OutboundSender(
+            cls.__private_key,
+            connection,
+            local_logger,
+            maxsize,
+            tuple(weights),
+            flush_window,
+            flush_bytes,
+        )
+
+    def __init__(
+        self,
+        key: object,
+        connection: mavutil.mavfile,
+        local_logger: logger.Logger,
+        maxsize: int,
+        weights: "tuple[int, ...]",
+        flush_window: float,
+        flush_bytes: int,
+    ) -> None:
+        assert key is OutboundSender.__private_key, "Use create() method"
+
+        self.connection = connection
+        self.local_logger = local_logger
+        self.maxsize = maxsize
+        self.weights = weights
+        self.flush_window = flush_window
+        self.flush_bytes = flush_bytes
+
+        self.sent = 0
+        self.dropped = 0
+        self.failed = 0
+        self.writes = 0
+        _, self.frames_per_write = histogram.Histogram.create(FRAMES_PER_WRITE_BUCKETS)
+
+        self.__encoder = command_long_encoder.CommandLongEncoder(connection.mav)
+
+        self.__queues = [collections.deque() for _ in Priority]
+        self.__credits = list(weights)
+        self.__queued = 0
+        self.__closing = False
+        # Guards the queues, signalled when a message is queued or on close
+        self.__ready = threading.Condition()
+
+        self.__writer = threading.Thread(target=self.__write_loop, name="outbound_sender")
+        self.__writer.daemon = True
+        self.__writer.start()
+
+    def submit(
+        self,
+        msg: mavutil.mavlink.MAVLink_message,
+        with_future: bool = False,
+        priority: "Priority | None" = None,
+    ) -> "tuple[bool, concurrent.futures.Future | None]":
+        """
+        Queue the message without blocking.
+
+        with_future: Also return a future that completes once the message is written,
+            or with the exception raised writing it.
+        priority: Traffic class, None to classify the message.
+
+        Returns whether the message was queued (False if its queue is full) and the future.
+        """
+        if priority is None:
+            priority = classify(msg)
+
+        future = concurrent.futures.Future() if with_future else None
+
+        with self.__ready:
+            messages = self.__queues[priority]
+            if self.__closing or len(messages) >= self.maxsize:
+                self.dropped += 1
+                return False, None
+
+            messages.append((msg, future))
+            self.__queued += 1
+            self.__ready.notify()
+
+        return True, future
+
+    def close(self, timeout: float = DEFAULT_CLOSE_TIMEOUT) -> None:
+        """
+        Write the messages already queued, then stop the writer.
+        """
+        with self.__ready:
+            self.__closing = True
+            self.__ready.notify()
+
+        self.__writer.join(timeout)
+        if self.__writer.is_alive():
+            self.local_logger.warning("Outbound queue did not drain, abandoning writer")
+
+    def __next(self) -> "tuple[mavutil.mavlink.MAVLink_message, concurrent.futures.Future | None]":
+        """
+        Take the next message by weighted round robin. Must hold __ready with messages queued.
+        """
+        while True:
+            for priority, messages in enumerate(self.__queues):
+                if len(messages) > 0 and self.__credits[priority] > 0:
+                    self.__credits[priority] -= 1
+                    self.__queued -= 1
+                    return messages.popleft()
+
+            # Every class with messages has used its share, start a new round
+            self.__credits = list(self.weights)
+
+    def __write_loop(self) -> None:
+        while True:
+            with self.__ready:
+                while self.__queued == 0 and not self.__closing:
+                    self.__ready.wait()
+
+                if self.__queued == 0:
+                    return
+
+            frames = []
+            futures = []
+            size = 0
+            deadline = time.monotonic() + self.flush_window
+
+            while True:
+                with self.__ready:
+                    while self.__queued == 0 and not self.__closing:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0.0:
+                            break
+                        self.__ready.wait(remaining)
+
+                    if self.__queued == 0:
+                        break
+
+                    msg, future = self.__next()
+
+                if future is not None and not future.set_running_or_notify_cancel():
+                    continue
+
+                try:
+                    frame = self.__pack(msg)
+                except struct.error as e:
+                    self.failed += 1
+                    self.local_logger.error(f"Failed to pack {msg.get_type()}: {e}")
+                    if future is not None:
+                        future.set_exception(e)
+                    continue
+
+                frames.append(frame)
+                futures.append(future)
+                size += len(frame)
+                if size >= self.flush_bytes:
+                    break
+
+            if len(frames) > 0:
+                self.__flush(frames, futures)
+
+    def __pack(self, msg: mavutil.mavlink.MAVLink_message) -> bytes:
+        """
+        Encode like mav.send() does, without writing.
+        COMMAND_LONG, repeated at the telemetry rate, is encoded from cached frames.
+        """
+        if msg.get_msgId() == mavutil.mavlink.MAVLINK_MSG_ID_COMMAND_LONG:
+            return self.__encoder.encode(
+                msg.target_system,
+                msg.target_component,
+                msg.command,
+                msg.confirmation,
+                msg.param1,
+                msg.param2,
+                msg.param3,
+                msg.param4,
+                msg.param5,
+                msg.param6,
+                msg.param7,
+            )
+
+        mav = self.connection.mav
+        frame = msg.pack(mav)
+        mav.seq = (mav.seq + 1) % 256
+        mav.total_packets_sent += 1
+        mav.total_bytes_sent += len(frame)
+        return frame
+
+    def __flush(
+        self, frames: "list[bytes]", futures: "list[concurrent.futures.Future | None]"
+    ) -> None:
+        """
+        Write the frames with a single call.
+        """
+        try:
+            self.connection.write(b"".join(frames))
+        except (ConnectionError, OSError) as e:
+            self.failed += len(frames)
+            self.local_logger.error(f"Failed to send {len(frames)} frames: {e}")
+            for future in futures:
+                if future is not None:
+                    future.set_exception(e)
+            return
+
+        self.sent += len(frames)
+        self.writes += 1
+        self.frames_per_write.add(len(frames))
+        for future in futures:
+            if future is not None:
+                future.set_result(None)
+
+
+def classify(msg: mavutil.mavlink.MAVLink_message) -> Priority:
+    """
+    Traffic class of an outgoing message.
+    """
+    message_type = msg.get_type()
+
+    if message_type == "HEARTBEAT":
+        return Priority.CRITICAL
+
+    if message_type in ("COMMAND_LONG", "COMMAND_INT") and msg.command in SAFETY_COMMANDS:
+        return Priority.CRITICAL
+
+    if message_type in CONTROL_MESSAGES:
+        return Priority.CONTROL
+
+    return Priority.BULK
+
+
+class QueueSender:
+    """
+    Handle with the submit() interface of OutboundSender for processes that do not
+    own the connection. Messages are forwarded to the link writer worker's queue.
+
+    The queue should block (OverflowPolicy.BLOCK) rather than evict: it is blind to
+    priority, so evicting could discard a heartbeat before the writer classifies it.
+
+    timeout: Longest wait in seconds for space in a blocking queue.
+    """
+
+    def __init__(
+        self,
+        output_queue: queue_proxy_wrapper.QueueProxyWrapper,
+        timeout: float = DEFAULT_SUBMIT_TIMEOUT,
+    ) -> None:
+        self.output_queue = output_queue
+        self.timeout = timeout
+
+    def submit(
+        self,
+        msg: mavutil.mavlink.MAVLink_message,
+        with_future: bool = False,
+        priority: "Priority | None" = None,
+    ) -> "tuple[bool, None]":
+        """
+        Queue the message and its priority for the link writer, waiting up to timeout.
+        Completion is not observable from other processes, so there is never a future.
+        """
+        _ = with_future
+        return self.output_queue.put((msg, priority), timeout=self.timeout), None
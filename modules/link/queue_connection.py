@@ -0,0 +1,93 @@
+"""
+Receive-only connection fed by a link reader subscription.
+"""
+
+import collections
+import queue
+import time
+
+from pymavlink import mavutil
+
+from utilities.workers import queue_proxy_wrapper
+
+
+DEFAULT_SELECT_PERIOD = 0.5  # seconds
+
+
+class QueueConnection:
+    """
+    Stand-in for the receive side of mavutil.mavfile that reads already decoded
+    messages from a subscription queue instead of the socket.
+
+    Supports recv_match() and select() as used by the workers. It cannot send.
+    """
+
+    def __init__(self, input_queue: queue_proxy_wrapper.QueueProxyWrapper) -> None:
+        self.input_queue = input_queue
+        self.fd = None
+        self.__pending = collections.deque()
+
+    def select(self, timeout: float) -> bool:
+        """
+        Wait for up to timeout seconds for a message.
+
+        Returns whether a message is available.
+        """
+        if len(self.__pending) > 0:
+            return True
+
+        try:
+            self.__pending.append(self.input_queue.queue.get(timeout=max(timeout, 0.0)))
+        except queue.Empty:
+            return False
+
+        return True
+
+    def recv_msg(self) -> mavutil.mavlink.MAVLink_message | None:
+        """
+        Next message if one is available, without waiting.
+        """
+        if len(self.__pending) > 0:
+            return self.__pending.popleft()
+
+        try:
+            return self.input_queue.queue.get_nowait()
+        except queue.Empty:
+            return None
+
+    def recv_match(
+        self,
+        # Same name as mavutil.mavfile.recv_match()
+        type: "str | list[str] | None" = None,  # pylint: disable=redefined-builtin
+        blocking: bool = False,
+        timeout: "float | None" = None,
+    ) -> mavutil.mavlink.MAVLink_message | None:
+        """
+        Receive the next message of the given type(s), discarding others.
+        Same semantics as mavutil.mavfile.recv_match().
+        """
+        if type is not None and not isinstance(type, (list, set)):
+            type = [type]
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            msg = self.recv_msg()
+            if msg is None:
+                if not blocking:
+                    return None
+
+                if deadline is None:
+                    self.select(DEFAULT_SELECT_PERIOD)
+                    continue
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0.0 or not self.select(remaining):
+                    return None
+
+                continue
+
+            if type is not None and msg.get_type() not in type:
+                continue
+
+            return msg
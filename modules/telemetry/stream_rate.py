@@ -0,0 +1,173 @@
+"""
+Telemetry stream rate negotiation with the autopilot.
+"""
+
+import os
+import time
+
+from pymavlink import mavutil
+
+from ..common.modules.logger import logger
+from ..link import outbound_sender
+
+
+# Streams fused by Telemetry
+STREAM_MESSAGE_IDS = (
+    mavutil.mavlink.MAVLINK_MSG_ID_ATTITUDE,
+    mavutil.mavlink.MAVLINK_MSG_ID_LOCAL_POSITION_NED,
+)
+
+DEFAULT_MIN_RATE = 1.0  # Hz
+DEFAULT_MAX_RATE = 50.0  # Hz
+DEFAULT_HIGH_BACKLOG = 3  # samples
+UPDATE_PERIOD = 1.0  # seconds
+RATE_DECREASE_FACTOR = 0.5
+RATE_INCREASE_STEP = 1.0  # Hz
+MAX_LOAD_PER_CPU = 0.8
+
+
+class StreamRateController:  # pylint: disable=too-many-instance-attributes
+    """
+    Requests ATTITUDE and LOCAL_POSITION_NED rates with MAV_CMD_SET_MESSAGE_INTERVAL,
+    adjusted from the backlog of the telemetry consumer (additive increase,
+    multiplicative decrease).
+    """
+
+    __private_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        connection: mavutil.mavfile,
+        initial_rate: float,
+        local_logger: logger.Logger,
+        min_rate: float = DEFAULT_MIN_RATE,
+        max_rate: float = DEFAULT_MAX_RATE,
+        high_backlog: int = DEFAULT_HIGH_BACKLOG,
+        sender: outbound_sender.OutboundSender | outbound_sender.QueueSender | None = None,
+    ) -> "tuple[True, StreamRateController] | tuple[False, None]":
+        """
+        Falliable create (instantiation) method to create a StreamRateController object.
+
+        connection: Connection to send the interval requests on.
+        initial_rate: First rate requested in Hz, clamped to [min_rate, max_rate].
+        high_backlog: Number of unconsumed samples at which the rate is reduced.
+        sender: Outbound stage to submit the requests to, None to write them directly.
+        """
+        if min_rate <= 0.0 or max_rate < min_rate:
+            local_logger.error(f"Invalid stream rate range [{min_rate}, {max_rate}]")
+            return False, None
+
+        if high_backlog <= 0:
+            local_logger.error(f"High backlog must be positive, got {high_backlog}")
+            return False, None
+
+        return True, StreamRateController(
+            cls.__private_key,
+            connection,
+            min(max(initial_rate, min_rate), max_rate),
+            local_logger,
+            min_rate,
+            max_rate,
+            high_backlog,
+            sender,
+        )
+
+    def __init__(
+        self,
+        key: object,
+        connection: mavutil.mavfile,
+        initial_rate: float,
+        local_logger: logger.Logger,
+        min_rate: float,
+        max_rate: float,
+        high_backlog: int,
+        sender: outbound_sender.OutboundSender | outbound_sender.QueueSender | None,
+    ) -> None:
+        assert key is StreamRateController.__private_key, "Use create() method"
+
+        self.connection = connection
+        self.local_logger = local_logger
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.high_backlog = high_backlog
+        self.sender = sender
+
+        self.rate = initial_rate
+        self.__last_update = time.monotonic()
+
+        self.request_rate(self.rate)
+
+    def request_rate(self, rate: float) -> None:
+        """
+        Ask the autopilot to stream both messages at the rate in Hz.
+        """
+        interval = int(1_000_000 / rate)  # us
+
+        for message_id in STREAM_MESSAGE_IDS:
+            fields = {
+                "target_system": 1,
+                "target_component": 0,
+                "command": mavutil.mavlink.MAV_CMD_SET_MESSAGE_INTERVAL,
+                "confirmation": 0,
+                "param1": message_id,
+                "param2": interval,
+                "param3": 0,
+                "param4": 0,
+                "param5": 0,
+                "param6": 0,
+                "param7": 0,
+            }
+
+            if self.sender is None:
+                self.connection.mav.command_long_send(**fields)
+                continue
+
+            result, _ = self.sender.submit(self.connection.mav.command_long_encode(**fields))
+            if not result:
+                self.local_logger.warning(f"Outbound queue full, interval of {message_id} dropped")
+
+        self.local_logger.info(f"Requested telemetry at {rate:.1f} Hz")
+
+    def is_due(self) -> bool:
+        """
+        Whether update() would act, so the backlog only needs measuring then.
+        """
+        return time.monotonic() - self.__last_update >= UPDATE_PERIOD
+
+    def update(self, backlog: int) -> float:
+        """
+        Adjust the rate from the number of samples waiting for the consumer.
+        Changes at most once per UPDATE_PERIOD.
+
+        Returns the current rate in Hz.
+        """
+        if not self.is_due():
+            return self.rate
+
+        self.__last_update = time.monotonic()
+
+        rate = self.rate
+        if backlog >= self.high_backlog:
+            rate = max(self.min_rate, rate * RATE_DECREASE_FACTOR)
+        elif backlog == 0 and has_cpu_headroom():
+            rate = min(self.max_rate, rate + RATE_INCREASE_STEP)
+
+        if rate != self.rate:
+            self.rate = rate
+            self.request_rate(rate)
+
+        return self.rate
+
+
+def has_cpu_headroom() -> bool:
+    """
+    Whether the 1 minute load average leaves room for more work.
+    Always True where the load average is not available (Windows).
+    """
+    try:
+        load = os.getloadavg()[0]
+    except (AttributeError, OSError):
+        return True
+
+    return load / (os.cpu_count() or 1) < MAX_LOAD_PER_CPU
@@ -2,18 +2,50 @@
 Telemetry gathering logic.
 """
 
+import math
+import struct
 import time
 
+import numpy as np
 from pymavlink import mavutil
 
+from . import telemetry_interpolation
 from ..common.modules.logger import logger
 
 
 class TelemetryData:  # pylint: disable=too-many-instance-attributes
     """
     Python struct to represent Telemtry Data. Contains the most recent attitude and position reading.
+
+    receive_time is the time.monotonic() at which the oldest source message was received.
+    The monotonic clock is system wide, so ages can be computed in any process.
+
+    Serialized as a fixed record of little endian float64 fields in the order of __slots__,
+    with None stored as NaN: 14 fields, 112 bytes (RECORD_SIZE and the itemsize of
+    TELEMETRY_DTYPE), with receive_time last.
     """
 
+    __slots__ = (
+        "time_since_boot",
+        "x",
+        "y",
+        "z",
+        "x_velocity",
+        "y_velocity",
+        "z_velocity",
+        "roll",
+        "pitch",
+        "yaw",
+        "roll_speed",
+        "pitch_speed",
+        "yaw_speed",
+        "receive_time",
+    )
+
+    __RECORD = struct.Struct("<14d")
+
+    RECORD_SIZE = __RECORD.size  # bytes
+
     def __init__(
         self,
         time_since_boot: int | None = None,  # ms
@@ -29,6 +61,7 @@ class TelemetryData:  # pylint: disable=too-many-instance-attributes
         roll_speed: float | None = None,  # rad/s
         pitch_speed: float | None = None,  # rad/s
         yaw_speed: float | None = None,  # rad/s
+        receive_time: float | None = None,  # s
     ) -> None:
         self.time_since_boot = time_since_boot
         self.x = x
@@ -43,6 +76,7 @@ class TelemetryData:  # pylint: disable=too-many-instance-attributes
         self.roll_speed = roll_speed
         self.pitch_speed = pitch_speed
         self.yaw_speed = yaw_speed
+        self.receive_time = receive_time
 
     def __str__(self) -> str:
         return f"""{{
@@ -58,13 +92,67 @@ class TelemetryData:  # pylint: disable=too-many-instance-attributes
             yaw: {self.yaw},
             roll_speed: {self.roll_speed},
             pitch_speed: {self.pitch_speed},
-            yaw_speed: {self.yaw_speed}
+            yaw_speed: {self.yaw_speed},
+            receive_time: {self.receive_time}
         }}"""
 
+    def __reduce__(self) -> "tuple":
+        # Pickle as the packed record instead of a per attribute dictionary
+        return TelemetryData.from_bytes, (self.to_bytes(),)
+
+    def to_bytes(self) -> bytes:
+        """
+        Packs into a RECORD_SIZE byte record.
+        """
+        values = (
+            self.time_since_boot,
+            self.x,
+            self.y,
+            self.z,
+            self.x_velocity,
+            self.y_velocity,
+            self.z_velocity,
+            self.roll,
+            self.pitch,
+            self.yaw,
+            self.roll_speed,
+            self.pitch_speed,
+            self.yaw_speed,
+            self.receive_time,
+        )
+        if None in values:
+            values = [math.nan if value is None else value for value in values]
+
+        return TelemetryData.__RECORD.pack(*values)
+
+    @staticmethod
+    def from_bytes(data: bytes) -> "TelemetryData":
+        """
+        Unpacks a record created by to_bytes().
+        """
+        values = TelemetryData.__RECORD.unpack(data)
+
+        # Any NaN propagates through the sum, so the common case is a single check
+        if math.isnan(sum(values)):
+            values = [None if math.isnan(value) else value for value in values]
+
+        time_since_boot = values[0]
+        if time_since_boot is not None:
+            time_since_boot = int(time_since_boot)
+
+        return TelemetryData(time_since_boot, *values[1:])
+
+
+# NumPy view of the TelemetryData record, one float64 column per field with None stored as NaN
+TELEMETRY_DTYPE = np.dtype([(name, "<f8") for name in TelemetryData.__slots__])
+
 
 # =================================================================================================
 #                            ↓ BOOTCAMPERS MODIFY BELOW THIS COMMENT ↓
 # =================================================================================================
+DEFAULT_TIMEOUT = 1.0  # seconds
+
+
 class Telemetry:
     """
     Telemetry class to read position and attitude (orientation).
@@ -78,13 +166,19 @@ class Telemetry:
         connection: mavutil.mavfile,
         # Put your own arguments here
         local_logger: logger.Logger,
+        timeout: float = DEFAULT_TIMEOUT,
     ) -> tuple[bool, "Telemetry"] | tuple[bool, None]:
         """
         Falliable create (instantiation) method to create a Telemetry object.
+
+        timeout: Longest time in seconds a single run() waits for both messages.
         """
+        if timeout <= 0.0:
+            local_logger.error(f"Telemetry timeout must be positive, got {timeout}")
+            return False, None
 
         try:
-            ret = True, Telemetry(cls.__private_key, connection, local_logger)
+            ret = True, Telemetry(cls.__private_key, connection, local_logger, timeout)
             local_logger.info("Telemetry object created")
 
         except ValueError as e:
@@ -100,6 +194,7 @@ class Telemetry:
         connection: mavutil.mavfile,
         # Put your own arguments here
         local_logger: logger.Logger,
+        timeout: float,
     ) -> None:
         assert key is Telemetry.__private_key, "Use create() method"
 
@@ -107,6 +202,15 @@ class Telemetry:
 
         self.connection = connection
         self.local_logger = local_logger
+        self.timeout = timeout
+
+        # Latest of each message for run_batch(), kept between calls
+        self.__batch_position = None
+        self.__batch_attitude = None
+
+        # Last two samples of each stream for run_interpolated()
+        self.__position_history = telemetry_interpolation.StreamHistory()
+        self.__attitude_history = telemetry_interpolation.StreamHistory(angle_count=3)
 
     def run(
         self,
@@ -115,20 +219,21 @@ class Telemetry:
         """
         Receive LOCAL_POSITION_NED and ATTITUDE messages from the drone,
         combining them together to form a single TelemetryData object.
+
+        Waits on the connection (not a busy loop) until both messages have arrived
+        or the timeout expires.
         """
         # Read MAVLink message LOCAL_POSITION_NED (32)
         # Read MAVLink message ATTITUDE (30)
         # Return the most recent of both, and use the most recent message's timestamp
 
-        initial_time = time.time()
+        deadline = time.monotonic() + self.timeout
         pos_ned = None
         attitude = None
 
-        while time.time() - initial_time < 1:
-
-            msg = self.connection.recv_match(
-                type=["ATTITUDE", "LOCAL_POSITION_NED"], blocking=False, timeout=0.0
-            )
+        while pos_ned is None or attitude is None:
+            # Drain everything already buffered before waiting on the link
+            msg = self.__receive(blocking=False, timeout=0.0)
 
             if msg is not None:
                 if msg.get_type() == "LOCAL_POSITION_NED":
@@ -136,31 +241,132 @@ class Telemetry:
                 elif msg.get_type() == "ATTITUDE":
                     attitude = msg
 
-            if pos_ned and attitude:
+            # Also while messages keep arriving, e.g. only one of the two streams
+            remaining = deadline - time.monotonic()
+            if remaining <= 0.0:
                 break
 
+            if msg is None:
+                # Sleep on the connection's file descriptor until data arrives or the window expires
+                self.connection.select(remaining)
+
         if pos_ned is not None and attitude is not None:
-            telemetry_data = TelemetryData(
-                time_since_boot=max(pos_ned.time_boot_ms, attitude.time_boot_ms),
-                x=pos_ned.x,
-                y=pos_ned.y,
-                z=pos_ned.z,
-                x_velocity=pos_ned.vx,
-                y_velocity=pos_ned.vy,
-                z_velocity=pos_ned.vz,
-                roll=attitude.roll,
-                pitch=attitude.pitch,
-                yaw=attitude.yaw,
-                roll_speed=attitude.rollspeed,
-                pitch_speed=attitude.pitchspeed,
-                yaw_speed=attitude.yawspeed,
-            )
+            telemetry_data = TelemetryData(*self.__fuse(pos_ned, attitude))
             self.local_logger.info("telemetry data created")
             return telemetry_data
 
         self.local_logger.warning("no telemetry data received")
         return None
 
+    def run_batch(self, max_samples: int, max_wait: float) -> np.ndarray:
+        """
+        Drain every pending LOCAL_POSITION_NED and ATTITUDE message, emitting one fused
+        sample per message once both have been seen (also across calls).
+
+        max_samples: Most samples returned, remaining messages are left for the next call.
+        max_wait: Longest time in seconds to wait if no message is pending.
+
+        Returns a TELEMETRY_DTYPE array of the samples in arrival order, possibly empty.
+        """
+        samples = np.empty(max_samples, TELEMETRY_DTYPE)
+        count = 0
+
+        deadline = time.monotonic() + max_wait
+
+        while count < max_samples:
+            msg = self.__receive(blocking=False, timeout=0.0)
+
+            if msg is None:
+                # Only wait for the start of a burst, never in the middle of draining one
+                remaining = deadline - time.monotonic()
+                if count > 0 or remaining <= 0.0 or not self.connection.select(remaining):
+                    break
+
+                continue
+
+            if msg.get_type() == "LOCAL_POSITION_NED":
+                self.__batch_position = msg
+            elif msg.get_type() == "ATTITUDE":
+                self.__batch_attitude = msg
+
+            if self.__batch_position is None or self.__batch_attitude is None:
+                continue
+
+            samples[count] = self.__fuse(self.__batch_position, self.__batch_attitude)
+            count += 1
+
+        return samples[:count]
+
+    def run_interpolated(self) -> TelemetryData | None:
+        """
+        Receive the next LOCAL_POSITION_NED or ATTITUDE message and emit a sample at its
+        timestamp, with the other stream interpolated (or extrapolated) to that time.
+        Output rate is the sum of both stream rates rather than the slower one.
+
+        Returns None until both streams have been seen or if no message arrives before the timeout.
+        """
+        msg = self.__receive(blocking=True, timeout=self.timeout)
+        if msg is None:
+            self.local_logger.warning("no telemetry data received")
+            return None
+
+        # The message's own stream is used as received, only the other one is sampled
+        if msg.get_type() == "LOCAL_POSITION_NED":
+            position = (msg.x, msg.y, msg.z, msg.vx, msg.vy, msg.vz)
+            self.__position_history.add(msg.time_boot_ms, position)
+            if self.__attitude_history.is_empty():
+                return None
+
+            attitude = self.__attitude_history.sample_at(msg.time_boot_ms)
+        else:
+            attitude = (msg.roll, msg.pitch, msg.yaw, msg.rollspeed, msg.pitchspeed, msg.yawspeed)
+            self.__attitude_history.add(msg.time_boot_ms, attitude)
+            if self.__position_history.is_empty():
+                return None
+
+            position = self.__position_history.sample_at(msg.time_boot_ms)
+
+        return TelemetryData(msg.time_boot_ms, *position, *attitude, msg.receive_time)
+
+    def __receive(self, blocking: bool, timeout: float) -> "mavutil.mavlink.MAVLink_message | None":
+        """
+        Next ATTITUDE or LOCAL_POSITION_NED message, stamped with its receive time.
+        Messages routed by the link reader are already stamped, others are stamped now.
+        """
+        msg = self.connection.recv_match(
+            type=["ATTITUDE", "LOCAL_POSITION_NED"], blocking=blocking, timeout=timeout
+        )
+        if msg is not None and getattr(msg, "receive_time", None) is None:
+            msg.receive_time = time.monotonic()
+
+        return msg
+
+    @staticmethod
+    def __fuse(
+        pos_ned: mavutil.mavlink.MAVLink_local_position_ned_message,
+        attitude: mavutil.mavlink.MAVLink_attitude_message,
+    ) -> "tuple[float, ...]":
+        """
+        TelemetryData fields in __slots__ order, using the most recent message's timestamp
+        and the oldest message's receive time.
+        """
+        return (
+            max(pos_ned.time_boot_ms, attitude.time_boot_ms),
+            pos_ned.x,
+            pos_ned.y,
+            pos_ned.z,
+            pos_ned.vx,
+            pos_ned.vy,
+            pos_ned.vz,
+            attitude.roll,
+            attitude.pitch,
+            attitude.yaw,
+            attitude.rollspeed,
+            attitude.pitchspeed,
+            attitude.yawspeed,
+            min(pos_ned.receive_time, attitude.receive_time),
+        )
+
 
 # =================================================================================================
 #                            ↑ BOOTCAMPERS MODIFY ABOVE THIS COMMENT ↑
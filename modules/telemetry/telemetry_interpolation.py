@@ -0,0 +1,75 @@
+"""
+Time alignment of telemetry streams.
+"""
+
+import math
+
+
+MAX_EXTRAPOLATION = 500  # ms
+
+
+class StreamHistory:
+    """
+    Last two samples of a message stream, keyed by time_boot_ms.
+
+    angle_count: Number of leading values that are angles in radians. These are
+        interpolated along the shortest arc and wrapped to [-pi, pi].
+    """
+
+    def __init__(self, angle_count: int = 0) -> None:
+        self.angle_count = angle_count
+        self.samples: "list[tuple[int, tuple[float, ...]]]" = []
+
+    def add(self, time_ms: int, values: "tuple[float, ...]") -> None:
+        """
+        Record a sample. A timestamp going backwards (autopilot reboot) restarts the history.
+        """
+        if len(self.samples) > 0 and time_ms <= self.samples[-1][0]:
+            if time_ms == self.samples[-1][0]:
+                self.samples[-1] = (time_ms, values)
+            else:
+                self.samples = [(time_ms, values)]
+            return
+
+        self.samples.append((time_ms, values))
+        if len(self.samples) > 2:
+            self.samples.pop(0)
+
+    def is_empty(self) -> bool:
+        """
+        Whether no sample has been recorded.
+        """
+        return len(self.samples) == 0
+
+    def sample_at(self, time_ms: int) -> "tuple[float, ...]":
+        """
+        Values at time_ms, linear through the last two samples. Extrapolation before
+        the older or past the newer sample is limited to MAX_EXTRAPOLATION, a single
+        sample is held.
+        """
+        assert not self.is_empty(), "No samples"
+
+        if len(self.samples) == 1:
+            return self.samples[0][1]
+
+        time_0, values_0 = self.samples[0]
+        time_1, values_1 = self.samples[1]
+        time_ms = min(max(time_ms, time_0 - MAX_EXTRAPOLATION), time_1 + MAX_EXTRAPOLATION)
+        fraction = (time_ms - time_0) / (time_1 - time_0)
+
+        result = []
+        for i, (value_0, value_1) in enumerate(zip(values_0, values_1)):
+            if i < self.angle_count:
+                delta = wrap_angle(value_1 - value_0)
+                result.append(wrap_angle(value_0 + fraction * delta))
+            else:
+                result.append(value_0 + fraction * (value_1 - value_0))
+
+        return tuple(result)
+
+
+def wrap_angle(angle: float) -> float:
+    """
+    Equivalent angle in [-pi, pi] radians.
+    """
+    return math.atan2(math.sin(angle), math.cos(angle))
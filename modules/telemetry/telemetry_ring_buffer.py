@@ -0,0 +1,211 @@
+"""
+Shared memory ring buffer of telemetry records.
+"""
+
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from . import telemetry
+from ..common.modules.logger import logger
+
+
+READ_RETRIES = 10
+
+# Header words
+HEAD = 0
+CONSUMED = 1
+
+
+class TelemetryRingBuffer:
+    """
+    Fixed capacity ring of TelemetryData records in shared memory, readable by
+    any process without a queue hop.
+
+    Writers are serialized with a lock. Readers never block on a read: each slot
+    has a sequence counter that is odd while the slot is being written, so a
+    reader retries when the counter is odd or changed during its copy (seqlock).
+    Readers can wait() for the next write instead of polling.
+    """
+
+    __private_key = object()
+
+    @classmethod
+    def create(
+        cls, capacity: int, local_logger: logger.Logger
+    ) -> "tuple[True, TelemetryRingBuffer] | tuple[False, None]":
+        """
+        Falliable create (instantiation) method to create a TelemetryRingBuffer object.
+        The creating process owns the shared memory and must call unlink() when done.
+
+        capacity: Number of records kept.
+        """
+        if capacity <= 0:
+            local_logger.error(f"Telemetry buffer capacity must be positive, got {capacity}")
+            return False, None
+
+        size = 16 + 8 * capacity + telemetry.TELEMETRY_DTYPE.itemsize * capacity
+
+        try:
+            memory = shared_memory.SharedMemory(create=True, size=size)
+        except OSError as e:
+            local_logger.error(f"Failed to allocate telemetry buffer: {e}")
+            return False, None
+
+        buffer = TelemetryRingBuffer(cls.__private_key, memory, capacity, mp.Condition())
+        buffer.__header[:] = 0
+        buffer.__sequence[:] = 0
+
+        return True, buffer
+
+    def __init__(
+        self,
+        key: object,
+        memory: shared_memory.SharedMemory,
+        capacity: int,
+        written: "mp.synchronize.Condition",
+    ) -> None:
+        assert key is TelemetryRingBuffer.__private_key, "Use create() method"
+
+        self.__attach(memory, capacity, written)
+
+    def __attach(
+        self,
+        memory: shared_memory.SharedMemory,
+        capacity: int,
+        written: "mp.synchronize.Condition",
+    ) -> None:
+        self.__memory = memory
+        self.__capacity = capacity
+        self.__written = written
+
+        # Layout: header of head (number of records ever written) and generation of the last
+        # record read_latest() returned, per slot sequence, records
+        self.__header = np.ndarray((2,), np.uint64, memory.buf, 0)
+        self.__sequence = np.ndarray((capacity,), np.uint64, memory.buf, 16)
+        self.__records = np.ndarray(
+            (capacity,), telemetry.TELEMETRY_DTYPE, memory.buf, 16 + 8 * capacity
+        )
+        self.__raw = self.__records.view(np.uint8).reshape(capacity, -1)
+
+    def __getstate__(self) -> "tuple":
+        # Views cannot be pickled, reattach by name in the receiving process
+        return self.__memory.name, self.__capacity, self.__written
+
+    def __setstate__(self, state: "tuple") -> None:
+        name, capacity, written = state
+        self.__attach(shared_memory.SharedMemory(name=name), capacity, written)
+
+    @property
+    def capacity(self) -> int:
+        """
+        Number of records kept.
+        """
+        return self.__capacity
+
+    @property
+    def generation(self) -> int:
+        """
+        Number of records ever written. Changes whenever a new record is available.
+        """
+        return int(self.__header[HEAD])
+
+    @property
+    def backlog(self) -> int:
+        """
+        Records written since the newest one read_latest() returned, including those
+        skipped by the reader. 0 while the reader keeps up.
+        """
+        return max(self.generation - int(self.__header[CONSUMED]), 0)
+
+    def write(self, data: telemetry.TelemetryData) -> None:
+        """
+        Append a record, overwriting the oldest one when full.
+        """
+        record = np.frombuffer(data.to_bytes(), np.uint8)
+
+        with self.__written:
+            head = int(self.__header[HEAD])
+            index = head % self.__capacity
+
+            self.__sequence[index] += 1
+            self.__raw[index] = record
+            self.__sequence[index] += 1
+
+            self.__header[HEAD] = head + 1
+            self.__written.notify_all()
+
+    def wait(self, generation: int, timeout: float) -> bool:
+        """
+        Wait until the generation differs from the given one.
+
+        Returns whether a new record was written before the timeout.
+        """
+        with self.__written:
+            return self.__written.wait_for(lambda: self.generation != generation, timeout)
+
+    def read_latest(self) -> "tuple[True, telemetry.TelemetryData] | tuple[False, None]":
+        """
+        Newest record, which also marks it and every older record as consumed.
+
+        Returns False if nothing has been written yet or a consistent copy
+        could not be made.
+        """
+        for _ in range(READ_RETRIES):
+            head = int(self.__header[HEAD])
+            if head == 0:
+                return False, None
+
+            index = (head - 1) % self.__capacity
+
+            before = int(self.__sequence[index])
+            if before % 2 == 1:
+                continue
+
+            record = self.__raw[index].tobytes()
+
+            if int(self.__sequence[index]) == before:
+                self.__header[CONSUMED] = head
+                return True, telemetry.TelemetryData.from_bytes(record)
+
+        return False, None
+
+    def read_last(self, count: int) -> "tuple[True, np.ndarray] | tuple[False, None]":
+        """
+        Up to count newest records, oldest first, as a TELEMETRY_DTYPE array.
+
+        Returns False if a consistent copy could not be made.
+        """
+        for _ in range(READ_RETRIES):
+            head = int(self.__header[HEAD])
+            count = min(count, head, self.__capacity)
+            indices = np.arange(head - count, head) % self.__capacity
+
+            before = self.__sequence[indices]
+            if np.any(before % 2 == 1):
+                continue
+
+            records = self.__records[indices]
+
+            if np.array_equal(self.__sequence[indices], before):
+                return True, records
+
+        return False, None
+
+    def close(self) -> None:
+        """
+        Detach this process from the shared memory.
+        """
+        # Views must be released before the memory can be closed
+        del self.__header
+        del self.__sequence
+        del self.__records
+        del self.__raw
+        self.__memory.close()
+
+    def unlink(self) -> None:
+        """
+        Free the shared memory. Only the creating process calls this, after close().
+        """
+        self.__memory.unlink()
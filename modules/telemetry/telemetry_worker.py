@@ -9,24 +9,41 @@ from pymavlink import mavutil
 
 from utilities.workers import queue_proxy_wrapper
 from utilities.workers import worker_controller
+from . import stream_rate
 from . import telemetry
+from . import telemetry_ring_buffer
 from ..common.modules.logger import logger
+from ..link import outbound_sender
 
 
 # =================================================================================================
 #                            ↓ BOOTCAMPERS MODIFY BELOW THIS COMMENT ↓
 # =================================================================================================
+INITIAL_STREAM_RATE = 10.0  # Hz
+
+
 def telemetry_worker(
     connection: mavutil.mavfile,
     # Place your own arguments here
+    telemetry_buffer: telemetry_ring_buffer.TelemetryRingBuffer | None,
+    rate_connection: mavutil.mavfile | None,
     # Add other necessary worker arguments here
+    outbound_queue: queue_proxy_wrapper.QueueProxyWrapper | None,
     output_queue: queue_proxy_wrapper.QueueProxyWrapper,
     controller: worker_controller.WorkerController,
 ) -> None:
     """
     Worker process.
 
-    args... describe what the arguments are
+    connection: Source of ATTITUDE and LOCAL_POSITION_NED messages.
+    telemetry_buffer: Shared ring every sample is also written to, None to only use the queue.
+    rate_connection: Connection to request stream rates on, adapted to the backlog of the
+        telemetry_buffer reader (the command worker), or of output_queue without a buffer.
+        None to keep the autopilot's default rates.
+    outbound_queue: Input of the link writer worker to send the rate requests through,
+        None to write them to rate_connection directly.
+    output_queue: Where the telemetry data is placed.
+    controller: How the main process communicates to this worker process.
     """
     # =============================================================================================
     #                          ↑ BOOTCAMPERS MODIFY ABOVE THIS COMMENT ↑
@@ -57,18 +74,43 @@ def telemetry_worker(
     else:
         local_logger.info("telemetry created")
 
+    sender = None
+    if outbound_queue is not None:
+        sender = outbound_sender.QueueSender(outbound_queue)
+
+    rate_controller = None
+    if rate_connection is not None:
+        res, rate_controller = stream_rate.StreamRateController.create(
+            rate_connection, INITIAL_STREAM_RATE, local_logger, sender=sender
+        )
+        if not res:
+            local_logger.warning("failed to create stream rate controller, using default rates")
+
     # Main loop: do work.
 
     while not controller.is_exit_requested() and not controller.check_pause():
         data = tele.run()
 
+        # Measured before the new sample is written, so a reader keeping up has no backlog
+        if rate_controller is not None and rate_controller.is_due():
+            if telemetry_buffer is not None:
+                rate_controller.update(telemetry_buffer.backlog)
+            else:
+                rate_controller.update(output_queue.queue.qsize())
+
         if data is not None:
-            output_queue.queue.put(data)
+            if telemetry_buffer is not None:
+                telemetry_buffer.write(data)
+
+            output_queue.put(data)
             local_logger.info("telemetry data has been sent to command worker")
 
         else:
             local_logger.warning("no telemetry data could be sent to command worker")
 
+    if telemetry_buffer is not None:
+        telemetry_buffer.close()
+
 
 # =================================================================================================
 #                            ↑ BOOTCAMPERS MODIFY ABOVE THIS COMMENT ↑
@@ -0,0 +1,72 @@
+"""
+Benchmark COMMAND_LONG encoding from cached frames against command_long_send().
+To run:
+```
+python -m tests.benchmarks.command_long_encoder_benchmark
+```
+"""
+
+import timeit
+
+from pymavlink import mavutil
+
+from modules.link import command_long_encoder
+
+
+NUM_ITERATIONS = 100_000
+
+
+class NullFile:
+    """
+    Discards writes so that only encoding is measured.
+    """
+
+    def write(self, buf: bytes) -> None:
+        """
+        Discard.
+        """
+
+
+def report(name: str, statement: "(...) -> object") -> None:  # type: ignore
+    """
+    Print the time per call.
+    """
+    seconds = timeit.timeit(statement, number=NUM_ITERATIONS)
+    print(f"{name:<24} {seconds / NUM_ITERATIONS * 1e6:8.3f} us")
+
+
+def main() -> int:
+    """
+    Run the benchmarks.
+    """
+    mav = mavutil.mavlink.MAVLink(NullFile(), 255, 0)
+    encoder = command_long_encoder.CommandLongEncoder(mav)
+    yaw = mavutil.mavlink.MAV_CMD_CONDITION_YAW
+
+    report(
+        "command_long_send",
+        lambda: mav.command_long_send(
+            target_system=1,
+            target_component=0,
+            command=yaw,
+            confirmation=0,
+            param1=12.5,
+            param2=5,
+            param3=-1,
+            param4=1,
+            param5=0,
+            param6=0,
+            param7=0,
+        ),
+    )
+    report("encoder send", lambda: encoder.send(1, 0, yaw, 0, 12.5, 5, -1, 1, 0, 0, 0))
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"Failed with return code {result_main}")
+    else:
+        print("Done!")
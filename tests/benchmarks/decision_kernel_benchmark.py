@@ -0,0 +1,51 @@
+"""
+Benchmark the vectorized command decision against deciding one sample at a time.
+To run:
+```
+python -m tests.benchmarks.decision_kernel_benchmark
+```
+"""
+
+import timeit
+
+import numpy as np
+
+from modules.command import decision_kernel
+
+
+NUM_SAMPLES = 1_000_000
+NUM_SCALAR_SAMPLES = 10_000
+TARGET = (10.0, 20.0, 30.0)
+
+
+def main() -> int:
+    """
+    Run the benchmarks.
+    """
+    generator = np.random.default_rng(0)
+    x = generator.uniform(-50.0, 50.0, NUM_SAMPLES)
+    y = generator.uniform(-50.0, 50.0, NUM_SAMPLES)
+    z = generator.uniform(28.0, 32.0, NUM_SAMPLES)
+    yaw = generator.uniform(-np.pi, np.pi, NUM_SAMPLES)
+
+    seconds = timeit.timeit(
+        lambda: decision_kernel.decide(x, y, z, yaw, TARGET, 0.5, 5.0), number=1
+    )
+    print(f"{'vectorized':<12} {seconds / NUM_SAMPLES * 1e9:10.1f} ns per sample")
+
+    samples = list(zip(x.tolist(), y.tolist(), z.tolist(), yaw.tolist()))[:NUM_SCALAR_SAMPLES]
+    seconds = timeit.timeit(
+        lambda: [decision_kernel.decide(*sample, TARGET, 0.5, 5.0) for sample in samples],
+        number=1,
+    )
+    print(f"{'per sample':<12} {seconds / NUM_SCALAR_SAMPLES * 1e9:10.1f} ns per sample")
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"Failed with return code {result_main}")
+    else:
+        print("Done!")
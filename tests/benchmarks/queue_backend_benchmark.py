@@ -0,0 +1,146 @@
+"""
+Benchmark the queue wrapper backends: throughput from a producer process and
+round trip latency between two processes.
+To run:
+```
+python -m tests.benchmarks.queue_backend_benchmark
+```
+"""
+
+import multiprocessing as mp
+import time
+
+from pymavlink import mavutil
+
+from utilities.workers import queue_proxy_wrapper
+
+
+NUM_ITEMS = 20_000
+NUM_ROUND_TRIPS = 5_000
+QUEUE_SIZE = 64
+
+
+def make_item() -> mavutil.mavlink.MAVLink_message:
+    """
+    Received ATTITUDE message, as routed by the link reader.
+    """
+    mav = mavutil.mavlink.MAVLink(None)
+    msg = mav.parse_char(mav.attitude_encode(1000, 0.1, 0.2, 0.3, 0.0, 0.0, 0.0).pack(mav))
+    msg.receive_time = time.monotonic()
+    return msg
+
+
+def produce(output_queue: queue_proxy_wrapper.QueueProxyWrapper) -> None:
+    """
+    Put NUM_ITEMS items, then a sentinel.
+    """
+    item = make_item()
+    for _ in range(NUM_ITEMS):
+        output_queue.queue.put(item)
+
+    output_queue.queue.put(None)
+
+
+def echo(
+    input_queue: queue_proxy_wrapper.QueueProxyWrapper,
+    output_queue: queue_proxy_wrapper.QueueProxyWrapper,
+) -> None:
+    """
+    Return every item until the sentinel.
+    """
+    while True:
+        item = input_queue.queue.get()
+        output_queue.queue.put(item)
+        if item is None:
+            return
+
+
+def throughput(create: "(...) -> queue_proxy_wrapper.QueueProxyWrapper") -> float:  # type: ignore
+    """
+    Items per second through a queue from another process.
+    """
+    wrapper = create()
+    producer = mp.Process(target=produce, args=(wrapper,))
+
+    start = time.perf_counter()
+    producer.start()
+    while wrapper.queue.get() is not None:
+        pass
+    seconds = time.perf_counter() - start
+
+    producer.join()
+    wrapper.close()
+    return NUM_ITEMS / seconds
+
+
+def latency(create: "(...) -> queue_proxy_wrapper.QueueProxyWrapper") -> "list[float]":  # type: ignore
+    """
+    Sorted round trip times in seconds to another process and back.
+    """
+    requests = create()
+    responses = create()
+    echoer = mp.Process(target=echo, args=(requests, responses))
+    echoer.start()
+
+    item = make_item()
+    round_trips = []
+    for _ in range(NUM_ROUND_TRIPS):
+        start = time.perf_counter()
+        requests.queue.put(item)
+        responses.queue.get()
+        round_trips.append(time.perf_counter() - start)
+
+    requests.queue.put(None)
+    responses.queue.get()
+    echoer.join()
+    requests.close()
+    responses.close()
+
+    return sorted(round_trips)
+
+
+def report(name: str, create: "(...) -> queue_proxy_wrapper.QueueProxyWrapper") -> None:  # type: ignore
+    """
+    Print the throughput and latency percentiles.
+    """
+    items_per_second = throughput(create)
+    round_trips = latency(create)
+
+    percentiles = [
+        round_trips[min(int(fraction * len(round_trips)), len(round_trips) - 1)] * 1e6
+        for fraction in (0.5, 0.99, 1.0)
+    ]
+    print(
+        f"{name:<16} {items_per_second:10.0f} items/s   "
+        f"round trip p50 {percentiles[0]:8.1f} us  p99 {percentiles[1]:8.1f} us  "
+        f"max {percentiles[2]:8.1f} us"
+    )
+
+
+def main() -> int:
+    """
+    Run the benchmarks.
+    """
+    mp_manager = mp.Manager()
+
+    report("manager", lambda: queue_proxy_wrapper.QueueProxyWrapper(mp_manager, QUEUE_SIZE))
+    report(
+        "shared memory",
+        lambda: queue_proxy_wrapper.QueueProxyWrapper(
+            None,
+            QUEUE_SIZE,
+            backend=queue_proxy_wrapper.QueueBackend.SHARED_MEMORY,
+        ),
+    )
+
+    mp_manager.shutdown()
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"Failed with return code {result_main}")
+    else:
+        print("Done!")
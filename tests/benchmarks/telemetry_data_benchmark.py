@@ -0,0 +1,88 @@
+"""
+Benchmark TelemetryData serialization against the previous pickled dictionary layout.
+To run:
+```
+python -m tests.benchmarks.telemetry_data_benchmark
+```
+"""
+
+import pickle
+import timeit
+
+from modules.telemetry import telemetry
+
+
+NUM_ITERATIONS = 100_000
+
+
+class DictTelemetryData:  # pylint: disable=too-many-instance-attributes
+    """
+    TelemetryData before __slots__ and the packed record, pickled attribute by attribute.
+    """
+
+    def __init__(self, *values: "float | None") -> None:
+        (
+            self.time_since_boot,
+            self.x,
+            self.y,
+            self.z,
+            self.x_velocity,
+            self.y_velocity,
+            self.z_velocity,
+            self.roll,
+            self.pitch,
+            self.yaw,
+            self.roll_speed,
+            self.pitch_speed,
+            self.yaw_speed,
+            self.receive_time,
+        ) = values
+
+
+def report(name: str, statement: "(...) -> object", size: int) -> None:  # type: ignore
+    """
+    Print the time per call and the serialized size.
+    """
+    seconds = timeit.timeit(statement, number=NUM_ITERATIONS)
+    print(f"{name:<32} {seconds / NUM_ITERATIONS * 1e6:8.3f} us {size:6d} bytes")
+
+
+def main() -> int:
+    """
+    Run the benchmarks.
+    """
+    values = (123456, 1.0, 2.0, 3.0, 0.1, 0.2, 0.3, 0.01, 0.02, 0.03, 0.001, 0.002, 0.003, 98.5)
+    dict_data = DictTelemetryData(*values)
+    data = telemetry.TelemetryData(*values)
+
+    dict_pickled = pickle.dumps(dict_data, pickle.HIGHEST_PROTOCOL)
+    pickled = pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+    record = data.to_bytes()
+
+    report(
+        "dict pickle round trip",
+        lambda: pickle.loads(pickle.dumps(dict_data, pickle.HIGHEST_PROTOCOL)),
+        len(dict_pickled),
+    )
+    report(
+        "record pickle round trip",
+        lambda: pickle.loads(pickle.dumps(data, pickle.HIGHEST_PROTOCOL)),
+        len(pickled),
+    )
+    report(
+        "to_bytes/from_bytes round trip",
+        lambda: telemetry.TelemetryData.from_bytes(data.to_bytes()),
+        len(record),
+    )
+    report("dict construction", lambda: DictTelemetryData(*values), 0)
+    report("slots construction", lambda: telemetry.TelemetryData(*values), 0)
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main < 0:
+        print(f"Failed with return code {result_main}")
+    else:
+        print("Done!")
@@ -21,6 +21,19 @@ YAW_SPEED = math.pi
 X_SPEED = 1
 
 
+def is_negotiated(periods: "list[float]") -> bool:
+    """
+    Whether the requested periods grew (backlog) and then shrank again (drained).
+    """
+    if len(periods) == 0:
+        return False
+
+    longest = periods.index(max(periods))
+    return periods[longest] > periods[0] and any(
+        period < periods[longest] for period in periods[longest + 1 :]
+    )
+
+
 def main() -> int:
     """
     Begin mock drone simulation to test a telemetry worker.
@@ -44,6 +57,29 @@ def main() -> int:
 
     local_logger.info("Logger initialized")
 
+    # Periods requested by the GCS with MAV_CMD_SET_MESSAGE_INTERVAL, by message ID
+    requested_periods = {}
+    # Every ATTITUDE period requested, in order
+    attitude_periods = []
+
+    def receive_interval_requests() -> None:
+        msg = connection.recv_match(type="COMMAND_LONG", blocking=False)
+        while msg is not None:
+            if msg.command == mavutil.mavlink.MAV_CMD_SET_MESSAGE_INTERVAL:
+                result = mavutil.mavlink.MAV_RESULT_DENIED
+                if msg.param2 > 0:
+                    requested_periods[int(msg.param1)] = msg.param2 / 1e6
+                    if int(msg.param1) == mavutil.mavlink.MAVLINK_MSG_ID_ATTITUDE:
+                        attitude_periods.append(msg.param2 / 1e6)
+                    result = mavutil.mavlink.MAV_RESULT_ACCEPTED
+                    local_logger.info(
+                        f"Drone: Interval of {int(msg.param1)} set to {msg.param2} us"
+                    )
+
+                connection.mav.command_ack_send(msg.command, result)
+
+            msg = connection.recv_match(type="COMMAND_LONG", blocking=False)
+
     # Task is to send ATTITUDE and LOCAL_POSITION_NED messages
     def send_telemetry(attitude_period: float, position_period: float) -> int:
         attitude_count = -1
@@ -53,6 +89,27 @@ def main() -> int:
             start = time.time()
             now = start
             while now - start < TOTAL_PERIOD:
+                receive_interval_requests()
+
+                # Honour requested intervals, restarting the count so the next message is on time
+                new_attitude_period = requested_periods.get(
+                    mavutil.mavlink.MAVLINK_MSG_ID_ATTITUDE, attitude_period
+                )
+                if new_attitude_period != attitude_period:
+                    attitude_period = new_attitude_period
+                    attitude_count = (
+                        (now - start) // attitude_period + i * TOTAL_PERIOD // attitude_period - 1
+                    )
+
+                new_position_period = requested_periods.get(
+                    mavutil.mavlink.MAVLINK_MSG_ID_LOCAL_POSITION_NED, position_period
+                )
+                if new_position_period != position_period:
+                    position_period = new_position_period
+                    position_count = (
+                        (now - start) // position_period + i * TOTAL_PERIOD // position_period - 1
+                    )
+
                 if (
                     now - start
                 ) // attitude_period + i * TOTAL_PERIOD // attitude_period > attitude_count:
@@ -131,6 +188,12 @@ def main() -> int:
     if send_telemetry(POSITION_PERIOD, ATTITUDE_PERIOD) != 0:
         return -2
 
+    # Requests sent after the last loop are still buffered
+    receive_interval_requests()
+    if not is_negotiated(attitude_periods):
+        local_logger.error(f"Drone: Stream rate was not negotiated, periods {attitude_periods}")
+        return -3
+
     local_logger.info("Passed!")
     return 0
 
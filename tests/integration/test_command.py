@@ -256,7 +256,9 @@ def main() -> int:
     # Read the main queue (worker outputs)
     threading.Thread(target=read_queue, args=(output_queue, controller, main_logger)).start()
 
-    command_worker.command_worker(connection, TARGET, input_queue, output_queue, controller)
+    command_worker.command_worker(
+        connection, TARGET, input_queue, None, None, None, output_queue, controller
+    )
     # =============================================================================================
     #                          ↑ BOOTCAMPERS MODIFY ABOVE THIS COMMENT ↑
     # =============================================================================================
@@ -142,7 +142,11 @@ def main() -> int:
     threading.Thread(target=read_queue, args=(input_queue, controller, main_logger)).start()
 
     heartbeat_receiver_worker.heartbeat_receiver_worker(
-        connection=connection, output_queue=input_queue, controller=controller
+        connection=connection,
+        status=None,
+        quality=None,
+        output_queue=input_queue,
+        controller=controller,
     )
     # =============================================================================================
     #                          ↑ BOOTCAMPERS MODIFY ABOVE THIS COMMENT ↑
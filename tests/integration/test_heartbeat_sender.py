@@ -102,6 +102,8 @@ def main() -> int:
     heartbeat_sender_worker.heartbeat_sender_worker(
         # Place your own arguments here
         connection,
+        False,
+        None,
         controller,
     )
     # =============================================================================================
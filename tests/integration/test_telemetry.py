@@ -5,6 +5,7 @@ Test the telemetry worker with a mocked drone.
 import multiprocessing as mp
 import subprocess
 import threading
+import time
 
 from pymavlink import mavutil
 
@@ -28,6 +29,10 @@ NUM_FAILS = 3
 #                            ↓ BOOTCAMPERS MODIFY BELOW THIS COMMENT ↓
 # =================================================================================================
 # Add your own constants here
+# Main stops reading for this window (seconds from the start), the backlog that builds up
+# must make the worker request a lower stream rate, and draining it a higher one again
+BACKLOG_START = 2
+BACKLOG_END = 5
 
 # =================================================================================================
 #                            ↑ BOOTCAMPERS MODIFY ABOVE THIS COMMENT ↑
@@ -62,12 +67,17 @@ def read_queue(
     input_queue: queue_proxy_wrapper.QueueProxyWrapper,  # Add any necessary arguments
     controller: worker_controller.WorkerController,
     main_logger: logger.Logger,
+    start: float,
 ) -> None:
     """
-    Read and print the output queue.
+    Read and print the output queue, except during the backlog window.
     """
 
     while not controller.is_exit_requested():
+        if BACKLOG_START <= time.monotonic() - start < BACKLOG_END:
+            time.sleep(0.1)
+            continue
+
         if not input_queue.queue.empty():
             main_logger.info(f"Info from telemetry worker: {input_queue.queue.get()}")
     # Add logic to read from your worker's output queue and print it using the logger
@@ -140,9 +150,12 @@ def main() -> int:
     ).start()
 
     # Read the main queue (worker outputs)
-    threading.Thread(target=read_queue, args=(input_queue, controller, main_logger)).start()
+    threading.Thread(
+        target=read_queue, args=(input_queue, controller, main_logger, time.monotonic())
+    ).start()
 
-    telemetry_worker.telemetry_worker(connection, input_queue, controller)
+    # Stream rates are requested on the same connection, the drone checks they changed
+    telemetry_worker.telemetry_worker(connection, None, connection, None, input_queue, controller)
     # =============================================================================================
     #                          ↑ BOOTCAMPERS MODIFY ABOVE THIS COMMENT ↑
     # =============================================================================================
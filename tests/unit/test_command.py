@@ -0,0 +1,152 @@
+"""
+Test the telemetry age guard of the command decision.
+"""
+
+import time
+
+import pytest
+from pymavlink import mavutil
+
+from modules.command import command
+from modules.common.modules.logger import logger
+from modules.heartbeat import link_status
+from modules.telemetry import telemetry
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+class FakeConnection:
+    """
+    Decodes what is written to it.
+    """
+
+    def __init__(self) -> None:
+        self.mav = mavutil.mavlink.MAVLink(self)
+        self.parser = mavutil.mavlink.MAVLink(None)
+        self.commands = []
+
+    def write(self, buf: bytes) -> None:
+        """
+        Keep the command id.
+        """
+        self.commands.append(self.parser.decode(bytearray(buf)).command)
+
+
+@pytest.fixture()
+def local_logger() -> logger.Logger:  # type: ignore
+    """
+    Logger for the command.
+    """
+    result, test_logger = logger.Logger.create("test_command", False)
+    assert result
+    assert test_logger is not None
+    yield test_logger  # type: ignore
+
+
+def low_altitude(receive_time: "float | None") -> telemetry.TelemetryData:
+    """
+    Telemetry 10 m below the target.
+    """
+    return telemetry.TelemetryData(
+        x=0, y=0, z=20, yaw=0, x_velocity=0, y_velocity=0, z_velocity=0, receive_time=receive_time
+    )
+
+
+def create_command(
+    local_logger: logger.Logger, stale_policy: command.StalePolicy
+) -> command.Command:
+    """
+    Command with a 0.5 s age budget.
+    """
+    result, instance = command.Command.create(
+        FakeConnection(), command.Position(10, 20, 30), local_logger, 0.5, stale_policy
+    )
+    assert result
+    assert instance is not None
+    return instance
+
+
+class TestDataAge:
+    """
+    Stale telemetry handling.
+    """
+
+    def test_fresh(self, local_logger: logger.Logger) -> None:
+        """
+        Fresh and unstamped telemetry are acted on.
+        """
+        # Setup
+        instance = create_command(local_logger, command.StalePolicy.REJECT)
+
+        # Run
+        fresh = instance.run(low_altitude(time.monotonic()))
+        unstamped = instance.run(low_altitude(None))
+
+        # Test
+        assert fresh == "CHANGE_ALTITUDE: 10.0"
+        assert unstamped == "CHANGE_ALTITUDE: 10.0"
+        assert instance.stale_count == 0
+        assert instance.data_age.count == 1
+
+    def test_reject(self, local_logger: logger.Logger) -> None:
+        """
+        Stale telemetry is counted and not acted on.
+        """
+        # Setup
+        instance = create_command(local_logger, command.StalePolicy.REJECT)
+
+        # Run
+        actual = instance.run(low_altitude(time.monotonic() - 2.0))
+
+        # Test
+        assert actual is None
+        assert instance.stale_count == 1
+        assert len(instance.connection.commands) == 0
+
+    def test_flag(self, local_logger: logger.Logger) -> None:
+        """
+        Stale telemetry is counted but still acted on.
+        """
+        # Setup
+        instance = create_command(local_logger, command.StalePolicy.FLAG)
+
+        # Run
+        actual = instance.run(low_altitude(time.monotonic() - 2.0))
+
+        # Test
+        assert actual == "CHANGE_ALTITUDE: 10.0"
+        assert instance.stale_count == 1
+
+
+class TestLinkGate:
+    """
+    Commands are held while the link is down.
+    """
+
+    def test_gate(self, local_logger: logger.Logger) -> None:
+        """
+        Nothing is sent until the link is connected.
+        """
+        # Setup
+        result, link = link_status.LinkStatus.create(local_logger)
+        assert result
+        assert link is not None
+        result, instance = command.Command.create(
+            FakeConnection(), command.Position(10, 20, 30), local_logger, link=link
+        )
+        assert result
+        assert instance is not None
+
+        # Run
+        down = instance.run(low_altitude(None))
+        link.publish(True)
+        up = instance.run(low_altitude(None))
+
+        # Test
+        assert down is None
+        assert up == "CHANGE_ALTITUDE: 10.0"
+        assert instance.link_down_count == 1
+        assert instance.connection.commands == [mavutil.mavlink.MAV_CMD_CONDITION_CHANGE_ALT]
@@ -0,0 +1,169 @@
+"""
+Test COMMAND_LONG tracking until acknowledgement.
+"""
+
+import time
+
+import pytest
+from pymavlink import mavutil
+
+from modules.command import command_tracker
+from modules.common.modules.logger import logger
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+CHANGE_ALT = mavutil.mavlink.MAV_CMD_CONDITION_CHANGE_ALT
+CLIMB_TO_30 = (1, 0, 0, 0, 0, 0, 30.0)
+
+
+class FakeConnection:
+    """
+    Decodes what is written to it.
+    """
+
+    def __init__(self) -> None:
+        self.mav = mavutil.mavlink.MAVLink(self)
+        self.parser = mavutil.mavlink.MAVLink(None)
+        self.sent = []
+
+    def write(self, buf: bytes) -> None:
+        """
+        Keep (command, confirmation).
+        """
+        msg = self.parser.decode(bytearray(buf))
+        self.sent.append((msg.command, msg.confirmation))
+
+
+def ack(result: int) -> mavutil.mavlink.MAVLink_command_ack_message:
+    """
+    COMMAND_ACK of CHANGE_ALT.
+    """
+    return mavutil.mavlink.MAVLink_command_ack_message(CHANGE_ALT, result)
+
+
+@pytest.fixture()
+def local_logger() -> logger.Logger:  # type: ignore
+    """
+    Logger for the tracker.
+    """
+    result, test_logger = logger.Logger.create("test_command_tracker", False)
+    assert result
+    assert test_logger is not None
+    yield test_logger  # type: ignore
+
+
+@pytest.fixture()
+def tracker(local_logger: logger.Logger) -> command_tracker.CommandTracker:  # type: ignore
+    """
+    Tracker with a short timeout.
+    """
+    result, instance = command_tracker.CommandTracker.create(
+        FakeConnection(), local_logger, ack_timeout=0.05, max_attempts=3, backoff=2.0
+    )
+    assert result
+    assert instance is not None
+    yield instance  # type: ignore
+
+
+class TestCommandTracker:
+    """
+    Suppression, acknowledgement and retransmission.
+    """
+
+    def test_suppress_in_flight(self, tracker: command_tracker.CommandTracker) -> None:
+        """
+        Equivalent commands are not sent while one is in flight, different ones are.
+        """
+        # Run
+        first = tracker.send(CHANGE_ALT, CLIMB_TO_30)
+        repeat = tracker.send(CHANGE_ALT, (1, 0, 0, 0, 0, 0, 30.0001))
+        different = tracker.send(CHANGE_ALT, (1, 0, 0, 0, 0, 0, 40.0))
+
+        # Test
+        assert first
+        assert not repeat
+        assert different
+        assert tracker.suppressed == 1
+        assert tracker.in_flight() == 1
+
+    def test_accepted(self, tracker: command_tracker.CommandTracker) -> None:
+        """
+        Acceptance completes the command and holds off repeats.
+        """
+        # Setup
+        tracker.send(CHANGE_ALT, CLIMB_TO_30)
+
+        # Run
+        handled = tracker.handle_ack(ack(mavutil.mavlink.MAV_RESULT_ACCEPTED))
+        repeat = tracker.send(CHANGE_ALT, CLIMB_TO_30)
+
+        # Test
+        assert handled
+        assert tracker.in_flight() == 0
+        assert not repeat
+        assert not tracker.handle_ack(ack(mavutil.mavlink.MAV_RESULT_ACCEPTED))
+
+    @pytest.mark.parametrize(
+        "result", [mavutil.mavlink.MAV_RESULT_DENIED, mavutil.mavlink.MAV_RESULT_FAILED]
+    )
+    def test_rejected(self, result: int, tracker: command_tracker.CommandTracker) -> None:
+        """
+        Rejection completes the command and holds off repeats, but not different commands.
+        """
+        # Setup
+        tracker.send(CHANGE_ALT, CLIMB_TO_30)
+
+        # Run
+        tracker.handle_ack(ack(result))
+        repeat = tracker.send(CHANGE_ALT, CLIMB_TO_30)
+        different = tracker.send(CHANGE_ALT, (1, 0, 0, 0, 0, 0, 40.0))
+
+        # Test
+        assert tracker.rejected == 1
+        assert not repeat
+        assert different
+        assert tracker.suppressed == 1
+
+    def test_rejected_hold_expires(self, local_logger: logger.Logger) -> None:
+        """
+        A rejected command is sent again once the hold is over.
+        """
+        # Setup
+        result, instance = command_tracker.CommandTracker.create(
+            FakeConnection(), local_logger, rejected_hold=0.01
+        )
+        assert result
+        assert instance is not None
+        instance.send(CHANGE_ALT, CLIMB_TO_30)
+        instance.handle_ack(ack(mavutil.mavlink.MAV_RESULT_DENIED))
+
+        # Run
+        held = instance.send(CHANGE_ALT, CLIMB_TO_30)
+        time.sleep(0.02)
+        expired = instance.send(CHANGE_ALT, CLIMB_TO_30)
+
+        # Test
+        assert not held
+        assert expired
+
+    def test_retransmit(self, tracker: command_tracker.CommandTracker) -> None:
+        """
+        Unacknowledged commands are retransmitted with increasing confirmation, then dropped.
+        """
+        # Setup
+        tracker.send(CHANGE_ALT, CLIMB_TO_30)
+
+        # Run
+        deadline = time.monotonic() + 1.0
+        while tracker.in_flight() > 0 and time.monotonic() < deadline:
+            tracker.run()
+            time.sleep(0.01)
+
+        # Test
+        assert tracker.connection.sent == [(CHANGE_ALT, 0), (CHANGE_ALT, 1), (CHANGE_ALT, 2)]
+        assert tracker.retransmitted == 2
+        assert tracker.timed_out == 1
@@ -0,0 +1,114 @@
+"""
+Test the vectorized command decision.
+"""
+
+import math
+
+import numpy as np
+
+from modules.command import decision_kernel
+
+
+TARGET = (10.0, 20.0, 30.0)
+ALTITUDE_ERROR = 0.5
+YAW_ERROR = 5.0
+
+# Heading from the origin to the target
+TARGET_YAW = math.atan2(20.0, 10.0)
+
+
+class TestDecide:
+    """
+    Decisions and amounts.
+    """
+
+    def test_scalar(self) -> None:
+        """
+        Scalars give 0 dimensional results.
+        """
+        # Run
+        decisions, amounts = decision_kernel.decide(
+            0.0, 0.0, 29.0, 0.0, TARGET, ALTITUDE_ERROR, YAW_ERROR
+        )
+
+        # Test
+        assert decisions.shape == ()
+        assert decisions == decision_kernel.CHANGE_ALTITUDE
+        assert amounts == 1.0
+
+    def test_array(self) -> None:
+        """
+        Altitude takes priority over yaw, within both tolerances nothing is done.
+        """
+        # Setup
+        z = np.array([29.0, 31.0, 30.2, 30.0, 30.0])
+        yaw = np.array([0.0, 0.0, 0.0, TARGET_YAW, TARGET_YAW + math.radians(2)])
+
+        # Run
+        decisions, amounts = decision_kernel.decide(0.0, 0.0, z, yaw, TARGET, 0.5, 5.0)
+
+        # Test
+        assert decisions.tolist() == [
+            decision_kernel.CHANGE_ALTITUDE,
+            decision_kernel.CHANGE_ALTITUDE,
+            decision_kernel.CHANGE_YAW,
+            decision_kernel.NO_OP,
+            decision_kernel.NO_OP,
+        ]
+        assert amounts[0] == 1.0
+        assert amounts[1] == -1.0
+        assert math.isclose(amounts[2], math.degrees(TARGET_YAW))
+        assert amounts[3] == 0.0
+
+    def test_yaw_wraps(self) -> None:
+        """
+        Relative yaw takes the short way round, in [-180, 180] degrees.
+        """
+        # Setup
+        x = np.array([20.0, 20.0])
+        y = np.array([19.0, 21.0])  # Target just left and just right of behind
+        yaw = np.array([0.0, 0.0])
+
+        # Run
+        decisions, amounts = decision_kernel.decide(x, y, 30.0, yaw, TARGET, 0.5, 5.0)
+
+        # Test
+        assert (decisions == decision_kernel.CHANGE_YAW).all()
+        assert math.isclose(amounts[0], 180 - math.degrees(math.atan(0.1)))
+        assert math.isclose(amounts[1], -180 + math.degrees(math.atan(0.1)))
+        assert (np.abs(amounts) <= 180).all()
+
+
+class TestDecideOne:
+    """
+    Scalar fast path.
+    """
+
+    def test_matches_decide(self) -> None:
+        """
+        Same decisions and amounts as the vectorized kernel.
+        """
+        # Setup
+        rng = np.random.default_rng(0)
+        x = rng.uniform(-50.0, 50.0, 500)
+        y = rng.uniform(-50.0, 50.0, 500)
+        z = rng.uniform(29.0, 31.0, 500)
+        yaw = rng.uniform(-2 * math.pi, 2 * math.pi, 500)
+        expected_decisions, expected_amounts = decision_kernel.decide(
+            x, y, z, yaw, TARGET, ALTITUDE_ERROR, YAW_ERROR
+        )
+
+        # Run
+        results = [
+            decision_kernel.decide_one(*sample, TARGET, ALTITUDE_ERROR, YAW_ERROR)
+            for sample in zip(x.tolist(), y.tolist(), z.tolist(), yaw.tolist())
+        ]
+
+        # Test
+        assert [decision for decision, _ in results] == expected_decisions.tolist()
+        assert np.allclose([amount for _, amount in results], expected_amounts)
+        assert {decision for decision, _ in results} == {
+            decision_kernel.NO_OP,
+            decision_kernel.CHANGE_ALTITUDE,
+            decision_kernel.CHANGE_YAW,
+        }
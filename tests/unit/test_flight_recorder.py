@@ -0,0 +1,177 @@
+"""
+Test recording MAVLink frames and replaying them as a connection.
+"""
+
+import pathlib
+import time
+
+import pytest
+from pymavlink import mavutil
+
+from modules.common.modules.logger import logger
+from modules.flight_recorder import flight_recorder
+from modules.flight_recorder import replay_connection
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+@pytest.fixture()
+def local_logger() -> logger.Logger:  # type: ignore
+    """
+    Logger for the recorder.
+    """
+    result, test_logger = logger.Logger.create("test_flight_recorder", False)
+    assert result
+    assert test_logger is not None
+    yield test_logger  # type: ignore
+
+
+@pytest.fixture()
+def frames() -> "list[bytes]":  # type: ignore
+    """
+    Packed heartbeat and attitude frames.
+    """
+    mav = mavutil.mavlink.MAVLink(None, srcSystem=1)
+    yield [  # type: ignore
+        mavutil.mavlink.MAVLink_heartbeat_message(1, 3, 0, 0, 0, 3).pack(mav),
+        mavutil.mavlink.MAVLink_attitude_message(100, 0.1, 0.2, 0.3, 0, 0, 0).pack(mav),
+        mavutil.mavlink.MAVLink_attitude_message(200, 0.4, 0.5, 0.6, 0, 0, 0).pack(mav),
+    ]
+
+
+def write_recording(
+    path: pathlib.Path,
+    frames: "list[bytes]",
+    period: float,
+    local_logger: logger.Logger,
+    initial_size: int = flight_recorder.DEFAULT_INITIAL_SIZE,
+) -> None:
+    """
+    Record the frames period seconds apart.
+    """
+    result, recorder = flight_recorder.FlightRecorder.create(path, local_logger, initial_size)
+    assert result
+    assert recorder is not None
+
+    for i, frame in enumerate(frames):
+        recorder.record(frame, 10.0 + i * period)
+
+    recorder.close()
+
+
+class TestFlightRecorder:
+    """
+    Recording file format.
+    """
+
+    def test_round_trip(
+        self, tmp_path: pathlib.Path, frames: "list[bytes]", local_logger: logger.Logger
+    ) -> None:
+        """
+        Frames and times are read back as recorded, even after the file grows.
+        """
+        # Setup
+        path = tmp_path / "flight.rec"
+        write_recording(path, frames, 0.5, local_logger, initial_size=32)
+
+        # Run
+        result, recording = flight_recorder.read_recording(path, local_logger)
+
+        # Test
+        assert result
+        assert recording == [(10.0 + i * 0.5, frame) for i, frame in enumerate(frames)]
+
+    def test_not_a_recording(self, tmp_path: pathlib.Path, local_logger: logger.Logger) -> None:
+        """
+        Files without the magic are rejected.
+        """
+        # Setup
+        path = tmp_path / "flight.rec"
+        path.write_bytes(b"not a recording")
+
+        # Run
+        result, recording = flight_recorder.read_recording(path, local_logger)
+
+        # Test
+        assert not result
+        assert recording is None
+
+
+class TestReplayConnection:
+    """
+    Replay of a recording through the mavfile interface.
+    """
+
+    def test_replays_messages(
+        self, tmp_path: pathlib.Path, frames: "list[bytes]", local_logger: logger.Logger
+    ) -> None:
+        """
+        recv_match() returns the recorded messages in order.
+        """
+        # Setup
+        path = tmp_path / "flight.rec"
+        write_recording(path, frames, 0.5, local_logger)
+        result, connection = replay_connection.ReplayConnection.create(
+            path, replay_connection.AS_FAST_AS_POSSIBLE, local_logger
+        )
+        assert result
+        assert connection is not None
+
+        # Run
+        heartbeat = connection.recv_match(type="HEARTBEAT", blocking=True, timeout=1.0)
+        attitude = connection.recv_match(type="ATTITUDE", blocking=True, timeout=1.0)
+        last = connection.recv_match(type="ATTITUDE", blocking=True, timeout=1.0)
+
+        # Test
+        assert heartbeat is not None
+        assert attitude is not None and attitude.time_boot_ms == 100
+        assert last is not None and last.time_boot_ms == 200
+        assert connection.finished
+        assert connection.recv_match(blocking=False) is None
+
+    def test_speed(
+        self, tmp_path: pathlib.Path, frames: "list[bytes]", local_logger: logger.Logger
+    ) -> None:
+        """
+        Frames are spaced by the recorded period divided by the speed.
+        """
+        # Setup
+        path = tmp_path / "flight.rec"
+        write_recording(path, frames, 0.5, local_logger)
+        result, connection = replay_connection.ReplayConnection.create(path, 10.0, local_logger)
+        assert result
+        assert connection is not None
+
+        # Run
+        start = time.monotonic()
+        for _ in frames:
+            assert connection.recv_match(blocking=True, timeout=1.0) is not None
+        elapsed = time.monotonic() - start
+
+        # Test
+        assert 0.09 <= elapsed < 0.5
+
+    def test_captures_sent(
+        self, tmp_path: pathlib.Path, frames: "list[bytes]", local_logger: logger.Logger
+    ) -> None:
+        """
+        Messages sent on the connection are kept for inspection.
+        """
+        # Setup
+        path = tmp_path / "flight.rec"
+        write_recording(path, frames, 0.5, local_logger)
+        result, connection = replay_connection.ReplayConnection.create(
+            path, replay_connection.AS_FAST_AS_POSSIBLE, local_logger
+        )
+        assert result
+        assert connection is not None
+
+        # Run
+        connection.mav.heartbeat_send(6, 8, 0, 0, 0)
+
+        # Test
+        assert len(connection.sent) == 1
+        assert connection.sent[0][5] == mavutil.mavlink.MAVLINK_MSG_ID_HEARTBEAT
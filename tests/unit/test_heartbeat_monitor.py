@@ -0,0 +1,164 @@
+"""
+Test liveness tracking of many heartbeat sources.
+"""
+
+import pytest
+from pymavlink import mavutil
+
+from modules.common.modules.logger import logger
+from modules.heartbeat import heartbeat_monitor
+from modules.heartbeat import link_status
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+class FakeConnection:
+    """
+    Replays a fixed list of messages through recv_match().
+    """
+
+    def __init__(self, messages: "list[mavutil.mavlink.MAVLink_message]") -> None:
+        self.messages = messages
+
+    def recv_match(
+        self,
+        type: "str | None" = None,  # pylint: disable=redefined-builtin
+        blocking: bool = False,
+        timeout: "float | None" = None,
+    ) -> "mavutil.mavlink.MAVLink_message | None":
+        """
+        Next message or None when exhausted.
+        """
+        _ = type, blocking, timeout
+        if len(self.messages) == 0:
+            return None
+
+        return self.messages.pop(0)
+
+
+def make_heartbeat(system: int, component: int) -> mavutil.mavlink.MAVLink_message:
+    """
+    Heartbeat decoded like a received message, so that the source is populated.
+    """
+    mav = mavutil.mavlink.MAVLink(None, srcSystem=system, srcComponent=component)
+    return mav.parse_char(mavutil.mavlink.MAVLink_heartbeat_message(2, 3, 0, 0, 0, 3).pack(mav))
+
+
+@pytest.fixture()
+def local_logger() -> logger.Logger:  # type: ignore
+    """
+    Logger for the monitor.
+    """
+    result, test_logger = logger.Logger.create("test_heartbeat_monitor", False)
+    assert result
+    assert test_logger is not None
+    yield test_logger  # type: ignore
+
+
+@pytest.fixture()
+def monitor(local_logger: logger.Logger) -> heartbeat_monitor.HeartbeatMonitor:  # type: ignore
+    """
+    1 Hz heartbeats, disconnected after 3 seconds.
+    """
+    result, instance = heartbeat_monitor.HeartbeatMonitor.create(
+        FakeConnection([]), local_logger, 1.0, 3.0
+    )
+    assert result
+    assert instance is not None
+    yield instance  # type: ignore
+
+
+class TestHeartbeatMonitor:
+    """
+    Per source connect and disconnect.
+    """
+
+    def test_invalid(self, local_logger: logger.Logger) -> None:
+        """
+        Timing is validated on creation.
+        """
+        # Run
+        result, _ = heartbeat_monitor.HeartbeatMonitor.create(
+            FakeConnection([]), local_logger, 1.0, 0.5
+        )
+
+        # Test
+        assert not result
+
+    def test_independent(self, monitor: heartbeat_monitor.HeartbeatMonitor) -> None:
+        """
+        Only the source that went quiet is disconnected.
+        """
+        # Setup
+        first = monitor.heartbeat((1, 1), 10.0)
+        monitor.heartbeat((2, 1), 10.5)
+        for arrival_time in [11.0, 12.0, 13.0]:
+            monitor.heartbeat((2, 1), arrival_time)
+
+        # Run
+        changes = monitor.poll(13.5)
+
+        # Test
+        assert first is not None
+        assert first.status == link_status.CONNECTED
+        assert [source for source, _ in changes] == [(1, 1)]
+        assert changes[0][1].status == link_status.DISCONNECTED
+        assert changes[0][1].timestamp == 13.0
+        assert monitor.connected() == [(2, 1)]
+
+    def test_refresh(self, monitor: heartbeat_monitor.HeartbeatMonitor) -> None:
+        """
+        A due heap entry of a source heard from since is moved to its new deadline.
+        """
+        # Setup
+        monitor.heartbeat((1, 1), 10.0)
+        monitor.heartbeat((1, 1), 12.0)
+
+        # Run
+        early = monitor.poll(13.0)
+        refreshed = monitor.next_deadline()
+        late = monitor.poll(15.0)
+
+        # Test
+        assert len(early) == 0
+        assert refreshed == 15.0
+        assert [source for source, _ in late] == [(1, 1)]
+        assert monitor.next_deadline() is None
+
+    def test_deadline_order(self, monitor: heartbeat_monitor.HeartbeatMonitor) -> None:
+        """
+        Sources disconnected together are reported in deadline order.
+        """
+        # Setup
+        for system in [3, 1, 2]:
+            monitor.heartbeat((system, 1), 10.0 + system)
+
+        # Run
+        changes = monitor.poll(100.0)
+
+        # Test
+        assert [source for source, _ in changes] == [(1, 1), (2, 1), (3, 1)]
+
+    def test_run(self, local_logger: logger.Logger) -> None:
+        """
+        Heartbeats are attributed to the system and component that sent them.
+        """
+        # Setup
+        connection = FakeConnection([make_heartbeat(1, 1), make_heartbeat(2, 190)])
+        result, instance = heartbeat_monitor.HeartbeatMonitor.create(connection, local_logger)
+        assert result
+        assert instance is not None
+
+        # Run
+        first = instance.run()
+        second = instance.run()
+        repeat = instance.run()
+
+        # Test
+        assert [source for source, _ in first] == [(1, 1)]
+        assert [source for source, _ in second] == [(2, 190)]
+        assert len(repeat) == 0
+        assert sorted(instance.connected()) == [(1, 1), (2, 190)]
@@ -0,0 +1,63 @@
+"""
+Test the fixed bucket histogram.
+"""
+
+import math
+
+from utilities.statistics import histogram
+
+
+class TestHistogram:
+    """
+    Bucketing and percentiles.
+    """
+
+    def test_invalid_bounds(self) -> None:
+        """
+        Bounds must be given and increasing.
+        """
+        # Run
+        empty_result, _ = histogram.Histogram.create([])
+        unsorted_result, _ = histogram.Histogram.create([1.0, 1.0])
+
+        # Test
+        assert not empty_result
+        assert not unsorted_result
+
+    def test_buckets(self) -> None:
+        """
+        Values on a bound are counted in its bucket, larger values overflow.
+        """
+        # Setup
+        result, instance = histogram.Histogram.create([1.0, 2.0])
+        assert result
+        assert instance is not None
+
+        # Run
+        for value in [0.5, 1.0, 1.5, 3.0]:
+            instance.add(value)
+
+        # Test
+        assert instance.counts == [2, 1, 1]
+        assert instance.count == 4
+        assert str(instance) == "<=1: 2, <=2: 1, >2: 1"
+
+    def test_percentile(self) -> None:
+        """
+        Upper bound of the bucket reaching the fraction, maximum in the overflow bucket.
+        """
+        # Setup
+        result, instance = histogram.Histogram.create([1.0, 2.0])
+        assert result
+        assert instance is not None
+
+        # Run
+        empty = instance.percentile(0.5)
+        for value in [0.5, 0.5, 1.5, 7.0]:
+            instance.add(value)
+
+        # Test
+        assert math.isnan(empty)
+        assert instance.percentile(0.5) == 1.0
+        assert instance.percentile(0.75) == 2.0
+        assert instance.percentile(1.0) == 7.0
@@ -0,0 +1,198 @@
+"""
+Test heartbeat sending and receiving in one event loop.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from pymavlink import mavutil
+
+from modules.common.modules.logger import logger
+from modules.heartbeat import heartbeat_receiver
+from modules.heartbeat import heartbeat_sender
+from modules.heartbeat import link_health_service
+from modules.heartbeat import link_status
+from utilities.workers import worker_controller
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+SEND_PERIOD = 0.05  # seconds
+RUN_TIME = 0.3  # seconds
+
+
+class FakeConnection:
+    """
+    Counts the frames written and delivers one heartbeat after a delay.
+    """
+
+    def __init__(self, heartbeat_delay: float) -> None:
+        self.mav = mavutil.mavlink.MAVLink(self)
+        self.writes = 0
+        self.heartbeat_time = time.monotonic() + heartbeat_delay
+
+    def write(self, buf: bytes) -> None:
+        """
+        Count the frame.
+        """
+        _ = buf
+        self.writes += 1
+
+    def recv_match(
+        self,
+        type: "str | None" = None,  # pylint: disable=redefined-builtin
+        blocking: bool = False,
+        timeout: "float | None" = None,
+    ) -> "mavutil.mavlink.MAVLink_message | None":
+        """
+        Wait up to timeout for the heartbeat if it is still to come.
+        """
+        _ = type, blocking
+        deadline = time.monotonic() + timeout
+
+        if self.heartbeat_time is None or self.heartbeat_time > deadline:
+            time.sleep(max(deadline - time.monotonic(), 0.0))
+            return None
+
+        time.sleep(max(self.heartbeat_time - time.monotonic(), 0.0))
+        self.heartbeat_time = None
+        return self.mav.heartbeat_encode(2, 3, 0, 0, 0)
+
+
+class FakeQueue:
+    """
+    Keeps what is put.
+    """
+
+    def __init__(self) -> None:
+        self.items = []
+
+    def put(self, item: object) -> bool:
+        """
+        Keep the item.
+        """
+        self.items.append(item)
+        return True
+
+
+class SlowSender:
+    """
+    Sender whose send waits, like a put on a full link writer queue.
+    """
+
+    def __init__(self) -> None:
+        self.threads = []
+
+    def run(self) -> None:
+        """
+        Record the calling thread and wait.
+        """
+        self.threads.append(threading.current_thread())
+        time.sleep(SEND_PERIOD / 2)
+
+
+@pytest.fixture()
+def local_logger() -> logger.Logger:  # type: ignore
+    """
+    Logger for the service.
+    """
+    result, test_logger = logger.Logger.create("test_link_health_service", False)
+    assert result
+    assert test_logger is not None
+    yield test_logger  # type: ignore
+
+
+class TestLinkHealthService:
+    """
+    Both directions in one event loop.
+    """
+
+    def test_invalid_period(self, local_logger: logger.Logger) -> None:
+        """
+        Send period must be positive.
+        """
+        # Setup
+        connection = FakeConnection(0.0)
+        _, sender = heartbeat_sender.HeartbeatSender.create(connection, local_logger)
+        _, receiver = heartbeat_receiver.HeartbeatReceiver.create(connection, local_logger)
+
+        # Run
+        result, _ = link_health_service.LinkHealthService.create(
+            sender,
+            receiver,
+            link_status.StatusPublisher(FakeQueue(), None),
+            local_logger,
+            send_period=0.0,
+        )
+
+        # Test
+        assert not result
+
+    def test_run(self, local_logger: logger.Logger) -> None:
+        """
+        Heartbeats are sent on time while the receiver connects and disconnects.
+        """
+        # Setup
+        connection = FakeConnection(0.01)
+        _, sender = heartbeat_sender.HeartbeatSender.create(connection, local_logger)
+        _, receiver = heartbeat_receiver.HeartbeatReceiver.create(
+            connection, local_logger, expected_period=SEND_PERIOD, timeout=2 * SEND_PERIOD
+        )
+        output_queue = FakeQueue()
+        result, service = link_health_service.LinkHealthService.create(
+            sender,
+            receiver,
+            link_status.StatusPublisher(output_queue, None),
+            local_logger,
+            send_period=SEND_PERIOD,
+        )
+        assert result
+        assert service is not None
+        controller = worker_controller.WorkerController()
+        threading.Timer(RUN_TIME, controller.request_exit).start()
+
+        # Run
+        asyncio.run(service.run(controller))
+
+        # Test
+        statuses = [change.status for change in output_queue.items]
+        assert statuses == [link_status.CONNECTED, link_status.DISCONNECTED]
+        # Exit is noticed within a poll period plus one receiver wait
+        expected = RUN_TIME / SEND_PERIOD
+        assert expected - 1 <= connection.writes <= expected + 6
+        assert service.pacer.overruns == 0
+
+    def test_send_off_loop(self, local_logger: logger.Logger) -> None:
+        """
+        Sends that wait run outside the event loop's thread.
+        """
+        # Setup
+        connection = FakeConnection(0.01)
+        sender = SlowSender()
+        _, receiver = heartbeat_receiver.HeartbeatReceiver.create(
+            connection, local_logger, expected_period=SEND_PERIOD, timeout=2 * SEND_PERIOD
+        )
+        result, service = link_health_service.LinkHealthService.create(
+            sender,
+            receiver,
+            link_status.StatusPublisher(FakeQueue(), None),
+            local_logger,
+            send_period=SEND_PERIOD,
+        )
+        assert result
+        assert service is not None
+        controller = worker_controller.WorkerController()
+        threading.Timer(RUN_TIME, controller.request_exit).start()
+
+        # Run
+        asyncio.run(service.run(controller))
+
+        # Test
+        assert len(sender.threads) > 0
+        assert threading.current_thread() not in sender.threads
+        assert service.pacer.overruns == 0
@@ -0,0 +1,126 @@
+"""
+Test the link quality measurements.
+"""
+
+import math
+import time
+
+import pytest
+from pymavlink import mavutil
+
+from modules.common.modules.logger import logger
+from modules.heartbeat import link_quality
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+@pytest.fixture()
+def local_logger() -> logger.Logger:  # type: ignore
+    """
+    Logger for the measurements.
+    """
+    result, test_logger = logger.Logger.create("test_link_quality", False)
+    assert result
+    assert test_logger is not None
+    yield test_logger  # type: ignore
+
+
+@pytest.fixture()
+def quality(local_logger: logger.Logger) -> link_quality.LinkQuality:  # type: ignore
+    """
+    Measurements of a 1 Hz link.
+    """
+    result, instance = link_quality.LinkQuality.create(local_logger, 1.0)
+    assert result
+    assert instance is not None
+    yield instance  # type: ignore
+
+
+@pytest.fixture()
+def shared(local_logger: logger.Logger) -> link_quality.SharedLinkQuality:  # type: ignore
+    """
+    Unmeasured shared figures.
+    """
+    result, instance = link_quality.SharedLinkQuality.create(local_logger)
+    assert result
+    assert instance is not None
+    yield instance  # type: ignore
+
+
+class TestLinkQuality:
+    """
+    Jitter, round trip time and loss.
+    """
+
+    def test_jitter(self, quality: link_quality.LinkQuality) -> None:
+        """
+        Jitter is the deviation of the interval from the period, not over a disconnect.
+        """
+        # Run
+        for arrival_time in [10.0, 11.1, 12.0, 13.25]:
+            quality.heartbeat(arrival_time)
+        quality.reset()
+        quality.heartbeat(30.0)
+
+        # Test
+        assert len(quality.jitter) == 3
+        assert math.isclose(quality.jitter.percentile(1.0), 0.25)
+        assert math.isclose(quality.jitter.percentile(0.5), 0.1)
+
+    def test_timesync(self, quality: link_quality.LinkQuality) -> None:
+        """
+        Responses to the requests are timed, requests from the other end are not.
+        """
+        # Setup
+        mav = mavutil.mavlink.MAVLink(None)
+        request = link_quality.timesync_request(mav)
+        response = mav.timesync_encode(123, request.ts1)
+
+        # Run
+        ignored = quality.timesync(request, time.monotonic())
+        timed = quality.timesync(response, request.ts1 / 1e9 + 0.05)
+
+        # Test
+        assert request.tc1 == 0
+        assert not ignored
+        assert timed
+        assert math.isclose(quality.round_trip.percentile(0.5), 0.05, abs_tol=1e-6)
+
+    def test_publish(
+        self, quality: link_quality.LinkQuality, shared: link_quality.SharedLinkQuality
+    ) -> None:
+        """
+        Percentiles are written, unmeasured figures stay NaN.
+        """
+        # Setup
+        quality.heartbeat(10.0)
+        quality.heartbeat(11.5)
+
+        # Run
+        before = shared.read()
+        quality.publish(shared)
+        after = shared.read()
+
+        # Test
+        assert all(math.isnan(value) for value in before.values())
+        assert math.isclose(after["jitter_p99"], 0.5)
+        assert math.isnan(after["rtt_p50"])
+
+    def test_loss(self, shared: link_quality.SharedLinkQuality) -> None:
+        """
+        Loss rate covers the interval since the previous update.
+        """
+        # Run
+        shared.update_loss(90, 10)
+        first = shared.read()
+        shared.update_loss(190, 10)
+        second = shared.read()
+
+        # Test
+        assert math.isclose(first["loss_rate"], 0.1)
+        assert second["loss_rate"] == 0.0
+        assert second["received"] == 190
+        assert second["lost"] == 10
@@ -0,0 +1,170 @@
+"""
+Test routing of messages from the link reader to subscribers.
+"""
+
+import multiprocessing as mp
+
+import pytest
+from pymavlink import mavutil
+
+from modules.common.modules.logger import logger
+from modules.link import link_reader
+from modules.link import queue_connection
+from utilities.workers import queue_proxy_wrapper
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+class FakeConnection:
+    """
+    Replays a fixed list of messages through recv_match().
+    """
+
+    def __init__(self, messages: "list[mavutil.mavlink.MAVLink_message]") -> None:
+        self.messages = messages
+
+    def recv_match(
+        self, blocking: bool = False, timeout: "float | None" = None
+    ) -> "mavutil.mavlink.MAVLink_message | None":
+        """
+        Next message or None when exhausted.
+        """
+        _ = blocking, timeout
+        if len(self.messages) == 0:
+            return None
+
+        return self.messages.pop(0)
+
+
+def is_from_system_1(msg: mavutil.mavlink.MAVLink_message) -> bool:
+    """
+    Subscription condition used by the tests.
+    """
+    return msg.get_srcSystem() == 1
+
+
+def make_message(
+    mav: mavutil.mavlink.MAVLink, msg: mavutil.mavlink.MAVLink_message
+) -> mavutil.mavlink.MAVLink_message:
+    """
+    Pack and decode so that the header fields are populated like a received message.
+    """
+    return mav.parse_char(msg.pack(mav))
+
+
+@pytest.fixture()
+def mp_manager() -> mp.managers.SyncManager:  # type: ignore
+    """
+    Manager for the subscriber queues.
+    """
+    manager = mp.Manager()
+    yield manager  # type: ignore
+    manager.shutdown()
+
+
+@pytest.fixture()
+def local_logger() -> logger.Logger:  # type: ignore
+    """
+    Logger for the link reader.
+    """
+    result, test_logger = logger.Logger.create("test_link_reader", False)
+    assert result
+    assert test_logger is not None
+    yield test_logger  # type: ignore
+
+
+class TestLinkReader:
+    """
+    Routing by message type and condition.
+    """
+
+    def test_route_by_type(
+        self, mp_manager: mp.managers.SyncManager, local_logger: logger.Logger
+    ) -> None:
+        """
+        Each message only reaches the subscribers of its type.
+        """
+        # Setup
+        mav = mavutil.mavlink.MAVLink(None, srcSystem=1)
+        messages = [
+            make_message(mav, mavutil.mavlink.MAVLink_heartbeat_message(1, 3, 0, 0, 0, 3)),
+            make_message(mav, mavutil.mavlink.MAVLink_attitude_message(100, 0, 0, 1, 0, 0, 0)),
+        ]
+        heartbeat_queue = queue_proxy_wrapper.QueueProxyWrapper(mp_manager)
+        telemetry_queue = queue_proxy_wrapper.QueueProxyWrapper(mp_manager)
+        result, reader = link_reader.LinkReader.create(
+            FakeConnection(messages),
+            [
+                link_reader.Subscription(["HEARTBEAT"], heartbeat_queue),
+                link_reader.Subscription(["ATTITUDE", "LOCAL_POSITION_NED"], telemetry_queue),
+            ],
+            local_logger,
+        )
+        assert result
+        assert reader is not None
+
+        # Run
+        while reader.run():
+            pass
+
+        # Test
+        assert heartbeat_queue.queue.get_nowait().get_type() == "HEARTBEAT"
+        assert telemetry_queue.queue.get_nowait().get_type() == "ATTITUDE"
+        assert heartbeat_queue.queue.empty()
+        assert telemetry_queue.queue.empty()
+
+    def test_condition(
+        self, mp_manager: mp.managers.SyncManager, local_logger: logger.Logger
+    ) -> None:
+        """
+        Messages rejected by the condition are not delivered.
+        """
+        # Setup
+        mav_1 = mavutil.mavlink.MAVLink(None, srcSystem=1)
+        mav_2 = mavutil.mavlink.MAVLink(None, srcSystem=2)
+        messages = [
+            make_message(mav_2, mavutil.mavlink.MAVLink_heartbeat_message(1, 3, 0, 0, 0, 3)),
+            make_message(mav_1, mavutil.mavlink.MAVLink_heartbeat_message(1, 3, 0, 0, 0, 3)),
+        ]
+        heartbeat_queue = queue_proxy_wrapper.QueueProxyWrapper(mp_manager)
+        result, reader = link_reader.LinkReader.create(
+            FakeConnection(messages),
+            [link_reader.Subscription(["HEARTBEAT"], heartbeat_queue, is_from_system_1)],
+            local_logger,
+        )
+        assert result
+        assert reader is not None
+
+        # Run
+        while reader.run():
+            pass
+
+        # Test
+        assert heartbeat_queue.queue.get_nowait().get_srcSystem() == 1
+        assert heartbeat_queue.queue.empty()
+
+    def test_queue_connection_filters_type(self, mp_manager: mp.managers.SyncManager) -> None:
+        """
+        The queue connection discards messages of other types like mavfile does.
+        """
+        # Setup
+        mav = mavutil.mavlink.MAVLink(None, srcSystem=1)
+        input_queue = queue_proxy_wrapper.QueueProxyWrapper(mp_manager)
+        input_queue.queue.put(
+            make_message(mav, mavutil.mavlink.MAVLink_heartbeat_message(1, 3, 0, 0, 0, 3))
+        )
+        input_queue.queue.put(
+            make_message(mav, mavutil.mavlink.MAVLink_attitude_message(100, 0, 0, 1, 0, 0, 0))
+        )
+        connection = queue_connection.QueueConnection(input_queue)
+
+        # Run
+        msg = connection.recv_match(type="ATTITUDE", blocking=True, timeout=1.0)
+
+        # Test
+        assert msg is not None
+        assert msg.get_type() == "ATTITUDE"
+        assert connection.recv_match(blocking=False) is None
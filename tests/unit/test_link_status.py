@@ -0,0 +1,84 @@
+"""
+Test the shared link status word.
+"""
+
+import multiprocessing as mp
+
+import pytest
+
+from modules.common.modules.logger import logger
+from modules.heartbeat import link_status
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+def read_status(status: link_status.LinkStatus, output: "mp.Queue") -> None:
+    """
+    Child process reporting what it reads.
+    """
+    output.put((status.is_connected(), status.transitions()))
+
+
+@pytest.fixture()
+def status() -> link_status.LinkStatus:  # type: ignore
+    """
+    Disconnected link status.
+    """
+    result, test_logger = logger.Logger.create("test_link_status", False)
+    assert result
+    assert test_logger is not None
+
+    result, instance = link_status.LinkStatus.create(test_logger)
+    assert result
+    assert instance is not None
+    yield instance  # type: ignore
+
+
+class TestLinkStatus:
+    """
+    Publishing and reading the status.
+    """
+
+    def test_transitions(self, status: link_status.LinkStatus) -> None:
+        """
+        Only changes are counted.
+        """
+        # Run
+        status.publish(False)
+        status.publish(True)
+        status.publish(True)
+        status.publish(False)
+
+        # Test
+        assert not status.is_connected()
+        assert status.transitions() == 2
+
+    def test_other_process(self, status: link_status.LinkStatus) -> None:
+        """
+        A worker process sees the published status.
+        """
+        # Setup
+        status.publish(True)
+        output = mp.Queue()
+        worker = mp.Process(target=read_status, args=(status, output))
+
+        # Run
+        worker.start()
+        actual = output.get(timeout=5)
+        worker.join()
+
+        # Test
+        assert actual == (True, 1)
+
+    def test_status_change(self) -> None:
+        """
+        Changes print with their time.
+        """
+        # Run
+        actual = str(link_status.StatusChange(link_status.CONNECTED, 12.3456))
+
+        # Test
+        assert actual == "Connected at 12.346"
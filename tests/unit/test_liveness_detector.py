@@ -0,0 +1,185 @@
+"""
+Test link liveness from heartbeat arrival times.
+"""
+
+import time
+
+import pytest
+from pymavlink import mavutil
+
+from modules.common.modules.logger import logger
+from modules.heartbeat import heartbeat_receiver
+from modules.heartbeat import liveness_detector
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+class FakeConnection:
+    """
+    Delivers heartbeats at scheduled times through recv_match().
+    """
+
+    def __init__(self, arrival_times: "list[float]") -> None:
+        self.arrival_times = arrival_times
+        self.waits = []
+
+    def recv_match(
+        self,
+        type: "str | None" = None,  # pylint: disable=redefined-builtin
+        blocking: bool = False,
+        timeout: "float | None" = None,
+    ) -> "mavutil.mavlink.MAVLink_message | None":
+        """
+        Wait up to timeout for the next scheduled heartbeat.
+        """
+        _ = type, blocking
+        self.waits.append(timeout)
+        deadline = time.monotonic() + timeout
+
+        if len(self.arrival_times) == 0 or self.arrival_times[0] > deadline:
+            time.sleep(max(deadline - time.monotonic(), 0.0))
+            return None
+
+        time.sleep(max(self.arrival_times.pop(0) - time.monotonic(), 0.0))
+        return mavutil.mavlink.MAVLink_heartbeat_message(1, 3, 0, 0, 0, 3)
+
+
+@pytest.fixture()
+def local_logger() -> logger.Logger:  # type: ignore
+    """
+    Logger for the detector.
+    """
+    result, test_logger = logger.Logger.create("test_liveness_detector", False)
+    assert result
+    assert test_logger is not None
+    yield test_logger  # type: ignore
+
+
+@pytest.fixture()
+def detector(local_logger: logger.Logger) -> liveness_detector.LivenessDetector:  # type: ignore
+    """
+    1 Hz heartbeats, disconnected after 3 seconds.
+    """
+    result, instance = liveness_detector.LivenessDetector.create(local_logger, 1.0, 3.0)
+    assert result
+    assert instance is not None
+    yield instance  # type: ignore
+
+
+class TestLivenessDetector:
+    """
+    Connect and disconnect transitions.
+    """
+
+    def test_invalid(self, local_logger: logger.Logger) -> None:
+        """
+        The period must be positive and no longer than the timeout.
+        """
+        # Run
+        period_result, _ = liveness_detector.LivenessDetector.create(local_logger, 0.0, 1.0)
+        timeout_result, _ = liveness_detector.LivenessDetector.create(local_logger, 1.0, 0.5)
+
+        # Test
+        assert not period_result
+        assert not timeout_result
+
+    def test_connect(self, detector: liveness_detector.LivenessDetector) -> None:
+        """
+        The first heartbeat connects, the following ones do not transition.
+        """
+        # Run
+        first = detector.heartbeat(10.0)
+        second = detector.heartbeat(11.0)
+
+        # Test
+        assert first
+        assert not second
+        assert detector.connected
+        assert detector.deadline() == 14.0
+
+    def test_disconnect_at_deadline(self, detector: liveness_detector.LivenessDetector) -> None:
+        """
+        Disconnects exactly once, at the timeout after the last heartbeat.
+        """
+        # Setup
+        detector.heartbeat(10.0)
+
+        # Run
+        before = detector.poll(12.99)
+        at = detector.poll(13.0)
+        after = detector.poll(20.0)
+
+        # Test
+        assert not before
+        assert at
+        assert not after
+        assert not detector.connected
+        assert detector.deadline() is None
+        assert detector.disconnects == 1
+
+    def test_late_and_stale(self, detector: liveness_detector.LivenessDetector) -> None:
+        """
+        A heartbeat within the timeout but after the period is late, older ones are ignored.
+        """
+        # Setup
+        detector.heartbeat(10.0)
+
+        # Run
+        detector.heartbeat(12.0)
+        detector.heartbeat(11.0)
+
+        # Test
+        assert detector.late == 1
+        assert detector.last_arrival == 12.0
+        assert detector.missed(14.5) == 2
+
+    def test_reconnect(self, detector: liveness_detector.LivenessDetector) -> None:
+        """
+        A heartbeat after a disconnect connects again.
+        """
+        # Setup
+        detector.heartbeat(10.0)
+        detector.poll(13.0)
+
+        # Run
+        result = detector.heartbeat(20.0)
+
+        # Test
+        assert result
+        assert detector.connects == 2
+        assert detector.late == 0
+
+
+class TestHeartbeatReceiver:
+    """
+    Disconnect latency of the receiver.
+    """
+
+    def test_subsecond_disconnect(self, local_logger: logger.Logger) -> None:
+        """
+        With a 0.1 second timeout the disconnect is reported within a few milliseconds of it.
+        """
+        # Setup
+        start = time.monotonic()
+        connection = FakeConnection([start + 0.01, start + 0.06])
+        result, receiver = heartbeat_receiver.HeartbeatReceiver.create(
+            connection, local_logger, expected_period=0.05, timeout=0.1
+        )
+        assert result
+        assert receiver is not None
+
+        # Run
+        statuses = []
+        while len(statuses) == 0 or statuses[-1] == "Connected":
+            statuses.append(receiver.run())
+        elapsed = time.monotonic() - start
+
+        # Test
+        assert statuses[0] == "Connected"
+        assert statuses[-1] == "Disconnected"
+        # Last heartbeat at 0.06, timeout of 0.1
+        assert 0.16 <= elapsed < 0.2
+        assert max(connection.waits) <= 0.05 + 1e-9
@@ -0,0 +1,342 @@
+"""
+Test the outbound send stage.
+"""
+
+import multiprocessing as mp
+import threading
+
+import pytest
+from pymavlink import mavutil
+
+from modules.common.modules.logger import logger
+from modules.link import outbound_sender
+from utilities.workers import queue_proxy_wrapper
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+class FakeConnection:
+    """
+    Decodes what is written to it, optionally stalling or failing like a socket.
+    """
+
+    def __init__(self) -> None:
+        self.mav = mavutil.mavlink.MAVLink(self)
+        self.parser = mavutil.mavlink.MAVLink(None)
+        self.received = []
+        self.writes = 0
+        self.unstalled = threading.Event()
+        self.unstalled.set()
+        self.writing = threading.Event()
+        self.error = None
+
+    def write(self, buf: bytes) -> None:
+        """
+        Decode the frame.
+        """
+        self.writing.set()
+        self.unstalled.wait()
+        if self.error is not None:
+            raise self.error
+
+        self.writes += 1
+        self.received.extend(self.parser.parse_buffer(buf))
+
+
+def heartbeat(mav: mavutil.mavlink.MAVLink) -> mavutil.mavlink.MAVLink_message:
+    """
+    GCS heartbeat.
+    """
+    return mav.heartbeat_encode(
+        mavutil.mavlink.MAV_TYPE_GCS, mavutil.mavlink.MAV_AUTOPILOT_INVALID, 0, 0, 0
+    )
+
+
+@pytest.fixture()
+def local_logger() -> logger.Logger:  # type: ignore
+    """
+    Logger for the sender.
+    """
+    result, test_logger = logger.Logger.create("test_outbound_sender", False)
+    assert result
+    assert test_logger is not None
+    yield test_logger  # type: ignore
+
+
+def create_sender(
+    connection: FakeConnection, local_logger: logger.Logger, maxsize: int = 8
+) -> outbound_sender.OutboundSender:
+    """
+    Sender writing to the connection.
+    """
+    result, sender = outbound_sender.OutboundSender.create(connection, local_logger, maxsize)
+    assert result
+    assert sender is not None
+    return sender
+
+
+class TestOutboundSender:
+    """
+    Ordering, completion and back pressure.
+    """
+
+    def test_in_order(self, local_logger: logger.Logger) -> None:
+        """
+        Messages are written in submission order with consecutive sequence numbers.
+        """
+        # Setup
+        connection = FakeConnection()
+        sender = create_sender(connection, local_logger)
+
+        # Run
+        for _ in range(5):
+            result, _ = sender.submit(heartbeat(connection.mav))
+            assert result
+        sender.close()
+
+        # Test
+        assert [msg.get_seq() for msg in connection.received] == [0, 1, 2, 3, 4]
+        assert sender.sent == 5
+
+    def test_coalesce_queued(self, local_logger: logger.Logger) -> None:
+        """
+        Frames queued while a write is in progress share the next write.
+        """
+        # Setup
+        connection = FakeConnection()
+        connection.unstalled.clear()
+        sender = create_sender(connection, local_logger)
+
+        # Run
+        sender.submit(heartbeat(connection.mav))
+        assert connection.writing.wait(1.0)
+        for _ in range(4):
+            sender.submit(heartbeat(connection.mav))
+        connection.unstalled.set()
+        sender.close()
+
+        # Test
+        assert len(connection.received) == 5
+        assert connection.writes == 2
+        assert sender.writes == 2
+        assert sender.frames_per_write.counts[:3] == [1, 0, 1]  # 1 frame, then 4
+
+    def test_flush_window(self, local_logger: logger.Logger) -> None:
+        """
+        Frames submitted within the window share a write, the byte threshold cuts it short.
+        """
+        # Setup
+        connection = FakeConnection()
+        frame_size = len(heartbeat(mavutil.mavlink.MAVLink(None)).pack(connection.parser))
+        result, sender = outbound_sender.OutboundSender.create(
+            connection, local_logger, flush_window=0.2, flush_bytes=3 * frame_size
+        )
+        assert result
+        assert sender is not None
+
+        # Run
+        for _ in range(4):
+            sender.submit(heartbeat(connection.mav))
+        sender.close()
+
+        # Test
+        assert len(connection.received) == 4
+        assert connection.writes == 2
+
+    def test_future(self, local_logger: logger.Logger) -> None:
+        """
+        The future completes once written, or with the write error.
+        """
+        # Setup
+        connection = FakeConnection()
+        sender = create_sender(connection, local_logger)
+
+        # Run
+        _, written = sender.submit(heartbeat(connection.mav), with_future=True)
+        written.result(timeout=1.0)
+        connection.error = ConnectionResetError("reset")
+        _, failed = sender.submit(heartbeat(connection.mav), with_future=True)
+        sender.close()
+
+        # Test
+        assert written.done()
+        assert isinstance(failed.exception(timeout=1.0), ConnectionResetError)
+        assert sender.failed == 1
+
+    def test_full(self, local_logger: logger.Logger) -> None:
+        """
+        submit() does not block on a stalled socket, it rejects once the queue is full.
+        """
+        # Setup
+        connection = FakeConnection()
+        connection.unstalled.clear()
+        sender = create_sender(connection, local_logger, maxsize=2)
+
+        # Run
+        results = [sender.submit(heartbeat(connection.mav))[0] for _ in range(5)]
+        connection.unstalled.set()
+        sender.close()
+
+        # Test
+        # The queue holds two heartbeats, the writer may already hold a third
+        assert results[:2] == [True, True]
+        assert results[-1] is False
+        assert sender.dropped == results.count(False)
+        assert sender.sent == results.count(True)
+
+    def test_priority(self, local_logger: logger.Logger) -> None:
+        """
+        Heartbeats and commands overtake a bulk backlog.
+        """
+        # Setup
+        connection = FakeConnection()
+        connection.unstalled.clear()
+        sender = create_sender(connection, local_logger)
+        bulk = [connection.mav.param_request_list_encode(1, 0) for _ in range(3)]
+        command = connection.mav.command_long_encode(
+            1, 0, mavutil.mavlink.MAV_CMD_CONDITION_YAW, 0, 10, 5, -1, 1, 0, 0, 0
+        )
+
+        # Run
+        sender.submit(bulk[0])
+        assert connection.writing.wait(1.0)  # Writer is stuck on the first message
+        sender.submit(bulk[1])
+        sender.submit(bulk[2])
+        sender.submit(command)
+        sender.submit(heartbeat(connection.mav))
+        connection.unstalled.set()
+        sender.close()
+
+        # Test
+        assert [msg.get_type() for msg in connection.received] == [
+            "PARAM_REQUEST_LIST",
+            "HEARTBEAT",
+            "COMMAND_LONG",
+            "PARAM_REQUEST_LIST",
+            "PARAM_REQUEST_LIST",
+        ]
+
+    def test_no_starvation(self, local_logger: logger.Logger) -> None:
+        """
+        Bulk traffic gets its share of every round.
+        """
+        # Setup
+        connection = FakeConnection()
+        connection.unstalled.clear()
+        result, sender = outbound_sender.OutboundSender.create(
+            connection, local_logger, 16, (2, 1, 1)
+        )
+        assert result
+        assert sender is not None
+
+        # Run
+        sender.submit(connection.mav.param_request_list_encode(1, 0))
+        assert connection.writing.wait(1.0)
+        for _ in range(6):
+            sender.submit(heartbeat(connection.mav))
+        sender.submit(connection.mav.param_request_list_encode(1, 0))
+        connection.unstalled.set()
+        sender.close()
+
+        # Test
+        # The first round's bulk share went to the first message
+        assert [msg.get_type() for msg in connection.received][1:] == [
+            "HEARTBEAT",
+            "HEARTBEAT",
+            "HEARTBEAT",
+            "HEARTBEAT",
+            "PARAM_REQUEST_LIST",
+            "HEARTBEAT",
+            "HEARTBEAT",
+        ]
+
+    def test_command_long_encoded(self, local_logger: logger.Logger) -> None:
+        """
+        COMMAND_LONG from cached frames is written byte for byte as mav.send() would.
+        """
+        # Setup
+        connection = FakeConnection()
+        sender = create_sender(connection, local_logger)
+        reference = mavutil.mavlink.MAVLink(None)
+        messages = [
+            heartbeat(connection.mav),
+            connection.mav.command_long_encode(
+                1, 0, mavutil.mavlink.MAV_CMD_CONDITION_YAW, 0, 12.5, 5, -1, 1, 0, 0, 0
+            ),
+            connection.mav.command_long_encode(
+                1, 0, mavutil.mavlink.MAV_CMD_CONDITION_YAW, 0, -3.0, 5, 1, 1, 0, 0, 0
+            ),
+        ]
+        expected = b""
+        for msg in messages:
+            expected += msg.pack(reference)
+            reference.seq += 1
+
+        # Run
+        for msg in messages:
+            sender.submit(msg)
+        sender.close()
+
+        # Test
+        assert b"".join(msg.get_msgbuf() for msg in connection.received) == expected
+        assert connection.mav.seq == 3
+
+
+class TestClassify:
+    """
+    Default traffic classes.
+    """
+
+    def test_classify(self) -> None:
+        """
+        Heartbeats and safety commands are critical, other commands control, the rest bulk.
+        """
+        # Setup
+        mav = mavutil.mavlink.MAVLink(None)
+        land = mav.command_long_encode(
+            1, 0, mavutil.mavlink.MAV_CMD_NAV_LAND, 0, 0, 0, 0, 0, 0, 0, 0
+        )
+        yaw = mav.command_long_encode(
+            1, 0, mavutil.mavlink.MAV_CMD_CONDITION_YAW, 0, 0, 0, 0, 0, 0, 0, 0
+        )
+
+        # Test
+        assert outbound_sender.classify(heartbeat(mav)) == outbound_sender.Priority.CRITICAL
+        assert outbound_sender.classify(land) == outbound_sender.Priority.CRITICAL
+        assert outbound_sender.classify(yaw) == outbound_sender.Priority.CONTROL
+        assert (
+            outbound_sender.classify(mav.param_request_list_encode(1, 0))
+            == outbound_sender.Priority.BULK
+        )
+
+
+class TestQueueSender:
+    """
+    Forwarding to the link writer's queue.
+    """
+
+    def test_full_keeps_queued(self) -> None:
+        """
+        A full blocking queue rejects the new message after the timeout and keeps the
+        queued heartbeat.
+        """
+        # Setup
+        mp_manager = mp.Manager()
+        output_queue = queue_proxy_wrapper.QueueProxyWrapper(mp_manager, 1)
+        sender = outbound_sender.QueueSender(output_queue, timeout=0.01)
+        mav = mavutil.mavlink.MAVLink(None)
+
+        # Run
+        first, _ = sender.submit(heartbeat(mav))
+        second, _ = sender.submit(mav.param_request_list_encode(1, 0))
+        msg, priority = output_queue.queue.get_nowait()
+        mp_manager.shutdown()
+
+        # Test
+        assert first
+        assert not second
+        assert msg.get_type() == "HEARTBEAT"
+        assert priority is None
@@ -0,0 +1,252 @@
+"""
+Test the overflow policies and batch operations of the queue wrapper.
+"""
+
+import multiprocessing as mp
+
+import pytest
+
+from utilities.workers import queue_proxy_wrapper
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+@pytest.fixture(scope="module")
+def mp_manager() -> mp.managers.SyncManager:  # type: ignore
+    """
+    Manager for the queues.
+    """
+    manager = mp.Manager()
+    yield manager  # type: ignore
+    manager.shutdown()
+
+
+@pytest.fixture(scope="module")
+def batch_manager() -> queue_proxy_wrapper.QueueManager:  # type: ignore
+    """
+    Manager for queues with batch operations.
+    """
+    manager = queue_proxy_wrapper.QueueManager()
+    manager.start()  # pylint: disable=consider-using-with
+    yield manager  # type: ignore
+    manager.shutdown()
+
+
+def drain(wrapper: queue_proxy_wrapper.QueueProxyWrapper) -> "list[object]":
+    """
+    Everything currently in the queue.
+    """
+    items = []
+    while not wrapper.queue.empty():
+        items.append(wrapper.queue.get_nowait())
+
+    return items
+
+
+class TestOverflowPolicy:
+    """
+    Behaviour of put() on a full queue.
+    """
+
+    def test_block_timeout(self, mp_manager: mp.managers.SyncManager) -> None:
+        """
+        Blocking put gives up after the timeout.
+        """
+        # Setup
+        wrapper = queue_proxy_wrapper.QueueProxyWrapper(mp_manager, 1)
+        wrapper.put(1)
+
+        # Run
+        actual = wrapper.put(2, timeout=0.01)
+
+        # Test
+        assert not actual
+        assert wrapper.dropped == 1
+        assert drain(wrapper) == [1]
+
+    def test_drop_newest(self, mp_manager: mp.managers.SyncManager) -> None:
+        """
+        New items are discarded.
+        """
+        # Setup
+        wrapper = queue_proxy_wrapper.QueueProxyWrapper(
+            mp_manager, 2, queue_proxy_wrapper.OverflowPolicy.DROP_NEWEST
+        )
+
+        # Run
+        results = [wrapper.put(i) for i in range(4)]
+
+        # Test
+        assert results == [True, True, False, False]
+        assert wrapper.dropped == 2
+        assert drain(wrapper) == [0, 1]
+
+    def test_drop_oldest(self, mp_manager: mp.managers.SyncManager) -> None:
+        """
+        Old items make space for new ones.
+        """
+        # Setup
+        wrapper = queue_proxy_wrapper.QueueProxyWrapper(
+            mp_manager, 2, queue_proxy_wrapper.OverflowPolicy.DROP_OLDEST
+        )
+
+        # Run
+        results = [wrapper.put(i) for i in range(4)]
+
+        # Test
+        assert results == [True, True, True, True]
+        assert wrapper.dropped == 2
+        assert drain(wrapper) == [2, 3]
+
+    def test_conflate(self, mp_manager: mp.managers.SyncManager) -> None:
+        """
+        Only the latest item is kept, regardless of the requested size.
+        """
+        # Setup
+        wrapper = queue_proxy_wrapper.QueueProxyWrapper(
+            mp_manager, 5, queue_proxy_wrapper.OverflowPolicy.CONFLATE
+        )
+
+        # Run
+        for i in range(3):
+            wrapper.put(i)
+
+        # Test
+        assert wrapper.maxsize == 1
+        assert wrapper.dropped == 2
+        assert drain(wrapper) == [2]
+
+
+class TestBatch:
+    """
+    put_many() and get_many(), in one round trip or falling back to one per item.
+    """
+
+    @pytest.mark.parametrize("batched", [True, False])
+    def test_round_trip(
+        self,
+        batched: bool,
+        mp_manager: mp.managers.SyncManager,
+        batch_manager: queue_proxy_wrapper.QueueManager,
+    ) -> None:
+        """
+        Items come out in order, limited to max_items.
+        """
+        # Setup
+        wrapper = queue_proxy_wrapper.QueueProxyWrapper(
+            batch_manager if batched else mp_manager, 10
+        )
+
+        # Run
+        count = wrapper.put_many([0, 1, 2, 3, 4])
+        first = wrapper.get_many(3)
+        rest = wrapper.get_many(3)
+        empty = wrapper.get_many(3, timeout=0.01)
+
+        # Test
+        assert count == 5
+        assert first == [0, 1, 2]
+        assert rest == [3, 4]
+        assert len(empty) == 0
+
+    @pytest.mark.parametrize("batched", [True, False])
+    def test_block_timeout(
+        self,
+        batched: bool,
+        mp_manager: mp.managers.SyncManager,
+        batch_manager: queue_proxy_wrapper.QueueManager,
+    ) -> None:
+        """
+        Items that do not fit before the timeout are dropped.
+        """
+        # Setup
+        wrapper = queue_proxy_wrapper.QueueProxyWrapper(batch_manager if batched else mp_manager, 2)
+
+        # Run
+        count = wrapper.put_many([0, 1, 2, 3], timeout=0.01)
+
+        # Test
+        assert count == 2
+        assert wrapper.dropped == 2
+        assert drain(wrapper) == [0, 1]
+
+    def test_drop_newest(self, batch_manager: queue_proxy_wrapper.QueueManager) -> None:
+        """
+        Items after the queue fills are discarded.
+        """
+        # Setup
+        wrapper = queue_proxy_wrapper.QueueProxyWrapper(
+            batch_manager, 2, queue_proxy_wrapper.OverflowPolicy.DROP_NEWEST
+        )
+
+        # Run
+        count = wrapper.put_many([0, 1, 2, 3])
+
+        # Test
+        assert count == 2
+        assert wrapper.dropped == 2
+        assert drain(wrapper) == [0, 1]
+
+    @pytest.mark.parametrize("batched", [True, False])
+    def test_drop_oldest(
+        self,
+        batched: bool,
+        mp_manager: mp.managers.SyncManager,
+        batch_manager: queue_proxy_wrapper.QueueManager,
+    ) -> None:
+        """
+        The newest items are kept, including over earlier ones of the same batch.
+        """
+        # Setup
+        wrapper = queue_proxy_wrapper.QueueProxyWrapper(
+            batch_manager if batched else mp_manager,
+            2,
+            queue_proxy_wrapper.OverflowPolicy.DROP_OLDEST,
+        )
+        wrapper.put(0)
+
+        # Run
+        count = wrapper.put_many([1, 2, 3])
+
+        # Test
+        assert count == 3
+        assert wrapper.dropped == 2
+        assert drain(wrapper) == [2, 3]
+
+    def test_shared_memory(self) -> None:
+        """
+        The shared memory backend falls back to one call per item.
+        """
+        # Setup
+        wrapper = queue_proxy_wrapper.QueueProxyWrapper(
+            None, 4, backend=queue_proxy_wrapper.QueueBackend.SHARED_MEMORY
+        )
+
+        # Run
+        count = wrapper.put_many(["a", "b"])
+        actual = wrapper.get_many(4, timeout=0.01)
+        wrapper.close()
+
+        # Test
+        assert count == 2
+        assert actual == ["a", "b"]
+
+    def test_fill_and_drain(self, batch_manager: queue_proxy_wrapper.QueueManager) -> None:
+        """
+        Sentinels fill the queue and draining empties it.
+        """
+        # Setup
+        wrapper = queue_proxy_wrapper.QueueProxyWrapper(batch_manager, 3)
+        wrapper.put(1)
+
+        # Run
+        wrapper.fill_queue_with_sentinel()
+        full = wrapper.queue.qsize()
+        wrapper.drain_queue()
+
+        # Test
+        assert full == 3
+        assert wrapper.queue.empty()
@@ -0,0 +1,76 @@
+"""
+Test the fixed rate loop pacing.
+"""
+
+import time
+
+from utilities.workers import rate_loop
+
+
+PERIOD = 0.02  # seconds
+
+
+def create_loop(period: float = PERIOD) -> rate_loop.RateLoop:
+    """
+    Loop with the given period.
+    """
+    result, instance = rate_loop.RateLoop.create(period)
+    assert result
+    assert instance is not None
+    return instance
+
+
+class TestRateLoop:
+    """
+    Deadline scheduling and overrun accounting.
+    """
+
+    def test_invalid_period(self) -> None:
+        """
+        Period must be positive.
+        """
+        # Run
+        result, _ = rate_loop.RateLoop.create(0.0)
+
+        # Test
+        assert not result
+
+    def test_no_drift(self) -> None:
+        """
+        Work shorter than the period does not stretch it.
+        """
+        # Setup
+        instance = create_loop()
+        start = time.monotonic()
+
+        # Run
+        for _ in range(10):
+            time.sleep(PERIOD / 2)
+            on_time = instance.wait()
+            assert on_time
+
+        # Test
+        elapsed = time.monotonic() - start
+        assert 10 * PERIOD <= elapsed < 10 * PERIOD + PERIOD / 2
+        assert instance.iterations == 10
+        assert instance.overruns == 0
+        assert instance.work_time.mean >= PERIOD / 2
+
+    def test_overrun(self) -> None:
+        """
+        Overruns return at once and skip the ticks that passed entirely.
+        """
+        # Setup
+        instance = create_loop()
+
+        # Run
+        time.sleep(PERIOD * 2.5)
+        late = instance.wait()
+        on_time = instance.wait()
+
+        # Test
+        assert not late
+        assert on_time
+        assert instance.overruns == 1
+        assert instance.skipped == 1
+        assert "1 overruns (1 ticks skipped)" in str(instance)
@@ -0,0 +1,75 @@
+"""
+Test the percentiles of the most recent values.
+"""
+
+import math
+
+from utilities.statistics import rolling_percentiles
+
+
+class TestRollingPercentiles:
+    """
+    Nearest rank percentiles over a sliding window.
+    """
+
+    def test_invalid_size(self) -> None:
+        """
+        Size must be positive.
+        """
+        # Run
+        result, _ = rolling_percentiles.RollingPercentiles.create(0)
+
+        # Test
+        assert not result
+
+    def test_empty(self) -> None:
+        """
+        No values gives NaN.
+        """
+        # Setup
+        result, instance = rolling_percentiles.RollingPercentiles.create(4)
+        assert result
+        assert instance is not None
+
+        # Run
+        actual = instance.percentile(0.5)
+
+        # Test
+        assert math.isnan(actual)
+
+    def test_nearest_rank(self) -> None:
+        """
+        Percentiles are values that were added.
+        """
+        # Setup
+        result, instance = rolling_percentiles.RollingPercentiles.create(10)
+        assert result
+        assert instance is not None
+
+        # Run
+        for value in [5.0, 1.0, 4.0, 2.0, 3.0]:
+            instance.add(value)
+
+        # Test
+        assert instance.percentile(0.0) == 1.0
+        assert instance.percentile(0.5) == 3.0
+        assert instance.percentile(0.95) == 5.0
+        assert instance.percentile(1.0) == 5.0
+
+    def test_window(self) -> None:
+        """
+        Only the most recent values are kept.
+        """
+        # Setup
+        result, instance = rolling_percentiles.RollingPercentiles.create(3)
+        assert result
+        assert instance is not None
+
+        # Run
+        for value in [100.0, 100.0, 1.0, 2.0, 3.0]:
+            instance.add(value)
+
+        # Test
+        assert len(instance) == 3
+        assert instance.count == 5
+        assert instance.percentile(1.0) == 3.0
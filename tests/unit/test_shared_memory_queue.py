@@ -0,0 +1,139 @@
+"""
+Test the shared memory queue.
+"""
+
+import multiprocessing as mp
+import queue
+
+import pytest
+
+from utilities.workers import queue_proxy_wrapper
+from utilities.workers import shared_memory_queue
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+NUM_ITEMS = 1000
+
+
+def produce(output_queue: shared_memory_queue.SharedMemoryQueue, start: int) -> None:
+    """
+    Child process putting NUM_ITEMS numbers.
+    """
+    for i in range(start, start + NUM_ITEMS):
+        output_queue.put(i)
+
+
+@pytest.fixture()
+def small_queue() -> shared_memory_queue.SharedMemoryQueue:  # type: ignore
+    """
+    Queue of 2 slots of 64 bytes.
+    """
+    instance = shared_memory_queue.SharedMemoryQueue(2, 64)
+    yield instance  # type: ignore
+    instance.close()
+    instance.unlink()
+
+
+class TestSharedMemoryQueue:
+    """
+    Same behaviour as a multiprocessing queue.
+    """
+
+    def test_fifo(self, small_queue: shared_memory_queue.SharedMemoryQueue) -> None:
+        """
+        Items come out in order, across the wrap around.
+        """
+        # Setup
+        actual = []
+
+        # Run
+        for item in ["a", None, (1, 2.5), {"b": 3}]:
+            small_queue.put(item)
+            actual.append(small_queue.get())
+
+        # Test
+        assert actual == ["a", None, (1, 2.5), {"b": 3}]
+        assert small_queue.empty()
+
+    def test_full_and_empty(self, small_queue: shared_memory_queue.SharedMemoryQueue) -> None:
+        """
+        Full and empty raise the queue module exceptions.
+        """
+        # Setup
+        small_queue.put(1)
+        small_queue.put(2)
+
+        # Run
+        with pytest.raises(queue.Full):
+            small_queue.put(3, timeout=0.01)
+        size = small_queue.qsize()
+        full = small_queue.full()
+        small_queue.get_nowait()
+        small_queue.get_nowait()
+
+        # Test
+        assert size == 2
+        assert full
+        with pytest.raises(queue.Empty):
+            small_queue.get(timeout=0.01)
+
+    def test_oversize(self, small_queue: shared_memory_queue.SharedMemoryQueue) -> None:
+        """
+        Items larger than a slot are rejected without using a slot.
+        """
+        # Run
+        with pytest.raises(ValueError):
+            small_queue.put(b"x" * 100)
+
+        # Test
+        assert small_queue.empty()
+        small_queue.put_nowait(1)
+        small_queue.put_nowait(2)
+
+    def test_producers(self) -> None:
+        """
+        Items put by several processes all arrive once, in order per producer.
+        """
+        # Setup
+        instance = shared_memory_queue.SharedMemoryQueue(16)
+        producers = [mp.Process(target=produce, args=(instance, i * NUM_ITEMS)) for i in range(2)]
+
+        # Run
+        for producer in producers:
+            producer.start()
+        actual = [instance.get(timeout=5) for _ in range(2 * NUM_ITEMS)]
+        for producer in producers:
+            producer.join()
+        instance.close()
+        instance.unlink()
+
+        # Test
+        assert sorted(actual) == list(range(2 * NUM_ITEMS))
+        first = [item for item in actual if item < NUM_ITEMS]
+        assert first == sorted(first)
+
+    def test_wrapper_backend(self) -> None:
+        """
+        The wrapper's overflow policies work on the shared memory backend without a manager.
+        """
+        # Setup
+        wrapper = queue_proxy_wrapper.QueueProxyWrapper(
+            None,
+            2,
+            queue_proxy_wrapper.OverflowPolicy.DROP_OLDEST,
+            queue_proxy_wrapper.QueueBackend.SHARED_MEMORY,
+        )
+
+        # Run
+        results = [wrapper.put(i) for i in range(4)]
+        items = [wrapper.queue.get_nowait() for _ in range(2)]
+        wrapper.close()
+
+        # Test
+        assert results == [True, True, True, True]
+        assert wrapper.dropped == 2
+        assert items == [2, 3]
@@ -0,0 +1,176 @@
+"""
+Test adaptive stream rate requests.
+"""
+
+import pytest
+from pymavlink import mavutil
+
+from modules.common.modules.logger import logger
+from modules.telemetry import stream_rate
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+class FakeMav:
+    """
+    Records sent COMMAND_LONG messages.
+    """
+
+    def __init__(self) -> None:
+        self.intervals: "list[tuple[int, float]]" = []
+
+    def command_long_send(self, **kwargs: float) -> None:
+        """
+        Record the message ID and interval.
+        """
+        assert kwargs["command"] == mavutil.mavlink.MAV_CMD_SET_MESSAGE_INTERVAL
+        self.intervals.append((int(kwargs["param1"]), kwargs["param2"]))
+
+
+class FakeConnection:
+    """
+    Connection that only sends.
+    """
+
+    def __init__(self) -> None:
+        self.mav = FakeMav()
+
+
+class FakeSender:
+    """
+    Records submitted messages.
+    """
+
+    def __init__(self) -> None:
+        self.messages: "list[mavutil.mavlink.MAVLink_message]" = []
+
+    def submit(self, msg: mavutil.mavlink.MAVLink_message) -> "tuple[bool, None]":
+        """
+        Accept every message.
+        """
+        self.messages.append(msg)
+        return True, None
+
+
+class EncodingConnection:
+    """
+    Connection that can only encode, sending must go through the sender.
+    """
+
+    def __init__(self) -> None:
+        self.mav = mavutil.mavlink.MAVLink(None)
+
+
+@pytest.fixture()
+def controller(monkeypatch: pytest.MonkeyPatch) -> stream_rate.StreamRateController:  # type: ignore
+    """
+    Controller at 10 Hz that updates on every call and always has CPU headroom.
+    """
+    monkeypatch.setattr(stream_rate, "UPDATE_PERIOD", 0.0)
+    monkeypatch.setattr(stream_rate, "has_cpu_headroom", lambda: True)
+
+    result, test_logger = logger.Logger.create("test_stream_rate", False)
+    assert result
+    assert test_logger is not None
+
+    result, instance = stream_rate.StreamRateController.create(
+        FakeConnection(), 10.0, test_logger, min_rate=2.0, max_rate=11.0, high_backlog=3
+    )
+    assert result
+    assert instance is not None
+    yield instance  # type: ignore
+
+
+class TestStreamRateController:
+    """
+    Additive increase, multiplicative decrease.
+    """
+
+    def test_initial_request(self, controller: stream_rate.StreamRateController) -> None:
+        """
+        Both streams are requested on creation.
+        """
+        # Test
+        assert controller.connection.mav.intervals == [
+            (mavutil.mavlink.MAVLINK_MSG_ID_ATTITUDE, 100_000),
+            (mavutil.mavlink.MAVLINK_MSG_ID_LOCAL_POSITION_NED, 100_000),
+        ]
+
+    def test_backlog_decreases(self, controller: stream_rate.StreamRateController) -> None:
+        """
+        Rate halves on backlog, down to the minimum.
+        """
+        # Run
+        rates = [controller.update(5) for _ in range(3)]
+
+        # Test
+        assert rates == [5.0, 2.5, 2.0]
+
+    def test_idle_increases(self, controller: stream_rate.StreamRateController) -> None:
+        """
+        Rate steps up while the consumer keeps up, up to the maximum.
+        """
+        # Run
+        rates = [controller.update(0) for _ in range(2)]
+
+        # Test
+        assert rates == [11.0, 11.0]
+        assert len(controller.connection.mav.intervals) == 4
+
+    def test_small_backlog_holds(self, controller: stream_rate.StreamRateController) -> None:
+        """
+        Nothing is sent while the backlog is between empty and high.
+        """
+        # Run
+        actual = controller.update(1)
+
+        # Test
+        assert actual == 10.0
+        assert len(controller.connection.mav.intervals) == 2
+
+    def test_sender(self) -> None:
+        """
+        Requests are submitted to the outbound stage instead of written.
+        """
+        # Setup
+        result, test_logger = logger.Logger.create("test_stream_rate", False)
+        assert result
+        assert test_logger is not None
+        sender = FakeSender()
+
+        # Run
+        result, _ = stream_rate.StreamRateController.create(
+            EncodingConnection(), 10.0, test_logger, sender=sender
+        )
+
+        # Test
+        assert result
+        assert [(msg.get_type(), msg.param1, msg.param2) for msg in sender.messages] == [
+            ("COMMAND_LONG", mavutil.mavlink.MAVLINK_MSG_ID_ATTITUDE, 100_000),
+            ("COMMAND_LONG", mavutil.mavlink.MAVLINK_MSG_ID_LOCAL_POSITION_NED, 100_000),
+        ]
+
+    def test_due(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Updates are only due once per period.
+        """
+        # Setup
+        result, test_logger = logger.Logger.create("test_stream_rate", False)
+        assert result
+        assert test_logger is not None
+        result, instance = stream_rate.StreamRateController.create(
+            FakeConnection(), 10.0, test_logger
+        )
+        assert result
+        assert instance is not None
+
+        # Run
+        due_now = instance.is_due()
+        monkeypatch.setattr(stream_rate, "UPDATE_PERIOD", 0.0)
+
+        # Test
+        assert not due_now
+        assert instance.is_due()
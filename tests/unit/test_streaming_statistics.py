@@ -0,0 +1,103 @@
+"""
+Test the constant memory stream statistics.
+"""
+
+import math
+import statistics
+
+from utilities.statistics import streaming_statistics
+
+
+def create_statistics(
+    window: float = 10.0, window_buckets: int = 10, ewma_alpha: float = 0.5
+) -> streaming_statistics.StreamingStatistics:
+    """
+    Statistics with the given parameters.
+    """
+    result, instance = streaming_statistics.StreamingStatistics.create(
+        window, window_buckets, ewma_alpha
+    )
+    assert result
+    assert instance is not None
+    return instance
+
+
+class TestStreamingStatistics:
+    """
+    Running, windowed and weighted statistics.
+    """
+
+    def test_invalid(self) -> None:
+        """
+        Window and weight must be in range.
+        """
+        # Run
+        window_result, _ = streaming_statistics.StreamingStatistics.create(window=0.0)
+        alpha_result, _ = streaming_statistics.StreamingStatistics.create(ewma_alpha=1.5)
+
+        # Test
+        assert not window_result
+        assert not alpha_result
+
+    def test_running(self) -> None:
+        """
+        Mean, variance and extremes match the batch computation.
+        """
+        # Setup
+        values = [1.0, 4.0, -2.0, 8.5, 3.25]
+        instance = create_statistics()
+
+        # Run
+        for i, value in enumerate(values):
+            instance.add(value, float(i))
+
+        # Test
+        assert instance.count == len(values)
+        assert math.isclose(instance.mean, statistics.mean(values))
+        assert math.isclose(instance.variance, statistics.variance(values))
+        assert instance.minimum == -2.0
+        assert instance.maximum == 8.5
+
+    def test_empty(self) -> None:
+        """
+        No values gives NaN.
+        """
+        # Setup
+        instance = create_statistics()
+
+        # Test
+        assert math.isnan(instance.mean)
+        assert math.isnan(instance.variance)
+        assert math.isnan(instance.window_mean(0.0))
+
+    def test_window(self) -> None:
+        """
+        Only values in the recent window count.
+        """
+        # Setup
+        instance = create_statistics(window=10.0, window_buckets=10)
+
+        # Run
+        instance.add(100.0, 0.5)
+        instance.add(1.0, 10.5)
+        instance.add(3.0, 11.5)
+
+        # Test
+        assert instance.window_mean(11.5) == 2.0
+        assert instance.window_mean(20.7) == 3.0
+        assert math.isnan(instance.window_mean(100.0))
+
+    def test_ewma(self) -> None:
+        """
+        Newest value weighted by alpha.
+        """
+        # Setup
+        instance = create_statistics(ewma_alpha=0.5)
+
+        # Run
+        instance.add(0.0, 0.0)
+        instance.add(4.0, 1.0)
+        instance.add(8.0, 2.0)
+
+        # Test
+        assert instance.ewma == 5.0
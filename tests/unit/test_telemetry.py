@@ -0,0 +1,295 @@
+"""
+Test telemetry fusion against a fake connection.
+"""
+
+import math
+import time
+
+import pytest
+from pymavlink import mavutil
+
+from modules.common.modules.logger import logger
+from modules.telemetry import telemetry
+from modules.telemetry import telemetry_interpolation
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+class FakeConnection:
+    """
+    Delivers a fixed list of messages, then reports no data.
+    """
+
+    def __init__(self, messages: "list[mavutil.mavlink.MAVLink_message]") -> None:
+        self.messages = messages
+
+    def recv_match(
+        self,
+        type: "list[str] | None" = None,  # pylint: disable=redefined-builtin
+        blocking: bool = False,
+        timeout: "float | None" = None,
+    ) -> "mavutil.mavlink.MAVLink_message | None":
+        """
+        Next message of the given types, or None when exhausted.
+        """
+        _ = blocking, timeout
+        while len(self.messages) > 0:
+            msg = self.messages.pop(0)
+            if type is None or msg.get_type() in type:
+                return msg
+
+        return None
+
+    def select(self, timeout: float) -> bool:
+        """
+        Nothing more will ever arrive.
+        """
+        _ = timeout
+        return False
+
+
+def position(time_boot_ms: int, x: float) -> mavutil.mavlink.MAVLink_message:
+    """
+    LOCAL_POSITION_NED at x.
+    """
+    return mavutil.mavlink.MAVLink_local_position_ned_message(time_boot_ms, x, 0, 0, 1, 0, 0)
+
+
+def attitude(time_boot_ms: int, yaw: float) -> mavutil.mavlink.MAVLink_message:
+    """
+    ATTITUDE with yaw.
+    """
+    return mavutil.mavlink.MAVLink_attitude_message(time_boot_ms, 0, 0, yaw, 0, 0, 0)
+
+
+@pytest.fixture()
+def local_logger() -> logger.Logger:  # type: ignore
+    """
+    Logger for telemetry.
+    """
+    result, test_logger = logger.Logger.create("test_telemetry", False)
+    assert result
+    assert test_logger is not None
+    yield test_logger  # type: ignore
+
+
+def create_telemetry(
+    messages: "list[mavutil.mavlink.MAVLink_message]", local_logger: logger.Logger
+) -> telemetry.Telemetry:
+    """
+    Telemetry reading the given messages.
+    """
+    result, instance = telemetry.Telemetry.create(FakeConnection(messages), local_logger, 0.01)
+    assert result
+    assert instance is not None
+    return instance
+
+
+class TestRun:
+    """
+    One fused sample per call.
+    """
+
+    def test_fuse(self, local_logger: logger.Logger) -> None:
+        """
+        Most recent of both, with the newest timestamp.
+        """
+        # Setup
+        instance = create_telemetry([position(100, 1.0), attitude(150, 0.5)], local_logger)
+
+        # Run
+        actual = instance.run()
+
+        # Test
+        assert actual is not None
+        assert actual.time_since_boot == 150
+        assert actual.x == 1.0
+        assert actual.yaw == 0.5
+
+    def test_timeout_while_receiving(self, local_logger: logger.Logger) -> None:
+        """
+        A stream that never completes a pair cannot hold run() past the timeout.
+        """
+        # Setup
+        instance = create_telemetry([attitude(i, 0.5) for i in range(50_000)], local_logger)
+
+        # Run
+        start = time.monotonic()
+        actual = instance.run()
+        elapsed = time.monotonic() - start
+
+        # Test
+        assert actual is None
+        assert elapsed < 0.5
+        assert len(instance.connection.messages) > 0
+
+    def test_receive_time(self, local_logger: logger.Logger) -> None:
+        """
+        Receive time of the oldest message, stamped on arrival when not already stamped.
+        """
+        # Setup
+        stamped = position(100, 1.0)
+        stamped.receive_time = 5.0
+        instance = create_telemetry([stamped, attitude(150, 0.5)], local_logger)
+
+        # Run
+        actual = instance.run()
+
+        # Test
+        assert actual is not None
+        assert actual.receive_time == 5.0
+
+    def test_missing_attitude(self, local_logger: logger.Logger) -> None:
+        """
+        No sample without both messages.
+        """
+        # Setup
+        instance = create_telemetry([position(100, 1.0)], local_logger)
+
+        # Run
+        actual = instance.run()
+
+        # Test
+        assert actual is None
+
+
+class TestRunBatch:
+    """
+    Every pending message drained into an array.
+    """
+
+    def test_batch(self, local_logger: logger.Logger) -> None:
+        """
+        One sample per message once both types have been seen.
+        """
+        # Setup
+        instance = create_telemetry(
+            [position(100, 1.0), attitude(110, 0.1), position(200, 2.0), attitude(210, 0.2)],
+            local_logger,
+        )
+
+        # Run
+        actual = instance.run_batch(10, 0.0)
+
+        # Test
+        assert actual.dtype == telemetry.TELEMETRY_DTYPE
+        assert actual["time_since_boot"].tolist() == [110, 200, 210]
+        assert actual["x"].tolist() == [1.0, 2.0, 2.0]
+
+    def test_batch_limit(self, local_logger: logger.Logger) -> None:
+        """
+        Remaining messages are left for the next call, which keeps the fusion state.
+        """
+        # Setup
+        instance = create_telemetry(
+            [position(100, 1.0), attitude(110, 0.1), position(200, 2.0)], local_logger
+        )
+
+        # Run
+        first = instance.run_batch(1, 0.0)
+        second = instance.run_batch(1, 0.0)
+        third = instance.run_batch(1, 0.0)
+
+        # Test
+        assert first["time_since_boot"].tolist() == [110]
+        assert second["time_since_boot"].tolist() == [200]
+        assert len(third) == 0
+
+
+class TestRunInterpolated:
+    """
+    One sample per message, with the other stream aligned to its timestamp.
+    """
+
+    def test_interpolate(self, local_logger: logger.Logger) -> None:
+        """
+        Position is interpolated to the attitude timestamp and vice versa.
+        """
+        # Setup
+        instance = create_telemetry(
+            [position(0, 0.0), attitude(100, 0.0), position(200, 2.0), attitude(300, 1.0)],
+            local_logger,
+        )
+
+        # Run
+        actual = [instance.run_interpolated() for _ in range(4)]
+
+        # Test
+        assert actual[0] is None
+        assert actual[1] is not None
+        assert actual[1].time_since_boot == 100
+        assert actual[1].x == 0.0  # Only 1 position sample, held
+        assert actual[2] is not None
+        assert actual[2].time_since_boot == 200
+        assert actual[2].x == 2.0
+        assert actual[3] is not None
+        assert actual[3].time_since_boot == 300
+        assert math.isclose(actual[3].x, 3.0)  # Extrapolated at 1 m per 100 ms
+        assert math.isclose(actual[3].yaw, 1.0)
+
+    def test_yaw_wraps(self, local_logger: logger.Logger) -> None:
+        """
+        Yaw is interpolated along the shortest arc across +-pi.
+        """
+        # Setup
+        instance = create_telemetry(
+            [
+                attitude(0, math.pi - 0.1),
+                attitude(200, -math.pi + 0.1),
+                position(100, 0.0),
+            ],
+            local_logger,
+        )
+
+        # Run
+        instance.run_interpolated()
+        instance.run_interpolated()
+        actual = instance.run_interpolated()
+
+        # Test
+        assert actual is not None
+        assert math.isclose(abs(actual.yaw), math.pi)
+
+    def test_own_stream_exact(self, local_logger: logger.Logger) -> None:
+        """
+        The triggering message's fields are passed through unchanged.
+        """
+        # Setup
+        instance = create_telemetry(
+            [attitude(0, 0.5), position(50, 0.0), attitude(100, 0.1)], local_logger
+        )
+
+        # Run
+        instance.run_interpolated()
+        instance.run_interpolated()
+        actual = instance.run_interpolated()
+
+        # Test
+        assert actual is not None
+        assert actual.yaw == 0.1
+
+
+class TestStreamHistory:
+    """
+    Sampling the last two samples of a stream.
+    """
+
+    @pytest.mark.parametrize("time_ms, expected", [(-10_000, -5.0), (10_000, 6.0)])
+    def test_extrapolation_limited(self, time_ms: int, expected: float) -> None:
+        """
+        Extrapolation is clamped to MAX_EXTRAPOLATION on both sides.
+        """
+        # Setup
+        history = telemetry_interpolation.StreamHistory()
+        history.add(1000, (0.0,))
+        history.add(1100, (1.0,))
+
+        # Run
+        (actual,) = history.sample_at(time_ms)
+
+        # Test
+        assert telemetry_interpolation.MAX_EXTRAPOLATION == 500
+        assert math.isclose(actual, expected)
@@ -0,0 +1,77 @@
+"""
+Test the TelemetryData record codec.
+"""
+
+import pickle
+
+from modules.telemetry import telemetry
+
+
+class TestTelemetryDataCodec:
+    """
+    Packed record and pickle round trips.
+    """
+
+    def test_record_size(self) -> None:
+        """
+        One float64 per field, the 13 readings then receive_time.
+        """
+        # Setup
+        data = telemetry.TelemetryData(time_since_boot=1, x=1.0)
+
+        # Run
+        actual = len(data.to_bytes())
+
+        # Test
+        assert actual == telemetry.TelemetryData.RECORD_SIZE
+        assert actual == 14 * 8
+        assert telemetry.TELEMETRY_DTYPE.itemsize == actual
+        assert telemetry.TELEMETRY_DTYPE.names[-1] == "receive_time"
+
+    def test_round_trip(self) -> None:
+        """
+        All fields are preserved.
+        """
+        # Setup
+        data = telemetry.TelemetryData(
+            123456, 1.0, 2.0, 3.0, 0.1, 0.2, 0.3, 0.01, 0.02, 0.03, 0.001, 0.002, 0.003, 98.5
+        )
+
+        # Run
+        actual = telemetry.TelemetryData.from_bytes(data.to_bytes())
+
+        # Test
+        for name in telemetry.TelemetryData.__slots__:
+            assert getattr(actual, name) == getattr(data, name)
+        assert isinstance(actual.time_since_boot, int)
+
+    def test_round_trip_none(self) -> None:
+        """
+        Missing fields stay None.
+        """
+        # Setup
+        data = telemetry.TelemetryData(x=5.0, yaw=-1.5)
+
+        # Run
+        actual = telemetry.TelemetryData.from_bytes(data.to_bytes())
+
+        # Test
+        assert actual.time_since_boot is None
+        assert actual.x == 5.0
+        assert actual.y is None
+        assert actual.yaw == -1.5
+
+    def test_pickle(self) -> None:
+        """
+        Pickle goes through the record.
+        """
+        # Setup
+        data = telemetry.TelemetryData(time_since_boot=42, z=-3.5)
+
+        # Run
+        actual = pickle.loads(pickle.dumps(data))
+
+        # Test
+        assert actual.time_since_boot == 42
+        assert actual.z == -3.5
+        assert actual.roll is None
@@ -0,0 +1,122 @@
+"""
+Test the shared memory telemetry ring buffer.
+"""
+
+import pytest
+
+from modules.common.modules.logger import logger
+from modules.telemetry import telemetry
+from modules.telemetry import telemetry_ring_buffer
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+CAPACITY = 4
+
+
+@pytest.fixture()
+def ring_buffer() -> telemetry_ring_buffer.TelemetryRingBuffer:  # type: ignore
+    """
+    Empty ring buffer, freed after the test.
+    """
+    result, test_logger = logger.Logger.create("test_telemetry_ring_buffer", False)
+    assert result
+    assert test_logger is not None
+
+    result, buffer = telemetry_ring_buffer.TelemetryRingBuffer.create(CAPACITY, test_logger)
+    assert result
+    assert buffer is not None
+
+    yield buffer  # type: ignore
+
+    buffer.close()
+    buffer.unlink()
+
+
+class TestTelemetryRingBuffer:
+    """
+    Reading back what was written.
+    """
+
+    def test_empty(self, ring_buffer: telemetry_ring_buffer.TelemetryRingBuffer) -> None:
+        """
+        Nothing to read before the first write.
+        """
+        # Run
+        result, data = ring_buffer.read_latest()
+
+        # Test
+        assert not result
+        assert data is None
+        assert ring_buffer.generation == 0
+
+    def test_read_latest(self, ring_buffer: telemetry_ring_buffer.TelemetryRingBuffer) -> None:
+        """
+        Newest record wins.
+        """
+        # Setup
+        ring_buffer.write(telemetry.TelemetryData(time_since_boot=1, x=1.0))
+        ring_buffer.write(telemetry.TelemetryData(time_since_boot=2, x=2.0))
+
+        # Run
+        result, data = ring_buffer.read_latest()
+
+        # Test
+        assert result
+        assert data is not None
+        assert data.time_since_boot == 2
+        assert data.x == 2.0
+        assert data.y is None
+        assert ring_buffer.generation == 2
+
+    def test_read_last_wraps(self, ring_buffer: telemetry_ring_buffer.TelemetryRingBuffer) -> None:
+        """
+        Only the newest capacity records are kept, oldest first.
+        """
+        # Setup
+        for i in range(CAPACITY + 2):
+            ring_buffer.write(telemetry.TelemetryData(time_since_boot=i, z=float(i)))
+
+        # Run
+        result, records = ring_buffer.read_last(CAPACITY + 10)
+
+        # Test
+        assert result
+        assert records is not None
+        assert records["z"].tolist() == [2.0, 3.0, 4.0, 5.0]
+
+    def test_wait_timeout(self, ring_buffer: telemetry_ring_buffer.TelemetryRingBuffer) -> None:
+        """
+        Waiting on the current generation times out without a write.
+        """
+        # Setup
+        ring_buffer.write(telemetry.TelemetryData(time_since_boot=1))
+
+        # Run
+        actual = ring_buffer.wait(ring_buffer.generation, 0.01)
+
+        # Test
+        assert not actual
+        assert ring_buffer.wait(0, 0.01)
+
+    def test_backlog(self, ring_buffer: telemetry_ring_buffer.TelemetryRingBuffer) -> None:
+        """
+        Records not yet read count until read_latest() catches up, skipped ones included.
+        """
+        # Setup
+        for i in range(3):
+            ring_buffer.write(telemetry.TelemetryData(time_since_boot=i))
+        before = ring_buffer.backlog
+
+        # Run
+        ring_buffer.read_latest()
+        after = ring_buffer.backlog
+        ring_buffer.write(telemetry.TelemetryData(time_since_boot=3))
+
+        # Test
+        assert before == 3
+        assert after == 0
+        assert ring_buffer.backlog == 1
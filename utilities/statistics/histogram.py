@@ -0,0 +1,71 @@
+"""
+Fixed bucket histogram.
+"""
+
+import bisect
+import math
+
+
+class Histogram:
+    """
+    Counts of values per bucket. Bucket i holds values up to and including
+    upper_bounds[i], a final bucket holds everything larger.
+
+    upper_bounds: Strictly increasing bucket upper bounds.
+    """
+
+    __private_key = object()
+
+    @classmethod
+    def create(cls, upper_bounds: "list[float]") -> "tuple[True, Histogram] | tuple[False, None]":
+        """
+        Falliable create (instantiation) method to create a Histogram object.
+        """
+        if len(upper_bounds) == 0:
+            return False, None
+
+        if any(lower >= upper for lower, upper in zip(upper_bounds, upper_bounds[1:])):
+            return False, None
+
+        return True, Histogram(cls.__private_key, upper_bounds)
+
+    def __init__(self, key: object, upper_bounds: "list[float]") -> None:
+        assert key is Histogram.__private_key, "Use create() method"
+
+        self.upper_bounds = list(upper_bounds)
+        self.counts = [0] * (len(upper_bounds) + 1)
+        self.count = 0
+        self.maximum = -math.inf
+
+    def add(self, value: float) -> None:
+        """
+        Count a value.
+        """
+        self.counts[bisect.bisect_left(self.upper_bounds, value)] += 1
+        self.count += 1
+        self.maximum = max(self.maximum, value)
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Upper bound of the bucket containing the given fraction (0 to 1) of the values,
+        the maximum for the final bucket. NaN if empty.
+        """
+        if self.count == 0:
+            return math.nan
+
+        target = fraction * self.count
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts[:-1]):
+            cumulative += bucket_count
+            if cumulative >= target and cumulative > 0:
+                return self.upper_bounds[i]
+
+        return self.maximum
+
+    def __str__(self) -> str:
+        buckets = [
+            f"<={upper_bound:g}: {bucket_count}"
+            for upper_bound, bucket_count in zip(self.upper_bounds, self.counts)
+        ]
+        buckets.append(f">{self.upper_bounds[-1]:g}: {self.counts[-1]}")
+        return ", ".join(buckets)
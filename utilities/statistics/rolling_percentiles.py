@@ -0,0 +1,67 @@
+"""
+Exact percentiles of the most recent values.
+"""
+
+import bisect
+import collections
+import math
+
+
+DEFAULT_SIZE = 64
+
+
+class RollingPercentiles:
+    """
+    Keeps the last size values in arrival order and in sorted order, so adding costs
+    O(size) list shifting and a percentile is a single index.
+
+    size: Number of most recent values kept.
+    """
+
+    __private_key = object()
+
+    @classmethod
+    def create(
+        cls, size: int = DEFAULT_SIZE
+    ) -> "tuple[True, RollingPercentiles] | tuple[False, None]":
+        """
+        Falliable create (instantiation) method to create a RollingPercentiles object.
+        """
+        if size <= 0:
+            return False, None
+
+        return True, RollingPercentiles(cls.__private_key, size)
+
+    def __init__(self, key: object, size: int) -> None:
+        assert key is RollingPercentiles.__private_key, "Use create() method"
+
+        self.size = size
+        self.count = 0
+        self.__arrival = collections.deque()
+        self.__sorted = []
+
+    def add(self, value: float) -> None:
+        """
+        Add a value, forgetting the oldest one once full.
+        """
+        if len(self.__arrival) == self.size:
+            oldest = self.__arrival.popleft()
+            del self.__sorted[bisect.bisect_left(self.__sorted, oldest)]
+
+        self.__arrival.append(value)
+        bisect.insort(self.__sorted, value)
+        self.count += 1
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Nearest rank value below which the given fraction (0 to 1) of the kept values lie.
+        NaN if empty.
+        """
+        if len(self.__sorted) == 0:
+            return math.nan
+
+        rank = math.ceil(fraction * len(self.__sorted)) - 1
+        return self.__sorted[min(max(rank, 0), len(self.__sorted) - 1)]
+
+    def __len__(self) -> int:
+        return len(self.__sorted)
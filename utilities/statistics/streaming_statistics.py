@@ -0,0 +1,124 @@
+"""
+Constant memory statistics of a stream of values.
+"""
+
+import math
+
+
+DEFAULT_WINDOW = 10.0  # seconds
+DEFAULT_WINDOW_BUCKETS = 10
+DEFAULT_EWMA_ALPHA = 0.1
+
+
+class StreamingStatistics:  # pylint: disable=too-many-instance-attributes
+    """
+    Running statistics updated in O(1) per value with fixed memory:
+    count, mean and variance (Welford), minimum, maximum,
+    mean over a recent time window and an exponentially weighted moving average.
+
+    The window is split into buckets of equal duration, so the windowed mean covers
+    between window - window / window_buckets and window seconds.
+    """
+
+    __private_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        window: float = DEFAULT_WINDOW,
+        window_buckets: int = DEFAULT_WINDOW_BUCKETS,
+        ewma_alpha: float = DEFAULT_EWMA_ALPHA,
+    ) -> "tuple[True, StreamingStatistics] | tuple[False, None]":
+        """
+        Falliable create (instantiation) method to create a StreamingStatistics object.
+
+        window: Duration in seconds of the windowed mean.
+        window_buckets: Number of buckets the window is split into.
+        ewma_alpha: Weight of the newest value in the EWMA, in (0, 1].
+        """
+        if window <= 0.0 or window_buckets <= 0:
+            return False, None
+
+        if not 0.0 < ewma_alpha <= 1.0:
+            return False, None
+
+        return True, StreamingStatistics(cls.__private_key, window, window_buckets, ewma_alpha)
+
+    def __init__(self, key: object, window: float, window_buckets: int, ewma_alpha: float) -> None:
+        assert key is StreamingStatistics.__private_key, "Use create() method"
+
+        self.ewma_alpha = ewma_alpha
+
+        self.count = 0
+        self.mean = math.nan
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.ewma = math.nan
+        self.__m2 = 0.0
+
+        self.__bucket_duration = window / window_buckets
+        self.__bucket_sums = [0.0] * window_buckets
+        self.__bucket_counts = [0] * window_buckets
+        self.__newest_bucket = None
+
+    @property
+    def variance(self) -> float:
+        """
+        Sample variance, NaN with fewer than 2 values.
+        """
+        if self.count < 2:
+            return math.nan
+
+        return self.__m2 / (self.count - 1)
+
+    def add(self, value: float, timestamp: float) -> None:
+        """
+        Include a value observed at the timestamp in seconds (non decreasing, e.g. monotonic).
+        """
+        self.count += 1
+        if self.count == 1:
+            self.mean = value
+            self.ewma = value
+        else:
+            delta = value - self.mean
+            self.mean += delta / self.count
+            self.__m2 += delta * (value - self.mean)
+            self.ewma += self.ewma_alpha * (value - self.ewma)
+
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+        index = self.__advance(timestamp)
+        self.__bucket_sums[index] += value
+        self.__bucket_counts[index] += 1
+
+    def window_mean(self, timestamp: float) -> float:
+        """
+        Mean of the values in the window ending at the timestamp, NaN if there are none.
+        """
+        self.__advance(timestamp)
+
+        count = sum(self.__bucket_counts)
+        if count == 0:
+            return math.nan
+
+        return sum(self.__bucket_sums) / count
+
+    def __advance(self, timestamp: float) -> int:
+        """
+        Clear the buckets that left the window, returns the index of the current bucket.
+        """
+        bucket = int(timestamp // self.__bucket_duration)
+        bucket_count = len(self.__bucket_counts)
+
+        if self.__newest_bucket is None or bucket - self.__newest_bucket >= bucket_count:
+            self.__bucket_sums = [0.0] * bucket_count
+            self.__bucket_counts = [0] * bucket_count
+            self.__newest_bucket = bucket
+        elif bucket > self.__newest_bucket:
+            for expired in range(self.__newest_bucket + 1, bucket + 1):
+                self.__bucket_sums[expired % bucket_count] = 0.0
+                self.__bucket_counts[expired % bucket_count] = 0
+            self.__newest_bucket = bucket
+
+        return bucket % bucket_count
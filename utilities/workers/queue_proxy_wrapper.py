@@ -2,24 +2,276 @@
 Queue.
 """
 
+import enum
+import multiprocessing as mp
 import multiprocessing.managers
 import queue
 import time
 
+from . import shared_memory_queue
+
+
+class OverflowPolicy(enum.Enum):
+    """
+    What put() does when the queue is full.
+    """
+
+    # Wait for space
+    BLOCK = 0
+    # Discard the oldest item to make space
+    DROP_OLDEST = 1
+    # Discard the item being put
+    DROP_NEWEST = 2
+    # Single slot always holding the latest item
+    CONFLATE = 3
+
+
+class QueueBackend(enum.Enum):
+    """
+    What the queue is built on.
+    """
+
+    # Queue hosted by the manager process, each call is a round trip to it
+    MANAGER = 0
+    # Ring in shared memory, bounded even for a maxsize <= 0
+    SHARED_MEMORY = 1
+
+
+class BatchQueue(queue.Queue):
+    """
+    Queue with batch operations, hosted by QueueManager so that a batch is a single
+    round trip to the manager process.
+    """
+
+    def put_many(
+        self, items: "list[object]", block: bool = True, timeout: "float | None" = None
+    ) -> int:
+        """
+        Put the items in order, waiting up to timeout seconds in total for space.
+
+        Returns the number of items put, the rest did not fit in time.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        for count, item in enumerate(items):
+            try:
+                if deadline is None:
+                    self.put(item, block)
+                else:
+                    self.put(item, block, max(deadline - time.monotonic(), 0.0))
+            except queue.Full:
+                return count
+
+        return len(items)
+
+    def put_many_drop_oldest(self, items: "list[object]") -> int:
+        """
+        Put the items in order without waiting, discarding the oldest items to make space.
+
+        Returns the number of items discarded.
+        """
+        dropped = 0
+
+        with self.mutex:
+            for item in items:
+                if 0 < self.maxsize <= self._qsize():
+                    self._get()
+                    dropped += 1
+
+                self._put(item)
+                self.unfinished_tasks += 1
+
+            self.not_empty.notify_all()
+
+        return dropped
+
+    def get_many(self, max_items: int, timeout: "float | None" = 0.0) -> "list[object]":
+        """
+        Wait up to timeout seconds (forever if None) for an item, then take up to
+        max_items of those available.
+        """
+        with self.not_empty:
+            if timeout is None:
+                while self._qsize() == 0:
+                    self.not_empty.wait()
+            elif timeout > 0.0:
+                self.not_empty.wait_for(self._qsize, timeout)
+
+            items = []
+            while self._qsize() > 0 and len(items) < max_items:
+                items.append(self._get())
+
+            if len(items) > 0:
+                self.not_full.notify_all()
+
+        return items
+
+
+class QueueManager(multiprocessing.managers.SyncManager):
+    """
+    SyncManager that also hosts BatchQueue. Start it with start().
+    """
+
+
+QueueManager.register("BatchQueue", BatchQueue)
+
 
 class QueueProxyWrapper:
     """
     Wrapper for an underlying queue proxy which also stores `maxsize`.
 
     `maxsize <= 0` means infinite size.
+    `OverflowPolicy.CONFLATE` always uses a `maxsize` of 1.
+    `QueueBackend.SHARED_MEMORY` needs no manager and is released with `close()`.
+    Batch operations take one round trip with a `QueueManager`, otherwise one per item.
     """
 
     __QUEUE_TIMEOUT = 0.1  # seconds
     __QUEUE_DELAY = 0.1  # seconds
+    __PUT_ATTEMPTS = 3
+
+    def __init__(
+        self,
+        mp_manager: multiprocessing.managers.SyncManager | None,
+        maxsize: int = 0,
+        policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        backend: QueueBackend = QueueBackend.MANAGER,
+    ) -> None:
+        if policy == OverflowPolicy.CONFLATE:
+            maxsize = 1
+
+        if backend == QueueBackend.SHARED_MEMORY:
+            self.queue = shared_memory_queue.SharedMemoryQueue(maxsize)
+            maxsize = self.queue.maxsize
+        elif isinstance(mp_manager, QueueManager):
+            self.queue = mp_manager.BatchQueue(maxsize)
+        else:
+            self.queue = mp_manager.Queue(maxsize)
 
-    def __init__(self, mp_manager: multiprocessing.managers.SyncManager, maxsize: int = 0) -> None:
-        self.queue = mp_manager.Queue(maxsize)
         self.maxsize = maxsize
+        self.policy = policy
+        self.backend = backend
+
+        # Shared by every process the wrapper is passed to
+        self.__dropped = mp.Value("Q", 0)
+
+    @property
+    def dropped(self) -> int:
+        """
+        Number of items discarded by put().
+        """
+        return self.__dropped.value
+
+    def put(self, item: object, timeout: "float | None" = None) -> bool:
+        """
+        Puts the item according to the overflow policy.
+
+        timeout: Longest wait in seconds for OverflowPolicy.BLOCK, None to wait forever.
+
+        Returns whether the item was placed in the queue.
+        """
+        if self.policy == OverflowPolicy.BLOCK:
+            try:
+                self.queue.put(item, timeout=timeout)
+            except queue.Full:
+                self.__count_drop()
+                return False
+
+            return True
+
+        if self.policy == OverflowPolicy.DROP_NEWEST:
+            try:
+                self.queue.put_nowait(item)
+            except queue.Full:
+                self.__count_drop()
+                return False
+
+            return True
+
+        # Drop oldest and conflate, other producers may refill the space so retry a few times
+        for _ in range(self.__PUT_ATTEMPTS):
+            try:
+                self.queue.put_nowait(item)
+                return True
+            except queue.Full:
+                pass
+
+            try:
+                self.queue.get_nowait()
+                self.__count_drop()
+            except queue.Empty:
+                pass
+
+        self.__count_drop()
+        return False
+
+    def put_many(self, items: "list[object]", timeout: "float | None" = None) -> int:
+        """
+        Puts the items in order according to the overflow policy.
+
+        timeout: Longest wait in seconds in total for OverflowPolicy.BLOCK,
+            None to wait forever.
+
+        Returns the number of the items that were placed in the queue.
+        """
+        if len(items) == 0:
+            return 0
+
+        if not hasattr(self.queue, "put_many"):
+            return sum(self.put(item, timeout) for item in items)
+
+        if self.policy in (OverflowPolicy.BLOCK, OverflowPolicy.DROP_NEWEST):
+            if self.policy == OverflowPolicy.BLOCK:
+                count = self.queue.put_many(items, True, timeout)
+            else:
+                count = self.queue.put_many(items, False)
+
+            if count < len(items):
+                self.__count_drop(len(items) - count)
+
+            return count
+
+        # Drop oldest and conflate, atomic in the manager so no retries are needed
+        dropped = self.queue.put_many_drop_oldest(items)
+        if dropped > 0:
+            self.__count_drop(dropped)
+
+        return len(items)
+
+    def get_many(self, max_items: int, timeout: "float | None" = 0.0) -> "list[object]":
+        """
+        Gets up to max_items of the items available, oldest first.
+
+        timeout: Longest wait in seconds for the first item, None to wait forever,
+            0 to not wait.
+        """
+        if hasattr(self.queue, "get_many"):
+            return self.queue.get_many(max_items, timeout)
+
+        items = []
+        try:
+            if timeout is None or timeout > 0.0:
+                items.append(self.queue.get(timeout=timeout))
+
+            while len(items) < max_items:
+                items.append(self.queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        return items
+
+    def __count_drop(self, count: int = 1) -> None:
+        with self.__dropped.get_lock():
+            self.__dropped.value += count
+
+    def close(self) -> None:
+        """
+        Free the shared memory of the shared memory backend, nothing for the manager.
+        Only the creating process calls this, after the workers have exited.
+        """
+        if self.backend == QueueBackend.SHARED_MEMORY:
+            self.queue.close()
+            self.queue.unlink()
 
     def fill_queue_with_sentinel(self, timeout: float = 0.0) -> None:
         """
@@ -30,6 +282,10 @@ class QueueProxyWrapper:
         if timeout <= 0.0:
             timeout = self.__QUEUE_TIMEOUT
 
+        if hasattr(self.queue, "put_many"):
+            self.queue.put_many([None] * self.maxsize, True, timeout)
+            return
+
         try:
             for _ in range(self.maxsize):
                 self.queue.put(None, timeout=timeout)
@@ -45,11 +301,13 @@ class QueueProxyWrapper:
         if timeout <= 0.0:
             timeout = self.__QUEUE_TIMEOUT
 
-        try:
-            for _ in range(self.maxsize):
-                self.queue.get(timeout=timeout)
-        except queue.Empty:
-            return
+        remaining = self.maxsize
+        while remaining > 0:
+            items = self.get_many(remaining, timeout)
+            if len(items) == 0:
+                return
+
+            remaining -= len(items)
 
     def fill_and_drain_queue(self) -> None:
         """
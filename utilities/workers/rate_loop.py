@@ -0,0 +1,115 @@
+"""
+Fixed rate pacing of worker main loops.
+"""
+
+import asyncio
+import time
+
+from utilities.statistics import streaming_statistics
+
+
+class RateLoop:  # pylint: disable=too-many-instance-attributes
+    """
+    Sleeps until deadlines on a fixed grid of time.monotonic(), so the period does not
+    drift by the work time or the sleep overshoot.
+
+    An iteration whose work runs past its deadline is an overrun: the next iteration
+    starts at once and ticks that passed entirely are skipped rather than run back to back.
+
+    Call wait(), or async_wait() in a coroutine, at the end of every iteration.
+    """
+
+    __private_key = object()
+
+    @classmethod
+    def create(cls, period: float) -> "tuple[True, RateLoop] | tuple[False, None]":
+        """
+        Falliable create (instantiation) method to create a RateLoop object.
+        The first deadline is one period from now.
+
+        period: Time in seconds between the starts of iterations.
+        """
+        if period <= 0.0:
+            return False, None
+
+        return True, RateLoop(cls.__private_key, period)
+
+    def __init__(self, key: object, period: float) -> None:
+        assert key is RateLoop.__private_key, "Use create() method"
+
+        self.period = period
+
+        self.iterations = 0
+        self.overruns = 0
+        self.skipped = 0
+        # Seconds from the start of an iteration to its wait()
+        _, self.work_time = streaming_statistics.StreamingStatistics.create()
+        # Seconds woken after the deadline
+        _, self.lateness = streaming_statistics.StreamingStatistics.create()
+
+        self.__iteration_start = time.monotonic()
+        self.__deadline = self.__iteration_start + period
+
+    def wait(self) -> bool:
+        """
+        Sleep until the next deadline.
+
+        Returns False without sleeping if the iteration overran its deadline.
+        """
+        delay = self.__begin_wait()
+        if delay is None:
+            return False
+
+        time.sleep(delay)
+        self.__end_wait()
+        return True
+
+    async def async_wait(self) -> bool:
+        """
+        Same as wait(), yielding to the event loop while sleeping.
+        """
+        delay = self.__begin_wait()
+        if delay is None:
+            return False
+
+        await asyncio.sleep(delay)
+        self.__end_wait()
+        return True
+
+    def __begin_wait(self) -> "float | None":
+        """
+        Account for the iteration that just ended.
+
+        Returns the time to sleep, None on an overrun.
+        """
+        now = time.monotonic()
+        self.iterations += 1
+        self.work_time.add(now - self.__iteration_start, now)
+
+        deadline = self.__deadline
+
+        if now >= deadline:
+            self.overruns += 1
+            missed = int((now - deadline) / self.period)
+            self.skipped += missed
+            self.__deadline = deadline + (missed + 1) * self.period
+            self.__iteration_start = now
+            return None
+
+        return deadline - now
+
+    def __end_wait(self) -> None:
+        now = time.monotonic()
+        self.lateness.add(now - self.__deadline, now)
+        self.__deadline += self.period
+        self.__iteration_start = now
+
+    def __str__(self) -> str:
+        work = self.work_time
+        late = self.lateness
+        return (
+            f"period {self.period * 1000:g} ms, {self.iterations} iterations, "
+            f"{self.overruns} overruns ({self.skipped} ticks skipped), "
+            f"work mean {work.mean * 1000:.3f} ms max {work.maximum * 1000:.3f} ms, "
+            f"lateness mean {late.mean * 1000:.3f} ms max {late.maximum * 1000:.3f} ms"
+        )
@@ -0,0 +1,182 @@
+"""
+Bounded multi producer, multi consumer queue in shared memory.
+"""
+
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import pickle
+import queue
+import struct
+
+
+DEFAULT_SLOT_SIZE = 2048  # bytes
+# Capacity when a size of 0 or less (infinite) is asked for
+UNBOUNDED_CAPACITY = 1024
+
+# Header: number of items ever got (head) and put (tail)
+HEADER = struct.Struct("<QQ")
+LENGTH = struct.Struct("<I")
+
+
+class SharedMemoryQueue:
+    """
+    Same interface as multiprocessing.Queue, but each item is pickled once straight into
+    a ring of fixed size slots in shared memory instead of being sent through a pipe or
+    to a manager process.
+
+    Waiting is done on two semaphores counting the filled and free slots, which sleep in
+    the kernel (futex) rather than polling. A lock orders concurrent producers and consumers.
+
+    The creating process owns the shared memory and must call unlink() when done.
+
+    maxsize: Number of slots, 0 or less for UNBOUNDED_CAPACITY.
+    slot_size: Largest pickled item in bytes.
+    """
+
+    def __init__(self, maxsize: int = 0, slot_size: int = DEFAULT_SLOT_SIZE) -> None:
+        capacity = maxsize if maxsize > 0 else UNBOUNDED_CAPACITY
+        if slot_size <= 0:
+            raise ValueError(f"Slot size must be positive, got {slot_size}")
+
+        memory = shared_memory.SharedMemory(
+            create=True, size=HEADER.size + capacity * (LENGTH.size + slot_size)
+        )
+        HEADER.pack_into(memory.buf, 0, 0, 0)
+
+        self.__attach(
+            memory,
+            capacity,
+            slot_size,
+            mp.Lock(),
+            mp.Semaphore(0),
+            mp.Semaphore(capacity),
+        )
+
+    def __attach(
+        self,
+        memory: shared_memory.SharedMemory,
+        capacity: int,
+        slot_size: int,
+        lock: "mp.synchronize.Lock",
+        items: "mp.synchronize.Semaphore",
+        spaces: "mp.synchronize.Semaphore",
+    ) -> None:
+        self.__memory = memory
+        self.__capacity = capacity
+        self.__slot_size = slot_size
+        self.__lock = lock
+        self.__items = items
+        self.__spaces = spaces
+
+    def __getstate__(self) -> "tuple":
+        # Reattach by name in the receiving process
+        return (
+            self.__memory.name,
+            self.__capacity,
+            self.__slot_size,
+            self.__lock,
+            self.__items,
+            self.__spaces,
+        )
+
+    def __setstate__(self, state: "tuple") -> None:
+        name, *rest = state
+        self.__attach(shared_memory.SharedMemory(name=name), *rest)
+
+    @property
+    def maxsize(self) -> int:
+        """
+        Number of slots.
+        """
+        return self.__capacity
+
+    def put(self, item: object, block: bool = True, timeout: "float | None" = None) -> None:
+        """
+        Put the item, waiting up to timeout seconds (forever if None) for a free slot.
+
+        Raises queue.Full if there is no free slot in time, ValueError if the pickled item
+        does not fit in a slot.
+        """
+        data = pickle.dumps(item, pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.__slot_size:
+            raise ValueError(f"Item of {len(data)} bytes exceeds the {self.__slot_size} byte slot")
+
+        if not self.__spaces.acquire(block, timeout):
+            raise queue.Full
+
+        buf = self.__memory.buf
+        with self.__lock:
+            head, tail = HEADER.unpack_from(buf, 0)
+            offset = self.__slot_offset(tail)
+            LENGTH.pack_into(buf, offset, len(data))
+            buf[offset + LENGTH.size : offset + LENGTH.size + len(data)] = data
+            HEADER.pack_into(buf, 0, head, tail + 1)
+
+        self.__items.release()
+
+    def put_nowait(self, item: object) -> None:
+        """
+        Put the item if there is a free slot, otherwise raise queue.Full.
+        """
+        self.put(item, False)
+
+    def get(self, block: bool = True, timeout: "float | None" = None) -> object:
+        """
+        Remove and return the oldest item, waiting up to timeout seconds (forever if None).
+
+        Raises queue.Empty if there is no item in time.
+        """
+        if not self.__items.acquire(block, timeout):
+            raise queue.Empty
+
+        buf = self.__memory.buf
+        with self.__lock:
+            head, tail = HEADER.unpack_from(buf, 0)
+            offset = self.__slot_offset(head)
+            (length,) = LENGTH.unpack_from(buf, offset)
+            data = bytes(buf[offset + LENGTH.size : offset + LENGTH.size + length])
+            HEADER.pack_into(buf, 0, head + 1, tail)
+
+        self.__spaces.release()
+
+        return pickle.loads(data)
+
+    def get_nowait(self) -> object:
+        """
+        Remove and return the oldest item if there is one, otherwise raise queue.Empty.
+        """
+        return self.get(False)
+
+    def qsize(self) -> int:
+        """
+        Approximate number of items, as other processes may put and get concurrently.
+        """
+        head, tail = HEADER.unpack_from(self.__memory.buf, 0)
+        return tail - head
+
+    def empty(self) -> bool:
+        """
+        Whether the queue is empty, with the same caveat as qsize().
+        """
+        return self.qsize() == 0
+
+    def full(self) -> bool:
+        """
+        Whether the queue is full, with the same caveat as qsize().
+        """
+        return self.qsize() >= self.__capacity
+
+    def close(self) -> None:
+        """
+        Detach this process from the shared memory.
+        """
+        self.__memory.close()
+
+    def unlink(self) -> None:
+        """
+        Free the shared memory. Only the creating process calls this, after close().
+        """
+        self.__memory.unlink()
+
+    def __slot_offset(self, count: int) -> int:
+        return HEADER.size + (count % self.__capacity) * (LENGTH.size + self.__slot_size)